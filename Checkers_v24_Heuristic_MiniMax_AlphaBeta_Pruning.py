@@ -1,12 +1,30 @@
 from graphics import *
 import sys
-from tkinter import messagebox
 from random import randrange
+from checkers_engine import BIT, TRACE_OFF, Engine, Ponderer, Position, SearchThread, square_of
 
 class Checkers:
-    def __init__(self):
+    SEARCH_POLL_MS = 50                  # how often a running search is checked on
+
+    def __init__(self, headless=None):
+        # -------- Search Settings --------
+        # Read when the computer is to move, so they can be changed on a
+        # Checkers before or between games; the engine is (re)built from
+        # them by PrepareEngine.
+        self.search_depth = 2   # never less than 1; used when move_time_ms is None
+        self.move_time_ms = 1000            # per-move budget for iterative deepening
+        self.tt_size = 1 << 16              # transposition table slots (power of two)
+        self.tt_replacement = 'depth-age'   # 'always', 'depth' or 'depth-age'
+        self.quiescence_depth = 8           # extra plies of forced jumps at leaves
+        self.search_workers = 1             # >1 searches in that many processes
+        self.parallel_search = 'ybw'        # 'root', 'ybw' (root splitting) or 'lazy-smp'
+        self.trace_level = TRACE_OFF        # up to TRACE_MOVE for a full search trace
+        self.trace_sink = None              # None prints; a RingBufferSink keeps the tail to dump()
+        self.stats_file = None              # path: append each search's statistics as a JSON line
+        self.last_search_stats = None        # SearchStats of the computer's last move
+        self.ponder = True                  # 1P: search on the human's time (single-process engine)
+
         # -------- Game State --------
-        self.search_depth = 2   # never less than 1
         self.state = 'CustomSetup'
         self.is1P = False
         self.compIsColour = 'not playing'   # 'White' or 'Black' when 1P mode is on
@@ -17,22 +35,48 @@ class Checkers:
 
         self.selectedTileAt = []
         self.pieceCaptured = False
+        self.search = None                   # SearchThread of the computer's move in progress
+        self.compScheduled = False
+        self.pondered = None
+
+        self.engine = None                   # built by PrepareEngine when the computer first moves
+        self.engineSettings = None           # the settings self.engine was built with
+        self.ponderer = None
 
         self.BoardDimension = 8
         self.numPiecesAllowed = 12
 
         # -------- GUI Initialization --------
-        self.win = GraphWin('Checkers', 600, 600)
+        # Headless (the headless argument, or CHECKERS_HEADLESS=1 in the
+        # environment) plays the same game in a NullGraphWin: nothing is
+        # drawn and message boxes are only recorded, in self.messagebox.
+        if headless is None:
+            headless = HEADLESS
+        self.headless = headless
+        if headless:
+            self.win = NullGraphWin('Checkers', 600, 600)
+            self.messagebox = NullMessagebox()
+        else:
+            from tkinter import messagebox
+            self.win = GraphWin('Checkers', 600, 600)
+            self.messagebox = messagebox
         self.win.setBackground('White')
         self.win.setCoords(-1, -3, 11, 9)
 
-        self.ClearBoard()
-
-        # Create 8x8 array of Tile objects (all empty initially)
-        self.tiles = [
-            [Tile(self.win, i, j, False) for i in range(self.BoardDimension)]
-            for j in range(self.BoardDimension)
-        ]
+        # One Tile per square for the whole session, indexed tiles[x][y];
+        # moves reconfigure them rather than drawing new ones. The control
+        # panel's rectangles and labels are pooled the same way, keyed by
+        # where they sit (see ColourButton and Label).
+        self.position = Position()
+        with self.win.batch():
+            self.tiles = [
+                [Tile(self.win, x, y) for y in range(self.BoardDimension)]
+                for x in range(self.BoardDimension)
+            ]
+            self.buttons = {}
+            self.labels = {}
+            self.shownItems = []
+            self.ClearBoard()
 
         # These lists will be used by the engine
         self.moves = []  # holds the list of [x1, y1, x2, y2] legal moves
@@ -46,432 +90,293 @@ class Checkers:
             Text(Point(i + 0.5,  8.5), gridLetters[i]).draw(self.win)
 
         self.SetButtons()
-        self.SetupBoard()
 
     ##########################################
-    # Heuristic Implementation               #
-    ##########################################
+    # Event Loop                             #
     ##########################################
-    # Alpha-Beta Pruning and Move Evaluation #
-    ##########################################   
-    def alpha_beta(self, depth, alpha, beta, last_move=None):
-        def count_all_pieces():
-            return sum(tile.isPiece for row in self.tiles for tile in row)
-
-        legal_moves = self.movesAvailable()
-        print("[alpha_beta] Enter: depth={}, pieces={}".format(depth, count_all_pieces()))
-
-        if depth == 0 or not legal_moves:
-            print("[alpha_beta] Leaf/terminal: pieces={}".format(count_all_pieces()))
-            if last_move is not None:
-                val = self.weight_move(last_move)
-                print("  [leaf] weight_move for last_move:", last_move, "=", val)
-                return val
-            else:
-                return 0
-
-        best_value = float('-inf')
-
-        for move in legal_moves:
-            print("  [move] Before move: pieces={}".format(count_all_pieces()))
-            snapshot = self.snapshot_board()
-            self.make_move(move)
-            print("  [move] After move: pieces={}".format(count_all_pieces()))
-
-            value = -self.alpha_beta(depth - 1, -beta, -alpha, move)
-
-            # Score after move, before restore
-            if depth == 1 and last_move is not None:
-                print("DEBUG weight_move (before restore):", self.weight_move(move))
-
-            self.restore_board(snapshot)
-            print("  [move] After restore: pieces={}".format(count_all_pieces()))
-
-            if value > best_value:
-                best_value = value
-            if best_value > alpha:
-                alpha = best_value
-            if alpha >= beta:
-                print("  [prune] Beta cutoff at depth={}, value={}".format(depth, best_value))
-                break
-
-        print("[alpha_beta] Exit: depth={}, best_value={}, pieces={}".format(depth, best_value, count_all_pieces()))
-        return best_value
-
-    def make_move(self, move_seq):
+    # Everything happens in Tk callbacks: OnClick for the mouse, and after()
+    # to start the computer's move and to collect it from its SearchThread.
+    # Between events nothing runs but Tk itself (and the ponder search), and
+    # a finished game simply leaves the state at 'CustomSetup' for the next
+    # click, so a session can go on for any number of games.
+    def Run(self):
         """
-        Phase 1: slide the piece through each hop, record snaps for undo,
-        and return (snaps, orig_turn) WITHOUT clearing captures here.
+        Hand control to the window until it is closed (in headless mode,
+        until nothing is left to do).
         """
-        snaps = []
-        orig_turn = self.pTurn
-
-        for x1, y1, x2, y2 in move_seq:
-            # snapshot source and dest (and captured square if any)
-            snap = [
-                (x1, y1, self.tiles[x1][y1]),
-                (x2, y2, self.tiles[x2][y2])
-            ]
-            if abs(x2 - x1) == 2:
-                mx, my = (x1 + x2)//2, (y1 + y2)//2
-                snap.append((mx, my, self.tiles[mx][my]))
-            snaps.append(snap)
-
-            # move the piece
-            moving = self.tiles[x1][y1]
-            self.tiles[x2][y2] = Tile(self.win, x2, y2,
-                                      True,
-                                      moving.pieceColour,
-                                      moving.pieceRank)
-            self.tiles[x1][y1] = Tile(self.win, x1, y1, False)
-
-            # **DO NOT** clear the captured tile here!
-
-        # flip turn last
-        self.pTurn = self.opposite(self.pTurn)
-        return snaps, orig_turn
-
-    def finalize_move(self, move_result):
+        self.win.setMouseHandler(self.OnClick)
+        self.win.master.protocol("WM_DELETE_WINDOW", self.OnClose)
+        self.Continue()
+        self.win.mainloop()
+
+    def OnClick(self, point):
+        click = Point(*self.win.toWorld(point.getX(), point.getY()))
+        square = self.ClickedSquare(click)
+        if square is not None:
+            with self.win.batch():
+                if self.search is not None:
+                    self.SearchClick(*square)
+                else:
+                    self.Action(*square)
+        self.Continue()
+
+    def OnClose(self):
         """
-        Phase 2: given (snaps, orig_turn), clear each jumped square.
+        The window closed or X clicked: stop any search, release the
+        engine's worker processes and shared memory, and exit.
         """
-        snaps, _ = move_result
-        for snap in snaps:
-            # snap == [(x1,y1,t), (x2,y2,t)] or 3-tuple with (mx,my,t)
-            if len(snap) == 3:
-                mx, my, _ = snap[2]
-                self.tiles[mx][my] = Tile(self.win, mx, my, False)
-
-
-
-    ##########################################
-    # Move Scoring and Heuristic Evaluation  #
-    ##########################################
-    def weight_move(self, move_seq):
+        if self.search is not None:
+            self.search.cancel()
+            self.search = None
+        if self.ponderer:
+            self.ponderer.stop()
+        if self.engine is not None:
+            self.engine.close()
+        ExitGame(self.win)
+
+    def Continue(self):
         """
-        Heuristic: now that captures are still on board, we can score them.
+        Schedule what the current state needs next: the computer's move if
+        it is to play, or nothing while the human is to click.
         """
-        BACK_ROW            = 30
-        MOBILITY            = 10
-        PROMOTION           = 150
-        CAPTURE_KING        = 200
-        CAPTURE_PAWN        = 50
-        SAFETY              = 25
-
-        # first hop gives us src; last hop gives us dst
-        src_x, src_y, _, _ = (*move_seq[0],)  # unpack 4-tuple
-        last_hop = move_seq[-1]
-        dst_x, dst_y      = last_hop[2], last_hop[3]
-
-        # capture the mover’s color
-        mover = self.tiles[src_x][src_y]
-        color = mover.pieceColour
-
-        score = 0
-
-        # BACK_ROW
-        if self.movesFromBack([src_x, src_y, dst_x, dst_y]):
-            score += BACK_ROW
-
-        # MOBILITY
-        if not self.PieceCanCapture(dst_x, dst_y):
-            score += MOBILITY
-
-        # PROMOTION
-        dest = self.tiles[dst_x][dst_y]
-        if (dest.isPawn and
-            ((dst_y == 7 and color == 'White') or
-             (dst_y == 0 and color == 'Black'))):
-            score += PROMOTION
-
-        # CAPTURE bonuses
-        for x1, y1, x2, y2 in move_seq:
-            if abs(x2 - x1) == 2:
-                mx, my = (x1 + x2)//2, (y1 + y2)//2
-                cap = self.tiles[mx][my]
-                if cap.isKing:
-                    score += CAPTURE_KING
-                elif cap.isPawn:
-                    score += CAPTURE_PAWN
-
-        # SAFETY
-        if self.isMoveSafe([src_x, src_y, dst_x, dst_y]):
-            score += SAFETY
-
-        return score
+        if self.state != 'Play':
+            if self.ponderer:
+                self.ponderer.stop()
+        elif (self.is1P and self.compIsColour == self.pTurn and
+              self.search is None and not self.compScheduled):
+            self.compScheduled = True
+            self.win.after_idle(self.CompTurn)
 
     ##########################################
-    # Multi-Jump Capture Logic               #
+    # Heuristic Implementation               #
     ##########################################
-    def getCaptureSequences(self, x, y, path=None, visited=None):
+    # The search itself lives in checkers_engine and runs on a copy of the
+    # bitboard self.position; only the move it picks is copied back onto
+    # self.tiles. It runs in a SearchThread that PollSearch checks on
+    # every SEARCH_POLL_MS, so the window stays live. With pondering on,
+    # the engine keeps searching the reply it expects while the human
+    # thinks; if the human plays that move, the ponder result and the
+    # warmed table are used.
+    def PrepareEngine(self):
         """
-        Recursively finds all legal multi-jump sequences for the piece at (x, y).
-        Each result is a list of [x1, y1, x2, y2] hops in order.
+        Build the engine, and the ponderer if pondering is on, from the
+        search settings. It is built the first time the computer is to
+        move and rebuilt if a setting has changed since, after closing
+        the old one's worker processes.
         """
-        if path is None:
-            path = []
-        if visited is None:
-            visited = set()
-        sequences = []
-        found = False
-
-        for dx, dy in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            mid_x, mid_y = x + dx, y + dy
-            end_x, end_y = x + 2 * dx, y + 2 * dy
-
-            if (0 <= mid_x < 8 and 0 <= mid_y < 8 and
-                0 <= end_x < 8 and 0 <= end_y < 8 and
-                self.tiles[x][y].isPiece and
-                self.tiles[x][y].pieceColour == self.pTurn and
-                self.tiles[mid_x][mid_y].isPiece and
-                self.tiles[mid_x][mid_y].pieceColour == self.opposite(self.pTurn) and
-                not self.tiles[end_x][end_y].isPiece and
-                (mid_x, mid_y, end_x, end_y) not in visited):
-
-                found = True
-                # Save board state to restore after recursion
-                snap = [
-                    (x, y, self.tiles[x][y]),
-                    (mid_x, mid_y, self.tiles[mid_x][mid_y]),
-                    (end_x, end_y, self.tiles[end_x][end_y])
-                ]
-                # Perform jump: move to end, remove captured, clear source
-                self.tiles[end_x][end_y] = Tile(self.win, end_x, end_y, True,
-                                                self.tiles[x][y].pieceColour,
-                                                self.tiles[x][y].pieceRank)
-                self.tiles[x][y] = Tile(self.win, x, y, False)
-                self.tiles[mid_x][mid_y] = Tile(self.win, mid_x, mid_y, False)
-                # Optional: Promote if you want forced kinging during a chain
-
-                new_path = path + [[x, y, end_x, end_y]]
-                new_visited = visited | {(mid_x, mid_y, end_x, end_y)}
-                # Recurse for further jumps from the new position
-                further = self.getCaptureSequences(end_x, end_y, new_path, new_visited)
-                if further:
-                    sequences.extend(further)
-                else:
-                    sequences.append(new_path)
-                # Restore board
-                for rx, ry, tile in snap:
-                    self.tiles[rx][ry] = tile
-
-        if not found and path:
-            # No further jumps, return the accumulated path if at least one jump occurred
-            sequences.append(path)
-        return sequences
-
-    ##########################################
-    # Board State Management                 #
-    ##########################################
-    def snapshot_board(self):
-        return (
-            [[(tile.isPiece, tile.pieceColour, tile.pieceRank) for tile in row] for row in self.tiles],
-            self.pTurn
-        )
-
-
-    def restore_board(self, snapshot):
-        board_state, turn = snapshot
-        for x in range(8):
-            for y in range(8):
-                isPiece, pieceColour, pieceRank = board_state[x][y]
-                self.tiles[x][y] = Tile(self.win, x, y, isPiece, pieceColour, pieceRank)
-        self.pTurn = turn
-
-    ##########################################
-    # Heuristic Implementation end           #
-    ##########################################
+        settings = (self.search_workers, self.parallel_search, self.tt_size,
+                    self.tt_replacement, self.quiescence_depth, self.trace_level,
+                    self.trace_sink, self.ponder)
+        if self.engine is not None:
+            if settings == self.engineSettings:
+                return
+            if self.ponderer:
+                self.ponderer.stop()
+            self.engine.close()
+
+        if self.search_workers > 1:
+            from checkers_parallel import LazySMPEngine, ParallelEngine
+        if self.search_workers > 1 and self.parallel_search == 'lazy-smp':
+            self.engine = LazySMPEngine(workers=self.search_workers, tt_size=self.tt_size,
+                                        tt_replacement=self.tt_replacement,
+                                        quiescence_depth=self.quiescence_depth,
+                                        trace_level=self.trace_level, trace_sink=self.trace_sink)
+        elif self.search_workers > 1:
+            self.engine = ParallelEngine(workers=self.search_workers, split=self.parallel_search,
+                                         tt_size=self.tt_size,
+                                         tt_replacement=self.tt_replacement,
+                                         quiescence_depth=self.quiescence_depth,
+                                         trace_level=self.trace_level, trace_sink=self.trace_sink)
+        else:
+            self.engine = Engine(tt_size=self.tt_size, tt_replacement=self.tt_replacement,
+                                 quiescence_depth=self.quiescence_depth,
+                                 trace_level=self.trace_level, trace_sink=self.trace_sink)
+        self.ponderer = Ponderer(self.engine) if self.ponder and isinstance(self.engine, Engine) else None
+        self.engineSettings = settings
 
     def CompTurn(self):
-        import math
-
-        depth       = self.search_depth
-        legal_moves = self.movesAvailable()
-        if not legal_moves:
+        self.compScheduled = False
+        if not (self.state == 'Play' and self.is1P and self.compIsColour == self.pTurn):
             return
-
-        best_score = -math.inf
-        best_move  = None
-
-        for move in legal_moves:
-            # 1) Snapshot current board & turn
-            snapshot = self.snapshot_board()
-
-            # 2) Phase 1: apply move (captures still on board)
-            snaps, orig_turn = self.make_move(move)
-
-            # 3) Score immediate gain (captures still present)
-            gain = self.weight_move(move)
-
-            # 4) Phase 2: clear the captured pieces
-            self.finalize_move((snaps, orig_turn))
-
-            # 5) Evaluate opponent’s best reply
-            reply_penalty = -self.alpha_beta(
-                depth - 1,
-                float('-inf'),
-                float('inf'),
-                None
-            )
-
-            # 6) Restore full board & turn for next trial
-            self.restore_board(snapshot)
-
-            # 7) Combine your gain with their reply “penalty”
-            total = gain + reply_penalty
-            if total > best_score:
-                best_score = total
-                best_move  = move
-
-        # 8) Execute the chosen move for real, same two-phase:
+        self.PrepareEngine()
+        position = self.position.copy()
+        position.set_turn(self.pTurn)
+        self.pondered = self.ponderer.finish(position) if self.ponderer else None
+        self.engine.position = position
+        if (self.move_time_ms is None and self.pondered and
+                self.pondered[2] >= self.search_depth):
+            self.FinishCompTurn(self.pondered[0])
+            return
+        if self.move_time_ms is None:
+            self.search = SearchThread(self.engine, self.engine.search, self.search_depth)
+        else:
+            self.search = SearchThread(self.engine, self.engine.iterative_deepening,
+                                       self.move_time_ms)
+        self.search.start()
+        self.win.after(self.SEARCH_POLL_MS, self.PollSearch)
+
+    def PollSearch(self):
+        search = self.search
+        if search is None:
+            return                              # cancelled
+        if not search.done():
+            self.win.after(self.SEARCH_POLL_MS, self.PollSearch)
+            return
+        self.search = None
+        if search.result is None:
+            return
+        best_move = search.result[0]
+        if (self.move_time_ms is not None and self.pondered and
+                self.pondered[2] > search.result[2]):
+            best_move = self.pondered[0]
+        self.FinishCompTurn(best_move)
+
+    def FinishCompTurn(self, best_move):
+        self.last_search_stats = self.engine.stats
+        if self.stats_file:
+            self.last_search_stats.write_jsonl(self.stats_file, colour=self.pTurn)
         if best_move:
-            snaps, orig_turn = self.make_move(best_move)
-            self.finalize_move((snaps, orig_turn))
-
-    #
-    # 7) hasMorePieces(): True if side-to-move has more total pieces than opponent.
-    #
-    def hasMorePieces(self):
-        return self.numColour(self.pTurn) > self.numColour(self.opposite(self.pTurn))
-
-
-    #
-    # ----- Original Heuristic Helpers (unchanged) -----
-    #
+            with self.win.batch():
+                self.CommitMove(best_move)
+            if self.ponderer and self.state == 'Play':
+                self.ponderer.start(self.position)
+        self.Continue()
 
-    def isMoveSafe(self, move):
+    def SearchClick(self, X, Y):
         """
-        Returns True if, after executing this move, the moved piece cannot be immediately captured.
+        A click while the computer is thinking: X cancels the search and
+        exits, Resign cancels it and ends the game (the human resigns), Save
+        still works and anything else is ignored.
         """
-        endx, endy = self.moveEndsAt(move)
-        X1 = [endx - 1, endx + 1]
-        Y1 = [endy - 1, endy + 1]
-        for i in range(2):
-            for j in range(2):
-                if self.SpecialPCCP(
-                    self.tiles[move[0]][move[1]].pieceColour,
-                    X1[i], Y1[j],
-                    endx, endy,
-                    move[0], move[1]
-                ):
-                    return False
-        return True
-
+        if 10 <= X < 11 and -3 <= Y < -2:
+            self.OnClose()
+        elif 6 <= X < 8 and -3 <= Y < -2:
+            self.search.cancel()
+            self.search = None
+            self.messagebox.showinfo("Resignation",
+                                     str(self.opposite(self.pTurn)) + ' has resigned! ' +
+                                     str(self.pTurn) + ' wins!')
+            self.state = 'CustomSetup'
+            self.SetButtons()
+        elif 8 <= X < 10 and -3 <= Y < -2:
+            self.SaveSetupToFile()
 
-    def SpecialPCCP(self, piece2Colour, x, y, X, Y, initX, initY):
+    def CommitMove(self, move_seq):
         """
-        Modified PieceCanCapturePiece that checks if an enemy at (x,y) can capture
-        the moving piece at (X,Y), ignoring the mover's original square.
+        Play a full engine move: apply it to the engine position, redraw the
+        squares it changed and hand the turn over.
         """
-        X1 = [x - 1, x + 1]
-        X2 = [x - 2, x + 2]
-        Y1 = [y - 1, y + 1]
-        Y2 = [y - 2, y + 2]
-
-        if not ((0 <= X < 8) and (0 <= Y < 8) and (0 <= x < 8) and (0 <= y < 8)):
-            return False
-        if piece2Colour != self.opposite(self.tiles[x][y].pieceColour):
-            return False
-        if not self.CanDoWalk(x, y, X, Y, exception=False):
-            return False
-
-        for i in range(2):
-            for j in range(2):
-                if X1[i] == X and Y1[j] == Y:
-                    if (0 <= X2[i] < 8) and (0 <= Y2[j] < 8):
-                        if (not self.tiles[X2[i]][Y2[j]].isPiece) or (X2[i] == initX and Y2[j] == initY):
-                            return True
-        return False
+        pos = self.engine.position
+        pos.make_move(move_seq)
+        self.position = pos.copy()
+        self.ApplyDelta(pos.delta())
+        self.selectedTileAt = []
+        self.pieceCaptured = False
+        self.pTurn = pos.pTurn
+        self.SetButtons()
 
+        if not pos.count(self.pTurn):
+            self.messagebox.showinfo("Winner", str(self.opposite(self.pTurn)) + ' Wins!')
+            self.state = 'CustomSetup'
+            self.SetButtons()
+        elif not pos.legal_moves():
+            self.messagebox.showinfo("Defeat",
+                                     str(self.pTurn) + ' has no available moves! ' +
+                                     str(self.opposite(self.pTurn)) + ' wins!')
+            self.state = 'CustomSetup'
+            self.SetButtons()
 
-    def movesFromBack(self, move):
+    def SetTile(self, x, y, isPiece, pieceColour='', pieceRank=''):
         """
-        Return True if the source square is on the back row for compIsColour.
+        Change the contents of a square, keeping self.position (the bitboard
+        mirror the rule checks run on) in step with self.tiles.
         """
-        src_x, src_y = move[0], move[1]
-        if (src_y == 0 and self.compIsColour == 'White') or \
-           (src_y == 7 and self.compIsColour == 'Black'):
-            return True
-        return False
+        if isPiece:
+            self.position.place(x, y, pieceColour, pieceRank)
+        else:
+            self.position.remove(x, y)
+        self.tiles[x][y].Set(isPiece, pieceColour, pieceRank)
 
+    def ApplyDelta(self, delta):
+        """
+        Repaint the squares of a board delta from the engine, (x, y, piece)
+        for each square that changed, and nothing else.
+        """
+        for x, y, piece in delta:
+            if piece is None:
+                self.tiles[x][y].Set(False)
+            else:
+                self.tiles[x][y].Set(True, piece[0], piece[1])
 
-    def moveEndsAt(self, move):
+    def ShowPosition(self, pos):
         """
-        Given [x1,y1,x2,y2], return the actual landing square [endx, endy],
-        accounting for a jump if (x2,y2) is occupied.
+        Make pos the board's position, repainting only the squares where it
+        differs from the current one.
         """
-        x1, y1, x2, y2 = move
-        if self.tiles[x2][y2].isPiece:
-            return [x1 + (x2 - x1) * 2, y1 + (y2 - y1) * 2]
-        return [x2, y2]
+        delta = pos.diff(self.position)
+        self.position = pos
+        self.ApplyDelta(delta)
+
+    #
+    # 7) hasMorePieces(): True if side-to-move has more total pieces than opponent.
+    #
+    def hasMorePieces(self):
+        return self.numColour(self.pTurn) > self.numColour(self.opposite(self.pTurn))
 
 
     def movesAvailable(self):
-        all_caps = []
-        for x in range(8):
-            for y in range(8):
-                if self.tiles[x][y].isPiece and self.tiles[x][y].pieceColour == self.pTurn:
-                    caps = self.getCaptureSequences(x, y)
-                    if caps:
-                        all_caps.extend(caps)
-        if all_caps:
-            return all_caps  # Only capturing moves when any exist
-        # If no captures, return normal moves as before:
-        moves = []
-        for x in range(8):
-            for y in range(8):
-                if self.tiles[x][y].isPiece and self.tiles[x][y].pieceColour == self.pTurn:
-                    X1 = [x - 1, x + 1]
-                    Y1 = [y - 1, y + 1]
-                    for i in range(2):
-                        for j in range(2):
-                            x2, y2 = X1[i], Y1[j]
-                            if 0 <= x2 < 8 and 0 <= y2 < 8:
-                                if self.moveIsValid(x, y, x2, y2):
-                                    moves.append([[x, y, x2, y2]])  # Single move as a list for consistency
-        return moves
-
+        return [Position.to_hops(m) for m in self.position.legal_moves(self.pTurn)]
 
 
     # ----- GUI and Game-Play Code (mostly unchanged) -----
 
-    def SetupBoard(self):
-        while self.state == 'CustomSetup':
-            self.Click()
-        if self.state == 'Play':
-            self.Play()
-
-
-    def Play(self):
-        while self.state == 'Play':
-            if self.is1P and self.compIsColour == self.pTurn:
-                self.CompTurn()
-            else:
-                self.Click()
-        if self.state == 'CustomSetup':
-            self.SetupBoard()
-
-
-    def ClearBoard(self):
+    def ClearBoard(self, position=None):
         """
-        Reset the board to empty and switch to CustomSetup mode.
+        Reset the board to position (empty by default) and switch to
+        CustomSetup mode.
         """
-        self.tiles = [
-            [Tile(self.win, i, j, False) for i in range(self.BoardDimension)]
-            for j in range(self.BoardDimension)
-        ]
-        for i in range(self.BoardDimension):
-            for j in range(self.BoardDimension):
-                self.ColourButton(self.TileColour(i, j), i, j)
+        if position is None:
+            position = Position()
+        if self.selectedTileAt:
+            self.tiles[self.selectedTileAt[0]][self.selectedTileAt[1]].Select(False)
+            self.selectedTileAt = []
+        self.ShowPosition(position)
         self.state = 'CustomSetup'
-        self.pTurn = 'White'
+        self.pTurn = position.pTurn
         self.SetButtons()
 
 
     def ColourButton(self, colour, X, Y, width=1, height=1):
-        rect = Rectangle(Point(X, Y), Point(X + width, Y + height))
+        """
+        Show the button rectangle at (X, Y) in colour. Each place on the
+        panel gets one Rectangle, drawn the first time it is asked for.
+        """
+        key = (X, Y, width, height)
+        rect = self.buttons.get(key)
+        if rect is None:
+            rect = self.buttons[key] = Rectangle(Point(X, Y), Point(X + width, Y + height))
+            rect.draw(self.win)
         rect.setFill(colour)
-        rect.draw(self.win)
+        self.ShowItem(rect)
+
+
+    def Label(self, X, Y, text, colour='black'):
+        """
+        Show text centred on (X, Y), reusing the Text already there.
+        """
+        txt = self.labels.get((X, Y))
+        if txt is None:
+            txt = self.labels[(X, Y)] = Text(Point(X, Y), text)
+            txt.draw(self.win)
+        else:
+            txt.setText(text)
+        txt.setFill(colour)
+        self.ShowItem(txt)
+
+
+    def ShowItem(self, item):
+        item.setVisible(True)
+        self.shownItems.append(item)
 
 
     def TileColour(self, x, y):
@@ -484,52 +389,64 @@ class Checkers:
     # Draw control buttons along top/bottom
     ##########
     def SetButtons(self):
-        self.ColourButton('White', -1, -3, 12, 2)
-        self.ColourButton('White',  9, -1,  2, 10)
-
-        if self.state == 'CustomSetup':
-            self.DrawStandard()
-            self.DrawStart()
-            self.DrawClear()
-            self.Draw1P()
-            self.Draw2P()
-            self.DrawLoad()
-            self.DrawSave()
-            self.DrawTurn()
-            self.DrawX()
-
-            self.DrawW()
-            self.DrawB()
-            self.DrawK()
-            self.DrawDel()
-
-            self.DrawScore()
-        elif self.state == 'Play':
-            self.DrawResign()
-            self.DrawSave()
-            self.DrawTurn()
-            self.DrawX()
-            self.DrawScore()
+        """
+        Lay out the control panel for the current state. Buttons and
+        labels this state does not use are hidden, not deleted, and
+        the whole panel reaches the screen in one update.
+        """
+        with self.win.batch():
+            self.shownItems = []
+            self.ColourButton('White', -1, -3, 12, 2)
+            self.ColourButton('White',  9, -1,  2, 10)
+
+            if self.state == 'CustomSetup':
+                self.DrawStandard()
+                self.DrawStart()
+                self.DrawClear()
+                self.Draw1P()
+                self.Draw2P()
+                self.DrawLoad()
+                self.DrawSave()
+                self.DrawTurn()
+                self.DrawX()
+
+                self.DrawW()
+                self.DrawB()
+                self.DrawK()
+                self.DrawDel()
+
+                self.DrawScore()
+            elif self.state == 'Play':
+                self.DrawResign()
+                self.DrawSave()
+                self.DrawTurn()
+                self.DrawX()
+                self.DrawScore()
+
+            shown = set(map(id, self.shownItems))
+            for item in list(self.buttons.values()) + list(self.labels.values()):
+                if id(item) not in shown:
+                    item.setVisible(False)
 
 
     def DrawStandard(self):
         self.ColourButton('White', -1, -2, 2, 1)
-        Text(Point(0, -1.3), 'Standard').draw(self.win)
-        Text(Point(0, -1.7), 'Setup').draw(self.win)
+        self.Label(0, -1.3, 'Standard')
+        self.Label(0, -1.7, 'Setup')
 
     def DrawCustom(self):
         self.ColourButton('White', -1, -3, 2, 1)
-        Text(Point(0, -2.3), 'Custom').draw(self.win)
-        Text(Point(0, -2.7), 'Setup').draw(self.win)
+        self.Label(0, -2.3, 'Custom')
+        self.Label(0, -2.7, 'Setup')
 
     def DrawStart(self):
         self.ColourButton('Yellow', 1, -2)
-        Text(Point(1.5, -1.5), 'Start!').draw(self.win)
+        self.Label(1.5, -1.5, 'Start!')
 
     def DrawClear(self):
         self.ColourButton('White', -1, -3, 2, 1)
-        Text(Point(0, -2.3), 'Clear').draw(self.win)
-        Text(Point(0, -2.7), 'Board').draw(self.win)
+        self.Label(0, -2.3, 'Clear')
+        self.Label(0, -2.7, 'Board')
 
     def Draw1P(self):
         col = 'Red'
@@ -537,60 +454,54 @@ class Checkers:
             self.DrawCompColour()
         else:
             self.ColourButton(col, 3, -2, 2, 1)
-            Text(Point(4, -1.3), '1Player').draw(self.win)
-            Text(Point(4, -1.7), 'Game').draw(self.win)
+            self.Label(4, -1.3, '1Player')
+            self.Label(4, -1.7, 'Game')
 
     def DrawCompColour(self):
         self.ColourButton(self.compIsColour, 3, -2, 2, 1)
-        txt1 = Text(Point(4, -1.3), 'Comp Is')
-        txt2 = Text(Point(4, -1.7), self.compIsColour)
-        txt1.draw(self.win)
-        txt2.draw(self.win)
-        txt1.setFill(self.opposite(self.compIsColour))
-        txt2.setFill(self.opposite(self.compIsColour))
+        self.Label(4, -1.3, 'Comp Is', self.opposite(self.compIsColour))
+        self.Label(4, -1.7, self.compIsColour, self.opposite(self.compIsColour))
 
     def Draw2P(self):
         col = 'Green'
         if self.is1P:
             col = 'Red'
         self.ColourButton(col, 3, -3, 2, 1)
-        Text(Point(4, -2.3), '2Player').draw(self.win)
-        Text(Point(4, -2.7), 'Game').draw(self.win)
+        self.Label(4, -2.3, '2Player')
+        self.Label(4, -2.7, 'Game')
 
     def DrawLoad(self):
         self.ColourButton('White', 6, -3, 2, 1)
-        Text(Point(7, -2.5), 'Load').draw(self.win)
+        self.Label(7, -2.5, 'Load')
 
     def DrawSave(self):
         self.ColourButton('White', 8, -3, 2, 1)
-        Text(Point(9, -2.5), 'Save').draw(self.win)
+        self.Label(9, -2.5, 'Save')
 
     def DrawX(self):
         self.ColourButton('Red', 10, -3)
-        Exit_txt = Text(Point(10.5, -2.5), 'X')
-        Exit_txt.draw(self.win)
-        Exit_txt.setFill('White')
+        self.Label(10.5, -2.5, 'X', 'White')
 
     def DrawW(self):
         col = 'Green'
         if self.placeColour != 'White':
             col = 'Red'
         self.ColourButton(col, 6, -2)
-        Text(Point(6.5, -1.5), 'W').draw(self.win)
+        self.Label(6.5, -1.5, 'W')
 
     def DrawB(self):
         col = 'Red'
         if self.placeColour != 'White':
             col = 'Green'
         self.ColourButton(col, 7, -2)
-        Text(Point(7.5, -1.5), 'B').draw(self.win)
+        self.Label(7.5, -1.5, 'B')
 
     def DrawK(self):
         col = 'Red'
         if self.placeRank == 'King':
             col = 'Green'
         self.ColourButton(col, 8, -2)
-        Text(Point(8.5, -1.5), 'K').draw(self.win)
+        self.Label(8.5, -1.5, 'K')
 
     def DrawDel(self):
         col1 = 'Black'
@@ -599,13 +510,11 @@ class Checkers:
             col1 = 'Green'
             col2 = 'Black'
         self.ColourButton(col1, 9, -2)
-        deleteTxt = Text(Point(9.5, -1.5), 'Del')
-        deleteTxt.draw(self.win)
-        deleteTxt.setFill(col2)
+        self.Label(9.5, -1.5, 'Del', col2)
 
     def DrawResign(self):
         self.ColourButton('White', 6, -3, 2, 1)
-        Text(Point(7, -2.5), 'Resign').draw(self.win)
+        self.Label(7, -2.5, 'Resign')
 
     def DrawTurn(self):
         col1 = 'White'
@@ -614,26 +523,16 @@ class Checkers:
             col1 = 'Black'
             col2 = 'White'
         self.ColourButton(col1, 9, 8, 2, 1)
-        txt1 = Text(Point(10, 8.7), col1)
-        txt2 = Text(Point(10, 8.3), 'Turn')
-        txt1.draw(self.win)
-        txt2.draw(self.win)
-        txt1.setFill(col2)
-        txt2.setFill(col2)
+        self.Label(10, 8.7, col1, col2)
+        self.Label(10, 8.3, 'Turn', col2)
 
     def DrawScore(self):
-        Text(Point(10, 7.5), '# White').draw(self.win)
-        Text(Point(10, 7.1), 'Pieces:').draw(self.win)
-        Text(Point(10, 6.7), self.numColour('White')).draw(self.win)
-        Text(Point(10, 5.9), '# Black').draw(self.win)
-        Text(Point(10, 5.5), 'Pieces').draw(self.win)
-        Text(Point(10, 5.1), self.numColour('Black')).draw(self.win)
-
-
-    def Click(self):
-        click = self.win.getMouse()
-        X, Y = self.ClickedSquare(click)
-        self.Action(X, Y)
+        self.Label(10, 7.5, '# White')
+        self.Label(10, 7.1, 'Pieces:')
+        self.Label(10, 6.7, self.numColour('White'))
+        self.Label(10, 5.9, '# Black')
+        self.Label(10, 5.5, 'Pieces')
+        self.Label(10, 5.1, self.numColour('Black'))
 
 
     def Action(self, X, Y):
@@ -646,7 +545,7 @@ class Checkers:
     def clickInCustom(self, X, Y):
         # X button
         if (10 <= X < 11 and -3 <= Y < -2):
-            ExitGame(self.win)
+            self.OnClose()
 
         # Standard Setup
         elif (-1 <= X < 1 and -2 <= Y < -1):
@@ -657,7 +556,7 @@ class Checkers:
             num_wh = self.numColour('White')
             num_bl = self.numColour('Black')
             if (num_wh == 0 and num_bl == 0):
-                messagebox.showinfo("Error", "No pieces have been placed!")
+                self.messagebox.showinfo("Error", "No pieces have been placed!")
             else:
                 self.state = 'Play'
                 self.SetButtons()
@@ -711,22 +610,22 @@ class Checkers:
         # Place/Delete a piece on the board
         elif (0 <= X < 8 and 0 <= Y < 8):
             if self.tiles[X][Y].TileColour(X, Y) == 'White':
-                messagebox.showinfo("Error", "Illegal Placement")
+                self.messagebox.showinfo("Error", "Illegal Placement")
             elif self.numColour(self.placeColour) >= self.numPiecesAllowed and self.placeType == 'Place':
-                messagebox.showinfo("Error", "Illegal Placement")
+                self.messagebox.showinfo("Error", "Illegal Placement")
             elif ((Y == 7 and self.placeColour == 'White' and not (self.placeRank == 'King')) or
                   (Y == 0 and self.placeColour == 'Black' and not (self.placeRank == 'King'))):
-                messagebox.showinfo("Error", "Illegal Placement")
+                self.messagebox.showinfo("Error", "Illegal Placement")
             else:
-                self.tiles[X][Y] = Tile(self.win, X, Y, self.placeType == 'Place',
-                                        self.placeColour, self.placeRank)
+                self.SetTile(X, Y, self.placeType == 'Place',
+                             self.placeColour, self.placeRank)
                 self.SetButtons()
 
 
     def clickInPlay(self, X, Y):
         # X button
         if (10 <= X < 11 and -3 <= Y < -2):
-            ExitGame(self.win)
+            self.OnClose()
 
         # Save
         elif (8 <= X < 10 and -3 <= Y < -2):
@@ -734,9 +633,9 @@ class Checkers:
 
         # Resign
         elif (6 <= X < 8 and -3 <= Y < -2):
-            messagebox.showinfo("Resignation",
-                                  str(self.pTurn) + ' has resigned! ' +
-                                  str(self.opposite(self.pTurn)) + ' wins!')
+            self.messagebox.showinfo("Resignation",
+                                     str(self.pTurn) + ' has resigned! ' +
+                                     str(self.opposite(self.pTurn)) + ' wins!')
             self.state = 'CustomSetup'
             self.SetButtons()
 
@@ -746,24 +645,14 @@ class Checkers:
                 # Re-selecting same piece to deselect
                 if (self.selectedTileAt[0] == X and self.selectedTileAt[1] == Y and not self.pieceCaptured):
                     self.selectedTileAt = []
-                    self.tiles[X][Y] = Tile(self.win, X, Y,
-                                            self.tiles[X][Y].isPiece,
-                                            self.tiles[X][Y].pieceColour,
-                                            self.tiles[X][Y].pieceRank)
+                    self.tiles[X][Y].Select(False)
                 # Selecting a piece if it belongs to current player and can capture or no capture forced
                 elif (self.pTurn == self.tiles[X][Y].pieceColour and not self.pieceCaptured and
                       (self.PieceCanCapture(X, Y) or not self.PlayerCanCapture())):
                     sx, sy = self.selectedTileAt
-                    self.tiles[sx][sy] = Tile(self.win, sx, sy,
-                                              self.tiles[sx][sy].isPiece,
-                                              self.tiles[sx][sy].pieceColour,
-                                              self.tiles[sx][sy].pieceRank)
+                    self.tiles[sx][sy].Select(False)
                     self.selectedTileAt = [X, Y]
-                    self.tiles[X][Y] = Tile(self.win, X, Y,
-                                            self.tiles[X][Y].isPiece,
-                                            self.tiles[X][Y].pieceColour,
-                                            self.tiles[X][Y].pieceRank,
-                                            isSelected=True)
+                    self.tiles[X][Y].Select(True)
                 # Attempt a move
                 elif self.moveIsValid(self.selectedTileAt[0], self.selectedTileAt[1], X, Y):
                     # If capturing a piece, adjust X,Y to actual landing square
@@ -778,26 +667,22 @@ class Checkers:
                         self.SetButtons()
                         # Check for defeat if opponent has no moves
                         if not self.movesAvailable() and self.numColour(self.pTurn):
-                            messagebox.showinfo("Defeat",
-                                                  str(self.pTurn) + ' has no available moves! ' +
-                                                  str(self.opposite(self.pTurn)) + ' wins!')
+                            self.messagebox.showinfo("Defeat",
+                                                     str(self.pTurn) + ' has no available moves! ' +
+                                                     str(self.opposite(self.pTurn)) + ' wins!')
                             self.state = 'CustomSetup'
                             self.SetButtons()
                 else:
-                    messagebox.showinfo("Error", "Cannot perform that action.")
+                    self.messagebox.showinfo("Error", "Cannot perform that action.")
             else:
                 # Select a piece to move
                 if self.pTurn != self.tiles[X][Y].pieceColour:
-                    messagebox.showinfo("Error", "Select a piece of current player's colour")
+                    self.messagebox.showinfo("Error", "Select a piece of current player's colour")
                 elif not self.PieceCanCapture(X, Y) and self.PlayerCanCapture():
-                    messagebox.showinfo("Error", "Invalid selection, current player must take a piece")
+                    self.messagebox.showinfo("Error", "Invalid selection, current player must take a piece")
                 else:
                     self.selectedTileAt = [X, Y]
-                    self.tiles[X][Y] = Tile(self.win, X, Y,
-                                            self.tiles[X][Y].isPiece,
-                                            self.tiles[X][Y].pieceColour,
-                                            self.tiles[X][Y].pieceRank,
-                                            isSelected=True)
+                    self.tiles[X][Y].Select(True)
 
 
     def validTileSelect(self, X, Y):
@@ -868,60 +753,39 @@ class Checkers:
         # Place piece at destination
         if (colour == 'White' and Y == 7) or (colour == 'Black' and Y == 0):
             rank = 'King'
-        self.tiles[X][Y] = Tile(self.win, X, Y, True, colour, rank)
+        self.SetTile(X, Y, True, colour, rank)
 
         # Clear source
-        self.tiles[x][y] = Tile(self.win, x, y, False)
+        self.SetTile(x, y, False)
 
         # If jump, remove captured piece
         if abs(X - x) == 2:
             midx = x + (X - x) // 2
             midy = y + (Y - y) // 2
             if self.numColour(self.tiles[midx][midy].pieceColour) == 1:
-                messagebox.showinfo("Winner",
-                                      str(self.tiles[X][Y].pieceColour) + ' Wins!')
+                self.messagebox.showinfo("Winner",
+                                         str(self.tiles[X][Y].pieceColour) + ' Wins!')
                 self.state = 'CustomSetup'
                 self.SetButtons()
-            self.tiles[midx][midy] = Tile(self.win, midx, midy, False)
-
-            self.tiles[X][Y] = Tile(self.win, X, Y,
-                                    True,
-                                    self.tiles[X][Y].pieceColour,
-                                    self.tiles[X][Y].pieceRank)
-            if self.PieceCanCapture(X, Y):
-                self.tiles[X][Y] = Tile(self.win, X, Y,
-                                        True,
-                                        self.tiles[X][Y].pieceColour,
-                                        self.tiles[X][Y].pieceRank,
-                                        isSelected=True)
+            self.SetTile(midx, midy, False)
+
+            self.tiles[X][Y].Select(self.PieceCanCapture(X, Y))
             self.selectedTileAt = [X, Y]
             self.pieceCaptured = True
         else:
             self.selectedTileAt = []
-            self.tiles[X][Y] = Tile(self.win, X, Y,
-                                    True,
-                                    self.tiles[X][Y].pieceColour,
-                                    self.tiles[X][Y].pieceRank)
             self.pieceCaptured = False
 
 
     def PlayerCanCapture(self):
-        for i in range(self.BoardDimension):
-            for j in range(self.BoardDimension):
-                if self.pTurn == self.tiles[i][j].pieceColour:
-                    if self.PieceCanCapture(i, j):
-                        return True
-        return False
+        return self.position.can_capture(self.pTurn)
 
 
     def PieceCanCapture(self, x, y):
-        X1 = [x - 1, x + 1]
-        Y1 = [y - 1, y + 1]
-        for i in range(2):
-            for j in range(2):
-                if self.PieceCanCapturePiece(x, y, X1[i], Y1[j]):
-                    return True
-        return False
+        sq = square_of(x, y)
+        if sq is None:
+            return False
+        return bool(self.position.jumpers(self.pTurn) & BIT[sq])
 
 
     def PieceCanCapturePiece(self, x, y, X, Y):
@@ -994,28 +858,16 @@ class Checkers:
         """
         Place pieces in the standard starting positions.
         """
-        self.ClearBoard()
-        self.state = 'CustomSetup'
-        for i in range(self.BoardDimension):
-            for j in range(self.BoardDimension):
-                if self.TileColour(i, j) == 'Red' and (j < 3):
-                    self.tiles[i][j] = Tile(self.win, i, j, True, 'White', 'Pawn')
-                if self.TileColour(i, j) == 'Red' and (j > 4):
-                    self.tiles[i][j] = Tile(self.win, i, j, True, 'Black', 'Pawn')
+        self.ClearBoard(Position.standard())
 
 
     def numColour(self, colour):
         """
         Count how many pieces of the given colour are on board.
         """
-        c = 0
-        for i in range(self.BoardDimension):
-            for j in range(self.BoardDimension):
-                if colour == 'White' and self.tiles[i][j].isWhite:
-                    c += 1
-                elif colour == 'Black' and self.tiles[i][j].isBlack:
-                    c += 1
-        return c
+        if colour not in ('White', 'Black'):
+            return 0
+        return self.position.count(colour)
 
 
     def opposite(self, opp):
@@ -1039,7 +891,8 @@ class Checkers:
 
     def ClickedSquare(self, click):
         """
-        Convert a mouse-click Point into board coordinates (X, Y).
+        Convert a mouse-click Point into board coordinates (X, Y), or None
+        for a click that cannot be placed.
         """
         try:
             clickX = click.getX()
@@ -1054,7 +907,7 @@ class Checkers:
                 clickY = int(clickY)
             return clickX, clickY
         except IndexError:
-            return self.ClickedSquare(self.win.getMouse())
+            return None
 
 
     #
@@ -1073,47 +926,47 @@ class Checkers:
                         str(self.tiles[i][j].pieceRank)[0] + "\n"
                     )
         saveFile.write(self.pTurn[0])
-        messagebox.showinfo("Saved Complete", "Game setup was saved to checkers.txt")
+        self.messagebox.showinfo("Saved Complete", "Game setup was saved to checkers.txt")
         saveFile.close()
 
 
     def LoadSetupFromFile(self):
-        loadFile = open('checkers.txt', 'r')
-        piece_list = loadFile.readlines()
-        messagebox.showinfo("Loading", "Will now clear the board and \nplace the saved setup")
-        self.ClearBoard()
-        for i in range(len(piece_list) - 1):
-            tot_string = piece_list[i].strip()
-            x_var = int(tot_string[0])
-            y_var = int(tot_string[1])
-            colour_char = tot_string[2]
-            rank_char = tot_string[3]
-            if colour_char == 'W':
-                if rank_char == 'K':
-                    self.tiles[x_var][y_var] = Tile(self.win, x_var, y_var, True, 'White', 'King')
-                else:
-                    self.tiles[x_var][y_var] = Tile(self.win, x_var, y_var, True, 'White', 'Pawn')
-            else:
-                if rank_char == 'K':
-                    self.tiles[x_var][y_var] = Tile(self.win, x_var, y_var, True, 'Black', 'King')
-                else:
-                    self.tiles[x_var][y_var] = Tile(self.win, x_var, y_var, True, 'Black', 'Pawn')
-        if piece_list[-1].strip() == 'W':
-            self.pTurn = 'White'
-        else:
-            self.pTurn = 'Black'
-        self.SetButtons()
-        loadFile.close()
+        position = Position.from_setup_file('checkers.txt')
+        self.messagebox.showinfo("Loading", "Will now clear the board and \nplace the saved setup")
+        self.ClearBoard(position)
 
 
 # -----------------------------------
 # Tile class (holds state of one square)
 # -----------------------------------
 class Tile:
-    def __init__(self, win, X, Y, isPiece, pieceColour='', pieceRank='', isSelected=False):
+    """
+    One board square. Its rectangle, piece circle and king label are drawn
+    once when the board is built; Set() changes what the square holds by
+    reconfiguring them and showing or hiding the piece.
+    """
+    def __init__(self, win, X, Y):
         self.win = win
         self.x = X
         self.y = Y
+
+        self.rect = Rectangle(Point(X, Y), Point(X + 1, Y + 1))
+        self.rect.setFill(self.TileColour(X, Y))
+        self.rect.draw(self.win)
+
+        self.c = Point(self.x + 0.5, self.y + 0.5)
+        self.circ = Circle(self.c, 0.4)
+        self.circ.setVisible(False)
+        self.circ.draw(self.win)
+
+        self.kingTxt = Text(self.c, 'K')
+        self.kingTxt.setVisible(False)
+        self.kingTxt.draw(self.win)
+
+        self.Set(False)
+
+
+    def Set(self, isPiece, pieceColour='', pieceRank='', isSelected=False):
         self.isPiece = isPiece
         self.isWhite = (pieceColour == 'White') and isPiece
         self.isBlack = (pieceColour == 'Black') and isPiece
@@ -1131,27 +984,16 @@ class Tile:
         elif self.isPawn:
             self.pieceRank = 'Pawn'
 
-        self.c = Point(self.x + 0.5, self.y + 0.5)
-        self.circ = Circle(self.c, 0.4)
-
-        if isSelected:
-            self.circ.setOutline('Yellow')
-        else:
-            self.circ.setOutline('Black')
-            self.circ.undraw()
-
-        self.kingTxt = Text(self.c, 'K')
-        self.kingTxt.undraw()
-
-        self.ColourButton(self.TileColour(self.x, self.y), self.x, self.y)
+        self.Select(isSelected)
         if self.isPiece:
             self.DrawPiece()
+        else:
+            self.circ.setVisible(False)
+            self.kingTxt.setVisible(False)
 
 
-    def ColourButton(self, colour, X, Y, width=1, height=1):
-        rect = Rectangle(Point(X, Y), Point(X + width, Y + height))
-        rect.setFill(colour)
-        rect.draw(self.win)
+    def Select(self, isSelected):
+        self.circ.setOutline('Yellow' if isSelected else 'Black')
 
 
     def TileColour(self, x, y):
@@ -1161,13 +1003,15 @@ class Tile:
 
 
     def DrawPiece(self):
-        self.circ.draw(self.win)
         col1 = 'White' if self.isWhite else 'Black'
         col2 = 'Black' if self.isWhite else 'White'
         self.circ.setFill(col1)
+        self.circ.setVisible(True)
         if self.isKing:
-            self.kingTxt.draw(self.win)
             self.kingTxt.setFill(col2)
+            self.kingTxt.setVisible(True)
+        else:
+            self.kingTxt.setVisible(False)
 
 
 def ExitGame(win):
@@ -1175,5 +1019,10 @@ def ExitGame(win):
     sys.exit()
 
 
-# Instantiate and run
-game = Checkers()
\ No newline at end of file
+def main():
+    """Open the game window and play until it is closed."""
+    Checkers().Run()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,17 @@
 from graphics import *
 import sys
-import tkMessageBox
+try:
+    import tkMessageBox
+except ImportError:                 #Python 3
+    from tkinter import messagebox as tkMessageBox
+from checkers_engine import Position
+from checkers_inference import FactBase, ReteNetwork
 
 '''
 The revisions in the code are labelled by the prefix '#+-'
 '''
 class Checkers:
-    def __init__(s):
+    def __init__(s,headless=None):
         s.state = 'CustomSetup'
         s.is1P = False
         #+-added string
@@ -20,16 +25,34 @@ class Checkers:
         s.selectedTileAt = []
         s.hasMoved = False
         s.pieceCaptured = False
+        s.compScheduled = False     #the computer's turn is waiting in after_idle
+        s.inference = None      #ReteNetwork kept in step with the board during Play
 
         s.BoardDimension = 8
         s.numPiecesAllowed = 12
 
-        s.win = GraphWin('Checkers',600,600)    #draws screen
+        #headless (the headless argument, or CHECKERS_HEADLESS=1 in the environment) plays the
+        #same game in a NullGraphWin: nothing is drawn and message boxes are only recorded
+        if headless is None:
+            headless = HEADLESS
+        s.headless = headless
+        if headless:
+            s.win = NullGraphWin('Checkers',600,600)
+            s.messagebox = NullMessagebox()
+        else:
+            s.win = GraphWin('Checkers',600,600)    #draws screen
+            s.messagebox = tkMessageBox
         s.win.setBackground('White')
         s.win.setCoords(-1,-3,11,9)              #creates a coordinate system for the window
-        s.ClearBoard()
-        
-        s.tiles = [[Tile(s.win,i,j,False) for i in range(s.BoardDimension)] for j in range(s.BoardDimension)]  #creates the 2D list and initializes all 8x8 entries to an empty tile
+
+        #one Tile per square for the whole session, indexed tiles[x][y]; moves reconfigure them
+        #instead of drawing new ones, and the panel's rectangles and labels are pooled by place
+        with s.win.batch():
+            s.tiles = [[Tile(s.win,x,y) for y in range(s.BoardDimension)] for x in range(s.BoardDimension)]
+            s.buttons = {}
+            s.labels = {}
+            s.shownItems = []
+            s.ClearBoard()
 
         s.moves = []
 
@@ -41,8 +64,6 @@ class Checkers:
             Text(Point(i+0.5,8.5),gridLetters[i]).draw(s.win) 
         
         s.SetButtons()
-        
-        s.SetupBoard()
 
 
 ########################################
@@ -50,16 +71,28 @@ class Checkers:
 ########################################
 
     def RunInferenceTurn(self):
-        """Main entry point for inference-based AI logic (top-down flow)."""
-        facts = self.ExtractFactsFromBoard()
-        candidate_rules = self.MatchRules(facts)
-        chosen_rule = self.SelectRuleToFire(candidate_rules)
-        if chosen_rule:
-            self.ExecuteAction(chosen_rule)
+        """
+        Main entry point for inference-based AI logic (top-down flow).
+
+        The facts live in a ReteNetwork that move() keeps up to date, so a
+        turn only re-derives the facts near the squares the last move
+        changed, and the rules run as one function compiled from
+        checkers_inference.RULES; ExtractFactsFromBoard, MatchRules and
+        SelectRuleToFire below are the interpreted version of the same
+        rules. In the middle of a capture only the capturing piece may go
+        on jumping.
+        """
+        if self.inference is None:
+            self.inference = ReteNetwork(Position.from_tiles(self.tiles, self.pTurn))
+        piece = tuple(self.selectedTileAt) if self.pieceCaptured else None
+        chosen = self.inference.decide(self.pTurn, piece)
+        if chosen:
+            self.ExecuteAction({'type': chosen[0], 'from': chosen[1], 'to': chosen[2]})
+        return chosen
 
     def ExtractFactsFromBoard(self):
-        """Generate a fact base from the current board state."""
-        facts = set()
+        """Generate a fact base, indexed by predicate, colour and square, from the current board state."""
+        facts = FactBase()
         for x in range(self.BoardDimension):
             for y in range(self.BoardDimension):
                 tile = self.tiles[x][y]
@@ -80,53 +113,49 @@ class Checkers:
         rules = []
 
         # 1) Mandatory jumps
-        for fact in facts:
-            if fact[0] == 'can_jump' and fact[1] == s.pTurn:
+        for fact in facts.lookup('can_jump', s.pTurn):
+            rules.append({
+                'type':'jump',
+                'from': fact[2],
+                'to':   fact[3]
+            })
+
+        # 2) Promotions (any advance that lands on the back rank)
+        for fact in facts.lookup('can_advance', s.pTurn):
+            fx, fy = fact[2]
+            tx, ty = fact[3]
+            # back rank = row 7 for White, row 0 for Black
+            if (s.pTurn == 'White' and ty == s.BoardDimension-1) or \
+            (s.pTurn == 'Black' and ty == 0):
                 rules.append({
-                    'type':'jump',
-                    'from': fact[2],
-                    'to':   fact[3]
+                    'type':'promote',
+                    'from': (fx, fy),
+                    'to':   (tx, ty)
                 })
 
-        # 2) Promotions (any advance that lands on the back rank)
-        for fact in facts:
-            if fact[0] == 'can_advance' and fact[1] == s.pTurn:
+        # 3) Safe advances (only if no jumps or promotions)
+        has_jumps_or_promos = any(r['type'] in ('jump','promote') for r in rules)
+        if not has_jumps_or_promos:
+            for fact in facts.lookup('can_advance', s.pTurn):
                 fx, fy = fact[2]
                 tx, ty = fact[3]
-                # back rank = row 7 for White, row 0 for Black
-                if (s.pTurn == 'White' and ty == s.BoardDimension-1) or \
-                (s.pTurn == 'Black' and ty == 0):
+                if s.isSafeMove(fx, fy, tx, ty):
                     rules.append({
-                        'type':'promote',
+                        'type':'advance',
                         'from': (fx, fy),
                         'to':   (tx, ty)
                     })
 
-        # 3) Safe advances (only if no jumps or promotions)
-        has_jumps_or_promos = any(r['type'] in ('jump','promote') for r in rules)
-        if not has_jumps_or_promos:
-            for fact in facts:
-                if fact[0] == 'can_advance' and fact[1] == s.pTurn:
-                    fx, fy = fact[2]
-                    tx, ty = fact[3]
-                    if s.isSafeMove(fx, fy, tx, ty):
-                        rules.append({
-                            'type':'advance',
-                            'from': (fx, fy),
-                            'to':   (tx, ty)
-                        })
-
         # 4) Fallback: if we still have nothing, allow all advances
         if not rules:
-            for fact in facts:
-                if fact[0] == 'can_advance' and fact[1] == s.pTurn:
-                    fx, fy = fact[2]
-                    tx, ty = fact[3]
-                    rules.append({
-                        'type':'advance',
-                        'from': (fx, fy),
-                        'to':   (tx, ty)
-                    })
+            for fact in facts.lookup('can_advance', s.pTurn):
+                fx, fy = fact[2]
+                tx, ty = fact[3]
+                rules.append({
+                    'type':'advance',
+                    'from': (fx, fy),
+                    'to':   (tx, ty)
+                })
 
         return rules
     
@@ -249,25 +278,39 @@ class Checkers:
 
 
 	####
-    #handles the setup of the board (i.e. piece placement)
-	####
-    def SetupBoard(s):
-        while s.state == 'CustomSetup':
-            s.Click()
-        if s.state == 'Play':
-            s.Play()
+    #event loop: everything happens in Tk callbacks -- OnClick for the mouse and
+    #after_idle() for the computer's turn -- so nothing recurses or polls between
+    #moves and a session can go on for any number of games
 	####
-    #handles the general play of the game
-	####
-    def Play(s):
-        while s.state == 'Play':
-            #+-added if statement
-            if s.is1P and s.compIsColour == s.pTurn:
-                s.RunInferenceTurn()
-            else:
-                s.Click()
-        if s.state == 'CustomSetup':
-            s.SetupBoard()
+    def Run(s):
+        s.win.setMouseHandler(s.OnClick)
+        s.win.master.protocol("WM_DELETE_WINDOW", s.OnClose)
+        s.Continue()
+        s.win.mainloop()        #returns once the window is closed
+
+    def OnClick(s,point):
+        click = Point(*s.win.toWorld(point.getX(),point.getY()))
+        square = s.ClickedSquare(click)    #Gets click coords
+        if square is not None:
+            with s.win.batch():
+                s.Action(square[0],square[1])
+        s.Continue()
+
+    def OnClose(s):
+        ExitGame(s.win)
+
+    def Continue(s):    #schedules the computer's turn when it is to play; the human's turn waits for OnClick
+        if s.state == 'Play' and s.is1P and s.compIsColour == s.pTurn and not s.compScheduled:
+            s.compScheduled = True
+            s.win.after_idle(s.OnCompTurn)
+
+    def OnCompTurn(s):
+        s.compScheduled = False
+        if s.state == 'Play' and s.is1P and s.compIsColour == s.pTurn:
+            with s.win.batch():
+                moved = s.RunInferenceTurn()
+            if moved:
+                s.Continue()    #a capture can leave it to play again
 
     ####
 	#+-added to determine whether the player whose turn it is has more pieces than opponent
@@ -315,18 +358,35 @@ class Checkers:
 
 	#Resets the board to be empty
     def ClearBoard(s):
-        s.tiles=[[Tile(s.win,i,j,False) for i in range(s.BoardDimension)] for j in range(s.BoardDimension)]  #creates the 2D list and initializes all 8x8 entries to an empty tile
-        for i in range(s.BoardDimension):
-            for j in range(s.BoardDimension):
-                s.ColourButton(s.TileColour(i,j),i,j)
+        for column in s.tiles:
+            for tile in column:
+                tile.Set(False)
         s.state = 'CustomSetup'
         s.pTurn = 'White'
         s.SetButtons()
 
-    def ColourButton(s,colour,X,Y,width=1,height=1):        #function to create a rectangle with a given colour, size, and location
-        rect = Rectangle(Point(X,Y),Point(X+width,Y+height))
+    def ColourButton(s,colour,X,Y,width=1,height=1):        #shows the rectangle with a given colour, size, and location; each place gets one Rectangle, drawn the first time
+        key = (X,Y,width,height)
+        rect = s.buttons.get(key)
+        if rect is None:
+            rect = s.buttons[key] = Rectangle(Point(X,Y),Point(X+width,Y+height))
+            rect.draw(s.win)
         rect.setFill(colour)
-        rect.draw(s.win)
+        s.ShowItem(rect)
+
+    def Label(s,X,Y,text,colour='black'):       #shows text centred on X,Y, reusing the Text already there
+        txt = s.labels.get((X,Y))
+        if txt is None:
+            txt = s.labels[(X,Y)] = Text(Point(X,Y),text)
+            txt.draw(s.win)
+        else:
+            txt.setText(text)
+        txt.setFill(colour)
+        s.ShowItem(txt)
+
+    def ShowItem(s,item):
+        item.setVisible(True)
+        s.shownItems.append(item)
             
     def TileColour(s,x,y):
         if (x%2 == 0 and y%2 == 0) or (x%2 == 1 and y%2 == 1):
@@ -338,102 +398,103 @@ class Checkers:
     #Draws Buttons
     ##########    
     def SetButtons(s):
-        s.ColourButton('White',-1,-3,12,2)
-        s.ColourButton('White',9,-1,2,10)
-
-        if s.state == 'CustomSetup':
-            s.DrawStandard()
-            s.DrawStart()
-            s.DrawClear()
-            s.Draw1P()
-            s.Draw2P()
-            s.DrawLoad()
-            s.DrawSave()
-            s.DrawTurn()
-            s.DrawX()
+        with s.win.batch():   #one screen update for the whole redraw
+            s.shownItems = []
+            s.ColourButton('White',-1,-3,12,2)
+            s.ColourButton('White',9,-1,2,10)
+
+            if s.state == 'CustomSetup':
+                s.DrawStandard()
+                s.DrawStart()
+                s.DrawClear()
+                s.Draw1P()
+                s.Draw2P()
+                s.DrawLoad()
+                s.DrawSave()
+                s.DrawTurn()
+                s.DrawX()
             
-            s.DrawW()
-            s.DrawB()
-            s.DrawK()
-            s.DrawDel()
-
-            s.DrawScore() #not actually a button
-        elif s.state == 'Play':
-            #+-updated method name
-            s.DrawResign()
-            s.DrawSave()
-            s.DrawTurn()
-            s.DrawX()
-
-            s.DrawScore() #not actually a button
+                s.DrawW()
+                s.DrawB()
+                s.DrawK()
+                s.DrawDel()
+
+                s.DrawScore() #not actually a button
+            elif s.state == 'Play':
+                #+-updated method name
+                s.DrawResign()
+                s.DrawSave()
+                s.DrawTurn()
+                s.DrawX()
+
+                s.DrawScore() #not actually a button
+
+            shown = set(map(id,s.shownItems))     #buttons and labels this state does not use are hidden, not deleted
+            for item in list(s.buttons.values()) + list(s.labels.values()):
+                if id(item) not in shown:
+                    item.setVisible(False)
 
     def DrawStandard(s):
         s.ColourButton('White',-1,-2,2,1)    #Standard Setup button
-        Text(Point(0,-1.3),'Standard').draw(s.win)
-        Text(Point(0,-1.7),'Setup').draw(s.win)
+        s.Label(0,-1.3,'Standard')
+        s.Label(0,-1.7,'Setup')
     def DrawCustom(s):
         s.ColourButton('White',-1,-3,2,1)    #Custom Setup button
-        Text(Point(0,-2.3),'Custom').draw(s.win)  
-        Text(Point(0,-2.7),'Setup').draw(s.win)
+        s.Label(0,-2.3,'Custom')
+        s.Label(0,-2.7,'Setup')
     def DrawStart(s):
         s.ColourButton('Yellow',1,-2)    #Start! button
-        Text(Point(1.5,-1.5),'Start!').draw(s.win)
+        s.Label(1.5,-1.5,'Start!')
     def DrawClear(s):
         s.ColourButton('White',-1,-3,2,1)    #Clear Board button
-        Text(Point(0,-2.3),'Clear').draw(s.win)
-        Text(Point(0,-2.7),'Board').draw(s.win)
+        s.Label(0,-2.3,'Clear')
+        s.Label(0,-2.7,'Board')
     def Draw1P(s):
         col = 'Red'
         if s.is1P:
             s.DrawCompColour()
         else:
             s.ColourButton(col,3,-2,2,1)    #1Player   -- (1AI)
-            Text(Point(4,-1.3),'1Player').draw(s.win)
-            Text(Point(4,-1.7),'Game').draw(s.win)
+            s.Label(4,-1.3,'1Player')
+            s.Label(4,-1.7,'Game')
     def DrawCompColour(s):
         s.ColourButton(s.compIsColour,3,-2,2,1)
-        txt1 = Text(Point(4,-1.3),'Comp Is')
-        txt2 = Text(Point(4,-1.7),s.compIsColour)
-        txt1.draw(s.win)
-        txt2.draw(s.win)
-        txt1.setFill(s.opposite(s.compIsColour))
-        txt2.setFill(s.opposite(s.compIsColour))
+        s.Label(4,-1.3,'Comp Is',s.opposite(s.compIsColour))
+        s.Label(4,-1.7,s.compIsColour,s.opposite(s.compIsColour))
     def Draw2P(s):#2Player
         col = 'Green'
         if s.is1P:
             col = 'Red'
         s.ColourButton(col,3,-3,2,1)    
-        Text(Point(4,-2.3),'2Player').draw(s.win)  
-        Text(Point(4,-2.7),'Game').draw(s.win)
+        s.Label(4,-2.3,'2Player')
+        s.Label(4,-2.7,'Game')
     def DrawLoad(s):#Load
         s.ColourButton('White',6,-3,2,1)    
-        Text(Point(7,-2.5),'Load').draw(s.win)
+        s.Label(7,-2.5,'Load')
     def DrawSave(s):    #Save
         s.ColourButton('White',8,-3,2,1)
-        Text(Point(9,-2.5),'Save').draw(s.win)
+        s.Label(9,-2.5,'Save')
     def DrawX(s):#X
         s.ColourButton('Red',10,-3)    
-        Exit_txt = Text(Point(10.5,-2.5),'X')
-        Exit_txt.draw(s.win)
-        Exit_txt.setFill('White')
+        s.Label(10.5,-2.5,'X','White')
     def DrawW(s):#W
         col = 'Green'
         if s.placeColour != 'White':
             col = 'Red'
         s.ColourButton(col,6,-2)    
-        Text(Point(6.5,-1.5),'W').draw(s.win)
+        s.Label(6.5,-1.5,'W')
     def DrawB(s):#B
         col = 'Red'
         if s.placeColour != 'White':
             col = 'Green'
         s.ColourButton(col,7,-2)    
-        Text(Point(7.5,-1.5),'B').draw(s.win)
+        s.Label(7.5,-1.5,'B')
     def DrawK(s): #K
         col = 'Red'
         if s.placeRank == 'King':
             col = 'Green'
         s.ColourButton(col,8,-2) 
-        Text(Point(8.5,-1.5),'K').draw(s.win)
+        s.Label(8.5,-1.5,'K')
     def DrawDel(s):#Del
         col1 = 'Black'#square colour
         col2 = 'White'#text colour
@@ -441,12 +502,10 @@ class Checkers:
             col1 = 'Green'
             col2 = 'Black'        
         s.ColourButton(col1,9,-2)    
-        deleteTxt = Text(Point(9.5,-1.5),'Del')
-        deleteTxt.draw(s.win)
-        deleteTxt.setFill(col2)
+        s.Label(9.5,-1.5,'Del',col2)
     def DrawResign(s):
         s.ColourButton('White',6,-3,2,1)    #Load
-        Text(Point(7,-2.5),'Resign').draw(s.win)
+        s.Label(7,-2.5,'Resign')
     def DrawTurn(s):
         col1 = 'White'
         col2 = 'Black'
@@ -454,25 +513,16 @@ class Checkers:
             col1 = 'Black'
             col2 = 'White'
         s.ColourButton(col1,9,8,2,1)    #Standard Setup button
-        txt1 = Text(Point(10,8.7),col1)
-        txt2 = Text(Point(10,8.3),'Turn')
-        txt1.draw(s.win)
-        txt2.draw(s.win)
-        txt1.setFill(col2)
-        txt2.setFill(col2)
+        s.Label(10,8.7,col1,col2)
+        s.Label(10,8.3,'Turn',col2)
     def DrawScore(s): # draw score
-        Text(Point(10,7.5),'# White').draw(s.win)
-        Text(Point(10,7.1),'Pieces:').draw(s.win)
-        Text(Point(10,6.7),s.numColour('White')).draw(s.win)
-        Text(Point(10,5.9),'# Black').draw(s.win)
-        Text(Point(10,5.5),'Pieces').draw(s.win)
-        Text(Point(10,5.1),s.numColour('Black')).draw(s.win)
+        s.Label(10,7.5,'# White')
+        s.Label(10,7.1,'Pieces:')
+        s.Label(10,6.7,s.numColour('White'))
+        s.Label(10,5.9,'# Black')
+        s.Label(10,5.5,'Pieces')
+        s.Label(10,5.1,s.numColour('Black'))
                  
-    def Click(s):
-        click = s.win.getMouse()        #Perform mouse click
-        X, Y = s.ClickedSquare(click)   #Gets click coords
-        s.Action(X,Y)
-        
     def Action(s,X,Y):      #performs action for the location X,Y --essentially means user clicked there or computer is 'clicked' there
         if s.state == 'CustomSetup':
             s.clickInCustom(X,Y)
@@ -489,9 +539,10 @@ class Checkers:
             num_wh = s.numColour('White')
             num_bl = s.numColour('Black')
             if ((num_wh == 0) and (num_bl == 0)): #This means there are no pieces on the board; this is a pointless setup.
-                tkMessageBox.showinfo("Error", "No pieces have been placed!")
+                s.messagebox.showinfo("Error", "No pieces have been placed!")
             else:
                 s.state = 'Play'
+                s.inference = ReteNetwork(Position.from_tiles(s.tiles, s.pTurn))
                 s.SetButtons()
         elif (-1<=X<1 and -3<=Y<-2): #Clear Board clicked
             s.ClearBoard()
@@ -530,13 +581,13 @@ class Checkers:
             s.SetButtons()
         elif (0<=X<8 and 0<=Y<8): #Tile clicked in CustomSetup
             if s.tiles[X][Y].TileColour(X,Y) == 'White': #Clicked tile is White
-                tkMessageBox.showinfo("Error", "Illegal Placement")
+                s.messagebox.showinfo("Error", "Illegal Placement")
             elif s.numColour(s.placeColour) >= s.numPiecesAllowed and s.placeType == 'Place': #clicked tile would result in too many of colour being placed
-                tkMessageBox.showinfo("Error", "Illegal Placement")
+                s.messagebox.showinfo("Error", "Illegal Placement")
             elif (Y == 7 and s.placeColour == 'White' and not(s.placeRank == 'King')) or (Y == 0 and s.placeColour == 'Black' and not(s.placeRank == 'King')): #placing a non-king on a king square
-                tkMessageBox.showinfo("Error", "Illegal Placement")
+                s.messagebox.showinfo("Error", "Illegal Placement")
             else: #Valid tile update action (i.e. piece placement or deletion)
-                s.tiles[X][Y] = Tile(s.win,X,Y,s.placeType == 'Place',s.placeColour,s.placeRank)    #updates that square in array
+                s.tiles[X][Y].Set(s.placeType == 'Place',s.placeColour,s.placeRank)    #updates that square in array
                 s.SetButtons()
 
 	#Handles mouse clicks
@@ -548,18 +599,18 @@ class Checkers:
             s.SaveSetupToFile()
         elif (6<=X<8 and -3<=Y<-2): #Resign clicked
         #+-added message box indicating which player had quit/resigned
-            tkMessageBox.showinfo("Resignation", str(s.pTurn) + ' has resigned! ' + str(s.opposite(s.pTurn)) + ' wins!')
+            s.messagebox.showinfo("Resignation", str(s.pTurn) + ' has resigned! ' + str(s.opposite(s.pTurn)) + ' wins!')
             s.state = 'CustomSetup'
             s.SetButtons()
         elif (0<=X<8 and 0<=Y<8): #Tile Clicked in Play
             if s.selectedTileAt != []: #move if able
                 if s.selectedTileAt[0] == X and s.selectedTileAt[1] == Y and not s.pieceCaptured: #Re-Selecting the already selected piece de-selects it
                     s.selectedTileAt = []
-                    s.tiles[X][Y] = Tile(s.win,X,Y,s.tiles[X][Y].isPiece,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank)
+                    s.tiles[X][Y].Select(False)
                 elif s.pTurn == s.tiles[X][Y].pieceColour and not s.pieceCaptured and (s.PieceCanCapture(X,Y) or not s.PlayerCanCapture()): 
-                    s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]] = Tile(s.win,s.selectedTileAt[0],s.selectedTileAt[1],s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]].isPiece,s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]].pieceColour,s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]].pieceRank)
+                    s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]].Select(False)
                     s.selectedTileAt = [X,Y]
-                    s.tiles[X][Y] = Tile(s.win,X,Y,s.tiles[X][Y].isPiece,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank,isSelected=True)
+                    s.tiles[X][Y].Select(True)
                 elif s.moveIsValid(s.selectedTileAt[0],s.selectedTileAt[1],X,Y):
 #####################+-added extra code here
                     if s.tiles[X][Y].isPiece:
@@ -574,20 +625,20 @@ class Checkers:
                         s.SetButtons()
                         #+-added if statement to check defeat
                         if s.movesAvailable() == [] and s.numColour(s.pTurn):
-                            tkMessageBox.showinfo("Defeat", str(s.pTurn) + ' has no available moves! ' + str(s.opposite(s.pTurn)) + ' wins!')
+                            s.messagebox.showinfo("Defeat", str(s.pTurn) + ' has no available moves! ' + str(s.opposite(s.pTurn)) + ' wins!')
                             s.state = 'CustomSetup'
                             s.SetButtons()
 
                 else:
-                    tkMessageBox.showinfo("Error", "Cannot perform that action.")
+                    s.messagebox.showinfo("Error", "Cannot perform that action.")
             else: #Select a Piece to move
                 if s.pTurn != s.tiles[X][Y].pieceColour:
-                    tkMessageBox.showinfo("Error", "Select a piece of current player's colour")
+                    s.messagebox.showinfo("Error", "Select a piece of current player's colour")
                 elif (not s.PieceCanCapture(X,Y)) and s.PlayerCanCapture():
-                    tkMessageBox.showinfo("Error", "Invalid selection, current player must take a piece")
+                    s.messagebox.showinfo("Error", "Invalid selection, current player must take a piece")
                 else:
                     s.selectedTileAt = [X,Y]
-                    s.tiles[X][Y] = Tile(s.win,X,Y,s.tiles[X][Y].isPiece,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank,isSelected=True)
+                    s.tiles[X][Y].Select(True)
 
     #+-added to determine whether the tile attempting to be selected is valid
     def validTileSelect(s,X,Y):
@@ -644,33 +695,35 @@ class Checkers:
 # This Function Enables a Piece to move. Trace Back --> Requirement 1.3
 ########
     def move(s,x,y,X,Y): #parameters -> self,starting x,starting y,final X,final Y      assumes valid move as input           
-        s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[x][y].pieceColour,s.tiles[x][y].pieceRank)
-
-        if (Y==7 and s.tiles[X][Y].isWhite) or \
-           (Y==0 and s.tiles[X][Y].isBlack):
-            s.tiles[X][Y].pieceRank = 'King'
-
-        s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank)
-        s.tiles[x][y] = Tile(s.win,x,y,isPiece=False)
-        if X-x == 2 or X-x == -2:
-            if s.numColour(s.tiles[x+(X-x)/2][y+(Y-y)/2].pieceColour) == 1:
-                tkMessageBox.showinfo("Winner", str(s.tiles[X][Y].pieceColour) + ' Wins!')
-                #+-updated to allow another game to be played after a winner is declared
-                s.state = 'CustomSetup'
-                s.SetButtons()
-            s.tiles[x+(X-x)/2][y+(Y-y)/2] = Tile(s.win,x+(X-x)/2,y+(Y-y)/2,isPiece=False)
-
-            s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank)
-            if s.PieceCanCapture(X,Y):
-                s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank,isSelected=True)
-
-            s.selectedTileAt = [X,Y]
-            s.pieceCaptured = True
-        else:
-            s.selectedTileAt = []
-            
-            s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank)
-            s.pieceCaptured = False
+        with s.win.batch():   #one screen update for the whole redraw
+            colour,rank = s.tiles[x][y].pieceColour,s.tiles[x][y].pieceRank
+            if (Y==7 and colour == 'White') or \
+               (Y==0 and colour == 'Black'):
+                rank = 'King'
+
+            s.tiles[X][Y].Set(True,colour,rank)
+            s.tiles[x][y].Set(False)
+            if X-x == 2 or X-x == -2:
+                if s.numColour(s.tiles[x+(X-x)//2][y+(Y-y)//2].pieceColour) == 1:
+                    s.messagebox.showinfo("Winner", str(s.tiles[X][Y].pieceColour) + ' Wins!')
+                    #+-updated to allow another game to be played after a winner is declared
+                    s.state = 'CustomSetup'
+                    s.SetButtons()
+                s.tiles[x+(X-x)//2][y+(Y-y)//2].Set(False)
+
+                s.tiles[X][Y].Select(s.PieceCanCapture(X,Y))
+
+                s.selectedTileAt = [X,Y]
+                s.pieceCaptured = True
+            else:
+                s.selectedTileAt = []
+                s.pieceCaptured = False
+
+            if s.inference is not None:     #tell the inference network which squares changed
+                changed = [(x,y),(X,Y)]
+                if X-x == 2 or X-x == -2:
+                    changed.append((x+(X-x)//2,y+(Y-y)//2))
+                s.inference.apply([(cx,cy,(s.tiles[cx][cy].pieceColour,s.tiles[cx][cy].pieceRank) if s.tiles[cx][cy].isPiece else None) for cx,cy in changed])
                  
 #the below few functions need conditions added to handle out of bounds errors (for being off grid, i.e. 0<=X<8 or 0<=Y<8 doesn't hold)      <--- I think this is handled in PieceCanCapturePiece      
     def PlayerCanCapture(s):
@@ -747,9 +800,9 @@ class Checkers:
         for i in range(s.BoardDimension):
             for j in range(s.BoardDimension):
                 if s.tiles[i][j].TileColour(i,j) == 'Red' and (j < 3):
-                    s.tiles[i][j] = Tile(s.win,i,j,True,'White','Pawn')
+                    s.tiles[i][j].Set(True,'White','Pawn')
                 if s.tiles[i][j].TileColour(i,j) == 'Red' and (j > 4):
-                    s.tiles[i][j] = Tile(s.win,i,j,True,'Black','Pawn')
+                    s.tiles[i][j].Set(True,'Black','Pawn')
                     #places all the pieces in default checkers postitions
 
     def numColour(s,colour): #counts the number of pieces of a given colour
@@ -798,7 +851,7 @@ class Checkers:
                 clickY = int(clickY)
             return clickX, clickY
         except IndexError:          #some positions on the outskirts of the screen are invalid locations
-            s.Click()
+            return None
 
 #######
 # This Function Saves the game to be resumed later. Trace back --> Requirement 1.6
@@ -814,7 +867,7 @@ class Checkers:
                     saveFile.write(i_string + j_string + str(s.tiles[i][j].pieceColour)[0] + \
                                    str(s.tiles[i][j].pieceRank)[0] + "\n")
         saveFile.write(s.pTurn[0]) #saves whose turn it is too
-        tkMessageBox.showinfo("Saved Complete", "Game setup was saved to checkers.txt")
+        s.messagebox.showinfo("Saved Complete", "Game setup was saved to checkers.txt")
         saveFile.close()
 
 ##########################
@@ -823,7 +876,7 @@ class Checkers:
     def LoadSetupFromFile(s): #method gets the setup saved and places pieces accordingly
         loadFile = open ('checkers.txt' , 'r') #opens file to read
         piece_list = loadFile.readlines()
-        tkMessageBox.showinfo("Loading", "Will now clear the board and \nplace the saved setup")
+        s.messagebox.showinfo("Loading", "Will now clear the board and \nplace the saved setup")
         s.ClearBoard()
         for i in range(len(piece_list) - 1):
             tot_string = piece_list[i]
@@ -834,17 +887,17 @@ class Checkers:
             #second letter - 'K' is a King piece, 'P' is a pawn piece
             if (tot_string[2] == 'W'): #it is a white piece
                 if (tot_string[3] == 'K'): #it is a white King piece
-                    s.tiles[x_var][y_var] = Tile(s.win,x_var,y_var,True,'White','King')
+                    s.tiles[x_var][y_var].Set(True,'White','King')
                 else : #piece is a white pawn
                     assert(tot_string[3] == 'P')
-                    s.tiles[x_var][y_var] = Tile(s.win,x_var,y_var,True,'White','Pawn')
+                    s.tiles[x_var][y_var].Set(True,'White','Pawn')
             else: #piece is black
                 assert(tot_string[2] == 'B')
                 if (tot_string[3] == 'K'): #piece is a black King
-                    s.tiles[x_var][y_var] = Tile(s.win,x_var,y_var,True,'Black','King')
+                    s.tiles[x_var][y_var].Set(True,'Black','King')
                 else: #piece is a black pawn
                     assert(tot_string[3] == 'P')
-                    s.tiles[x_var][y_var] = Tile(s.win,x_var,y_var,True,'Black','Pawn')
+                    s.tiles[x_var][y_var].Set(True,'Black','Pawn')
         #whose turn it was is restored
         if (piece_list[len(piece_list)-1] == 'W'): #it is white's turn
             s.pTurn = 'White'
@@ -859,14 +912,32 @@ class Checkers:
     This was done to ensure a seamless transition for when the game actually ran.
 '''
 ##########
-#defines a tile and holds its current state
+#defines a tile and holds its current state; its rectangle, circle and king label are drawn once
+#and Set() changes what the square holds by reconfiguring them and showing or hiding the piece
 ##########
 
 class Tile:
-    def __init__(s,win,X,Y,isPiece,pieceColour='',pieceRank='',isSelected=False):
+    def __init__(s,win,X,Y):
         s.win = win
         s.x = X
         s.y = Y
+
+        s.rect = Rectangle(Point(X,Y),Point(X+1,Y+1))
+        s.rect.setFill(s.TileColour(X,Y))
+        s.rect.draw(s.win)
+
+        s.c = Point(s.x+.5,s.y+.5)
+        s.circ = Circle(s.c,0.4)
+        s.circ.setVisible(False)
+        s.circ.draw(s.win)
+
+        s.kingTxt = Text(s.c,'K')
+        s.kingTxt.setVisible(False)
+        s.kingTxt.draw(s.win)
+
+        s.Set(False)
+
+    def Set(s,isPiece,pieceColour='',pieceRank='',isSelected=False):
         s.isPiece = isPiece
         s.isWhite = ('White' == pieceColour) and s.isPiece
         s.isBlack = ('Black' == pieceColour) and s.isPiece
@@ -884,28 +955,20 @@ class Tile:
         elif s.isPawn:
             s.pieceRank = 'Pawn'
 
-        s.c = Point(s.x+.5,s.y+.5)
-        s.circ = Circle(s.c,0.4)
-
-        if isSelected:
-            s.circ.setOutline('Yellow')
-        else:
-            s.circ.setOutline('Black')
-            s.circ.undraw()
-
-        s.kingTxt = Text(s.c,'K')
-        s.kingTxt.undraw()
-
-        s.ColourButton(s.TileColour(s.x,s.y),s.x,s.y)
+        s.Select(isSelected)
         if s.isPiece:
             s.DrawPiece()
+        else:
+            s.circ.setVisible(False)
+            s.kingTxt.setVisible(False)
 ##########
-#function to create a rectangle with a given colour, size, and location
+#outlines the piece in yellow while it is selected
 ##########
-    def ColourButton(s,colour,X,Y,width=1,height=1):
-        rect = Rectangle(Point(X,Y),Point(X+width,Y+height))
-        rect.setFill(colour)
-        rect.draw(s.win)
+    def Select(s,isSelected):
+        if isSelected:
+            s.circ.setOutline('Yellow')
+        else:
+            s.circ.setOutline('Black')
         
 ##########
 #Tiles on the board
@@ -920,18 +983,19 @@ class Tile:
 #Displays White or Black or King Pieces
 ##########
     def DrawPiece(s):
-        s.circ.draw(s.win)
-
         if s.isWhite:
             col1,col2 = 'White','Black'
         elif s.isBlack:
             col1,col2 = 'Black','White'
 
         s.circ.setFill(col1)
+        s.circ.setVisible(True)
 
         if s.isKing:
-            s.kingTxt.draw(s.win)
             s.kingTxt.setFill(col2)
+            s.kingTxt.setVisible(True)
+        else:
+            s.kingTxt.setVisible(False)
 
 ##########
 #Quit
@@ -939,5 +1003,9 @@ class Tile:
 def ExitGame(win):
     win.close()
     sys.exit()
-    
-game = Checkers()
+
+def main():     #opens the window and plays; importing the module does not
+    Checkers().Run()
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,9 @@
 from graphics import *
 import sys
-import tkMessageBox
+try:
+    import tkMessageBox
+except ImportError:                 #Python 3
+    from tkinter import messagebox as tkMessageBox
 #+-added to be able to select a random number from a range of numbers
 from random import randrange
 
@@ -8,7 +11,7 @@ from random import randrange
 The revisions in the code are labelled by the prefix '#+-'
 '''
 class Checkers:
-    def __init__(s):
+    def __init__(s,headless=None):
         s.state = 'CustomSetup'
         s.is1P = False
         #+-added string
@@ -22,16 +25,33 @@ class Checkers:
         s.selectedTileAt = []
         s.hasMoved = False
         s.pieceCaptured = False
+        s.compScheduled = False     #the computer's turn is waiting in after_idle
 
         s.BoardDimension = 8
         s.numPiecesAllowed = 12
 
-        s.win = GraphWin('Checkers',600,600)    #draws screen
+        #headless (the headless argument, or CHECKERS_HEADLESS=1 in the environment) plays the
+        #same game in a NullGraphWin: nothing is drawn and message boxes are only recorded
+        if headless is None:
+            headless = HEADLESS
+        s.headless = headless
+        if headless:
+            s.win = NullGraphWin('Checkers',600,600)
+            s.messagebox = NullMessagebox()
+        else:
+            s.win = GraphWin('Checkers',600,600)    #draws screen
+            s.messagebox = tkMessageBox
         s.win.setBackground('White')
         s.win.setCoords(-1,-3,11,9)              #creates a coordinate system for the window
-        s.ClearBoard()
-        
-        s.tiles = [[Tile(s.win,i,j,False) for i in range(s.BoardDimension)] for j in range(s.BoardDimension)]  #creates the 2D list and initializes all 8x8 entries to an empty tile
+
+        #one Tile per square for the whole session, indexed tiles[x][y]; moves reconfigure them
+        #instead of drawing new ones, and the panel's rectangles and labels are pooled by place
+        with s.win.batch():
+            s.tiles = [[Tile(s.win,x,y) for y in range(s.BoardDimension)] for x in range(s.BoardDimension)]
+            s.buttons = {}
+            s.labels = {}
+            s.shownItems = []
+            s.ClearBoard()
 
         #+-added two lists
         s.moves = []
@@ -45,28 +65,39 @@ class Checkers:
             Text(Point(i+0.5,8.5),gridLetters[i]).draw(s.win) 
         
         s.SetButtons()
-        
-        s.SetupBoard()
-	####
-    #handles the setup of the board (i.e. piece placement)
-	####
-    def SetupBoard(s):
-        while s.state == 'CustomSetup':
-            s.Click()
-        if s.state == 'Play':
-            s.Play()
 	####
-    #handles the general play of the game
+    #event loop: everything happens in Tk callbacks -- OnClick for the mouse and
+    #after_idle() for the computer's turn -- so nothing recurses or polls between
+    #moves and a session can go on for any number of games
 	####
-    def Play(s):
-        while s.state == 'Play':
-            #+-added if statement
-            if s.is1P and s.compIsColour == s.pTurn:
+    def Run(s):
+        s.win.setMouseHandler(s.OnClick)
+        s.win.master.protocol("WM_DELETE_WINDOW", s.OnClose)
+        s.Continue()
+        s.win.mainloop()        #returns once the window is closed
+
+    def OnClick(s,point):
+        click = Point(*s.win.toWorld(point.getX(),point.getY()))
+        square = s.ClickedSquare(click)    #Gets click coords
+        if square is not None:
+            with s.win.batch():
+                s.Action(square[0],square[1])
+        s.Continue()
+
+    def OnClose(s):
+        ExitGame(s.win)
+
+    def Continue(s):    #schedules the computer's turn when it is to play; the human's turn waits for OnClick
+        if s.state == 'Play' and s.is1P and s.compIsColour == s.pTurn and not s.compScheduled:
+            s.compScheduled = True
+            s.win.after_idle(s.OnCompTurn)
+
+    def OnCompTurn(s):
+        s.compScheduled = False
+        if s.state == 'Play' and s.is1P and s.compIsColour == s.pTurn:
+            with s.win.batch():
                 s.CompTurn()
-            else:
-                s.Click()
-        if s.state == 'CustomSetup':
-            s.SetupBoard()
+            s.Continue()        #a capture can leave it to play again
 	####
     #+-added to be able to control the computer's turn
 	####
@@ -213,18 +244,35 @@ class Checkers:
 
 	#Resets the board to be empty
     def ClearBoard(s):
-        s.tiles=[[Tile(s.win,i,j,False) for i in range(s.BoardDimension)] for j in range(s.BoardDimension)]  #creates the 2D list and initializes all 8x8 entries to an empty tile
-        for i in range(s.BoardDimension):
-            for j in range(s.BoardDimension):
-                s.ColourButton(s.TileColour(i,j),i,j)
+        for column in s.tiles:
+            for tile in column:
+                tile.Set(False)
         s.state = 'CustomSetup'
         s.pTurn = 'White'
         s.SetButtons()
 
-    def ColourButton(s,colour,X,Y,width=1,height=1):        #function to create a rectangle with a given colour, size, and location
-        rect = Rectangle(Point(X,Y),Point(X+width,Y+height))
+    def ColourButton(s,colour,X,Y,width=1,height=1):        #shows the rectangle with a given colour, size, and location; each place gets one Rectangle, drawn the first time
+        key = (X,Y,width,height)
+        rect = s.buttons.get(key)
+        if rect is None:
+            rect = s.buttons[key] = Rectangle(Point(X,Y),Point(X+width,Y+height))
+            rect.draw(s.win)
         rect.setFill(colour)
-        rect.draw(s.win)
+        s.ShowItem(rect)
+
+    def Label(s,X,Y,text,colour='black'):       #shows text centred on X,Y, reusing the Text already there
+        txt = s.labels.get((X,Y))
+        if txt is None:
+            txt = s.labels[(X,Y)] = Text(Point(X,Y),text)
+            txt.draw(s.win)
+        else:
+            txt.setText(text)
+        txt.setFill(colour)
+        s.ShowItem(txt)
+
+    def ShowItem(s,item):
+        item.setVisible(True)
+        s.shownItems.append(item)
             
     def TileColour(s,x,y):
         if (x%2 == 0 and y%2 == 0) or (x%2 == 1 and y%2 == 1):
@@ -236,103 +284,104 @@ class Checkers:
     #Draws Buttons
     ##########    
     def SetButtons(s):
-        s.ColourButton('White',-1,-3,12,2)
-        s.ColourButton('White',9,-1,2,10)
-
-        if s.state == 'CustomSetup':
-            s.DrawStandard()
-            s.DrawStart()
-            s.DrawClear()
-            s.Draw1P()
-            s.Draw2P()
-            s.DrawLoad()
-            s.DrawSave()
-            s.DrawTurn()
-            s.DrawX()
+        with s.win.batch():   #one screen update for the whole redraw
+            s.shownItems = []
+            s.ColourButton('White',-1,-3,12,2)
+            s.ColourButton('White',9,-1,2,10)
+
+            if s.state == 'CustomSetup':
+                s.DrawStandard()
+                s.DrawStart()
+                s.DrawClear()
+                s.Draw1P()
+                s.Draw2P()
+                s.DrawLoad()
+                s.DrawSave()
+                s.DrawTurn()
+                s.DrawX()
             
-            s.DrawW()
-            s.DrawB()
-            s.DrawK()
-            s.DrawDel()
+                s.DrawW()
+                s.DrawB()
+                s.DrawK()
+                s.DrawDel()
 
-            s.DrawScore() #not actually a button
-        elif s.state == 'Play':
-            #+-updated method name
-            s.DrawResign()
-            s.DrawSave()
-            s.DrawTurn()
-            s.DrawX()
+                s.DrawScore() #not actually a button
+            elif s.state == 'Play':
+                #+-updated method name
+                s.DrawResign()
+                s.DrawSave()
+                s.DrawTurn()
+                s.DrawX()
+
+                s.DrawScore() #not actually a button
 
-            s.DrawScore() #not actually a button
+            shown = set(map(id,s.shownItems))     #buttons and labels this state does not use are hidden, not deleted
+            for item in list(s.buttons.values()) + list(s.labels.values()):
+                if id(item) not in shown:
+                    item.setVisible(False)
 
 
     def DrawStandard(s):
         s.ColourButton('White',-1,-2,2,1)    #Standard Setup button
-        Text(Point(0,-1.3),'Standard').draw(s.win)
-        Text(Point(0,-1.7),'Setup').draw(s.win)
+        s.Label(0,-1.3,'Standard')
+        s.Label(0,-1.7,'Setup')
     def DrawCustom(s):
         s.ColourButton('White',-1,-3,2,1)    #Custom Setup button
-        Text(Point(0,-2.3),'Custom').draw(s.win)  
-        Text(Point(0,-2.7),'Setup').draw(s.win)
+        s.Label(0,-2.3,'Custom')
+        s.Label(0,-2.7,'Setup')
     def DrawStart(s):
         s.ColourButton('Yellow',1,-2)    #Start! button
-        Text(Point(1.5,-1.5),'Start!').draw(s.win)
+        s.Label(1.5,-1.5,'Start!')
     def DrawClear(s):
         s.ColourButton('White',-1,-3,2,1)    #Clear Board button
-        Text(Point(0,-2.3),'Clear').draw(s.win)
-        Text(Point(0,-2.7),'Board').draw(s.win)
+        s.Label(0,-2.3,'Clear')
+        s.Label(0,-2.7,'Board')
     def Draw1P(s):
         col = 'Red'
         if s.is1P:
             s.DrawCompColour()
         else:
             s.ColourButton(col,3,-2,2,1)    #1Player   -- (1AI)
-            Text(Point(4,-1.3),'1Player').draw(s.win)
-            Text(Point(4,-1.7),'Game').draw(s.win)
+            s.Label(4,-1.3,'1Player')
+            s.Label(4,-1.7,'Game')
     def DrawCompColour(s):
         s.ColourButton(s.compIsColour,3,-2,2,1)
-        txt1 = Text(Point(4,-1.3),'Comp Is')
-        txt2 = Text(Point(4,-1.7),s.compIsColour)
-        txt1.draw(s.win)
-        txt2.draw(s.win)
-        txt1.setFill(s.opposite(s.compIsColour))
-        txt2.setFill(s.opposite(s.compIsColour))
+        s.Label(4,-1.3,'Comp Is',s.opposite(s.compIsColour))
+        s.Label(4,-1.7,s.compIsColour,s.opposite(s.compIsColour))
     def Draw2P(s):#2Player
         col = 'Green'
         if s.is1P:
             col = 'Red'
         s.ColourButton(col,3,-3,2,1)    
-        Text(Point(4,-2.3),'2Player').draw(s.win)  
-        Text(Point(4,-2.7),'Game').draw(s.win)
+        s.Label(4,-2.3,'2Player')
+        s.Label(4,-2.7,'Game')
     def DrawLoad(s):#Load
         s.ColourButton('White',6,-3,2,1)    
-        Text(Point(7,-2.5),'Load').draw(s.win)
+        s.Label(7,-2.5,'Load')
     def DrawSave(s):    #Save
         s.ColourButton('White',8,-3,2,1)
-        Text(Point(9,-2.5),'Save').draw(s.win)
+        s.Label(9,-2.5,'Save')
     def DrawX(s):#X
         s.ColourButton('Red',10,-3)    
-        Exit_txt = Text(Point(10.5,-2.5),'X')
-        Exit_txt.draw(s.win)
-        Exit_txt.setFill('White')
+        s.Label(10.5,-2.5,'X','White')
     def DrawW(s):#W
         col = 'Green'
         if s.placeColour != 'White':
             col = 'Red'
         s.ColourButton(col,6,-2)    
-        Text(Point(6.5,-1.5),'W').draw(s.win)
+        s.Label(6.5,-1.5,'W')
     def DrawB(s):#B
         col = 'Red'
         if s.placeColour != 'White':
             col = 'Green'
         s.ColourButton(col,7,-2)    
-        Text(Point(7.5,-1.5),'B').draw(s.win)
+        s.Label(7.5,-1.5,'B')
     def DrawK(s): #K
         col = 'Red'
         if s.placeRank == 'King':
             col = 'Green'
         s.ColourButton(col,8,-2) 
-        Text(Point(8.5,-1.5),'K').draw(s.win)
+        s.Label(8.5,-1.5,'K')
     def DrawDel(s):#Del
         col1 = 'Black'#square colour
         col2 = 'White'#text colour
@@ -340,12 +389,10 @@ class Checkers:
             col1 = 'Green'
             col2 = 'Black'        
         s.ColourButton(col1,9,-2)    
-        deleteTxt = Text(Point(9.5,-1.5),'Del')
-        deleteTxt.draw(s.win)
-        deleteTxt.setFill(col2)
+        s.Label(9.5,-1.5,'Del',col2)
     def DrawResign(s):
         s.ColourButton('White',6,-3,2,1)    #Load
-        Text(Point(7,-2.5),'Resign').draw(s.win)
+        s.Label(7,-2.5,'Resign')
     def DrawTurn(s):
         col1 = 'White'
         col2 = 'Black'
@@ -353,25 +400,16 @@ class Checkers:
             col1 = 'Black'
             col2 = 'White'
         s.ColourButton(col1,9,8,2,1)    #Standard Setup button
-        txt1 = Text(Point(10,8.7),col1)
-        txt2 = Text(Point(10,8.3),'Turn')
-        txt1.draw(s.win)
-        txt2.draw(s.win)
-        txt1.setFill(col2)
-        txt2.setFill(col2)
+        s.Label(10,8.7,col1,col2)
+        s.Label(10,8.3,'Turn',col2)
     def DrawScore(s): # draw score
-        Text(Point(10,7.5),'# White').draw(s.win)
-        Text(Point(10,7.1),'Pieces:').draw(s.win)
-        Text(Point(10,6.7),s.numColour('White')).draw(s.win)
-        Text(Point(10,5.9),'# Black').draw(s.win)
-        Text(Point(10,5.5),'Pieces').draw(s.win)
-        Text(Point(10,5.1),s.numColour('Black')).draw(s.win)
+        s.Label(10,7.5,'# White')
+        s.Label(10,7.1,'Pieces:')
+        s.Label(10,6.7,s.numColour('White'))
+        s.Label(10,5.9,'# Black')
+        s.Label(10,5.5,'Pieces')
+        s.Label(10,5.1,s.numColour('Black'))
                  
-    def Click(s):
-        click = s.win.getMouse()        #Perform mouse click
-        X, Y = s.ClickedSquare(click)   #Gets click coords
-        s.Action(X,Y)
-        
     def Action(s,X,Y):      #performs action for the location X,Y --essentially means user clicked there or computer is 'clicked' there
         if s.state == 'CustomSetup':
             s.clickInCustom(X,Y)
@@ -388,7 +426,7 @@ class Checkers:
             num_wh = s.numColour('White')
             num_bl = s.numColour('Black')
             if ((num_wh == 0) and (num_bl == 0)): #This means there are no pieces on the board; this is a pointless setup.
-                tkMessageBox.showinfo("Error", "No pieces have been placed!")
+                s.messagebox.showinfo("Error", "No pieces have been placed!")
             else:
                 s.state = 'Play'
                 s.SetButtons()
@@ -429,13 +467,13 @@ class Checkers:
             s.SetButtons()
         elif (0<=X<8 and 0<=Y<8): #Tile clicked in CustomSetup
             if s.tiles[X][Y].TileColour(X,Y) == 'White': #Clicked tile is White
-                tkMessageBox.showinfo("Error", "Illegal Placement")
+                s.messagebox.showinfo("Error", "Illegal Placement")
             elif s.numColour(s.placeColour) >= s.numPiecesAllowed and s.placeType == 'Place': #clicked tile would result in too many of colour being placed
-                tkMessageBox.showinfo("Error", "Illegal Placement")
+                s.messagebox.showinfo("Error", "Illegal Placement")
             elif (Y == 7 and s.placeColour == 'White' and not(s.placeRank == 'King')) or (Y == 0 and s.placeColour == 'Black' and not(s.placeRank == 'King')): #placing a non-king on a king square
-                tkMessageBox.showinfo("Error", "Illegal Placement")
+                s.messagebox.showinfo("Error", "Illegal Placement")
             else: #Valid tile update action (i.e. piece placement or deletion)
-                s.tiles[X][Y] = Tile(s.win,X,Y,s.placeType == 'Place',s.placeColour,s.placeRank)    #updates that square in array
+                s.tiles[X][Y].Set(s.placeType == 'Place',s.placeColour,s.placeRank)    #updates that square in array
                 s.SetButtons()
 
 	#Handles mouse clicks
@@ -447,18 +485,18 @@ class Checkers:
             s.SaveSetupToFile()
         elif (6<=X<8 and -3<=Y<-2): #Resign clicked
         #+-added message box indicating which player had quit/resigned
-            tkMessageBox.showinfo("Resignation", str(s.pTurn) + ' has resigned! ' + str(s.opposite(s.pTurn)) + ' wins!')
+            s.messagebox.showinfo("Resignation", str(s.pTurn) + ' has resigned! ' + str(s.opposite(s.pTurn)) + ' wins!')
             s.state = 'CustomSetup'
             s.SetButtons()
         elif (0<=X<8 and 0<=Y<8): #Tile Clicked in Play
             if s.selectedTileAt != []: #move if able
                 if s.selectedTileAt[0] == X and s.selectedTileAt[1] == Y and not s.pieceCaptured: #Re-Selecting the already selected piece de-selects it
                     s.selectedTileAt = []
-                    s.tiles[X][Y] = Tile(s.win,X,Y,s.tiles[X][Y].isPiece,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank)
+                    s.tiles[X][Y].Select(False)
                 elif s.pTurn == s.tiles[X][Y].pieceColour and not s.pieceCaptured and (s.PieceCanCapture(X,Y) or not s.PlayerCanCapture()): 
-                    s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]] = Tile(s.win,s.selectedTileAt[0],s.selectedTileAt[1],s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]].isPiece,s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]].pieceColour,s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]].pieceRank)
+                    s.tiles[s.selectedTileAt[0]][s.selectedTileAt[1]].Select(False)
                     s.selectedTileAt = [X,Y]
-                    s.tiles[X][Y] = Tile(s.win,X,Y,s.tiles[X][Y].isPiece,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank,isSelected=True)
+                    s.tiles[X][Y].Select(True)
                 elif s.moveIsValid(s.selectedTileAt[0],s.selectedTileAt[1],X,Y):
 #####################+-added extra code here
                     if s.tiles[X][Y].isPiece:
@@ -473,20 +511,20 @@ class Checkers:
                         s.SetButtons()
                         #+-added if statement to check defeat
                         if s.movesAvailable() == [] and s.numColour(s.pTurn):
-                            tkMessageBox.showinfo("Defeat", str(s.pTurn) + ' has no available moves! ' + str(s.opposite(s.pTurn)) + ' wins!')
+                            s.messagebox.showinfo("Defeat", str(s.pTurn) + ' has no available moves! ' + str(s.opposite(s.pTurn)) + ' wins!')
                             s.state = 'CustomSetup'
                             s.SetButtons()
 
                 else:
-                    tkMessageBox.showinfo("Error", "Cannot perform that action.")
+                    s.messagebox.showinfo("Error", "Cannot perform that action.")
             else: #Select a Piece to move
                 if s.pTurn != s.tiles[X][Y].pieceColour:
-                    tkMessageBox.showinfo("Error", "Select a piece of current player's colour")
+                    s.messagebox.showinfo("Error", "Select a piece of current player's colour")
                 elif (not s.PieceCanCapture(X,Y)) and s.PlayerCanCapture():
-                    tkMessageBox.showinfo("Error", "Invalid selection, current player must take a piece")
+                    s.messagebox.showinfo("Error", "Invalid selection, current player must take a piece")
                 else:
                     s.selectedTileAt = [X,Y]
-                    s.tiles[X][Y] = Tile(s.win,X,Y,s.tiles[X][Y].isPiece,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank,isSelected=True)
+                    s.tiles[X][Y].Select(True)
 
     #+-added to determine whether the tile attempting to be selected is valid
     def validTileSelect(s,X,Y):
@@ -543,33 +581,29 @@ class Checkers:
 # This Function Enables a Piece to move. Trace Back --> Requirement 1.3
 ########
     def move(s,x,y,X,Y): #parameters -> self,starting x,starting y,final X,final Y      assumes valid move as input           
-        s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[x][y].pieceColour,s.tiles[x][y].pieceRank)
-
-        if (Y==7 and s.tiles[X][Y].isWhite) or \
-           (Y==0 and s.tiles[X][Y].isBlack):
-            s.tiles[X][Y].pieceRank = 'King'
-
-        s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank)
-        s.tiles[x][y] = Tile(s.win,x,y,isPiece=False)
-        if X-x == 2 or X-x == -2:
-            if s.numColour(s.tiles[x+(X-x)/2][y+(Y-y)/2].pieceColour) == 1:
-                tkMessageBox.showinfo("Winner", str(s.tiles[X][Y].pieceColour) + ' Wins!')
-                #+-updated to allow another game to be played after a winner is declared
-                s.state = 'CustomSetup'
-                s.SetButtons()
-            s.tiles[x+(X-x)/2][y+(Y-y)/2] = Tile(s.win,x+(X-x)/2,y+(Y-y)/2,isPiece=False)
-
-            s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank)
-            if s.PieceCanCapture(X,Y):
-                s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank,isSelected=True)
-
-            s.selectedTileAt = [X,Y]
-            s.pieceCaptured = True
-        else:
-            s.selectedTileAt = []
-            
-            s.tiles[X][Y] = Tile(s.win,X,Y,True,s.tiles[X][Y].pieceColour,s.tiles[X][Y].pieceRank)
-            s.pieceCaptured = False
+        with s.win.batch():   #one screen update for the whole redraw
+            colour,rank = s.tiles[x][y].pieceColour,s.tiles[x][y].pieceRank
+            if (Y==7 and colour == 'White') or \
+               (Y==0 and colour == 'Black'):
+                rank = 'King'
+
+            s.tiles[X][Y].Set(True,colour,rank)
+            s.tiles[x][y].Set(False)
+            if X-x == 2 or X-x == -2:
+                if s.numColour(s.tiles[x+(X-x)//2][y+(Y-y)//2].pieceColour) == 1:
+                    s.messagebox.showinfo("Winner", str(s.tiles[X][Y].pieceColour) + ' Wins!')
+                    #+-updated to allow another game to be played after a winner is declared
+                    s.state = 'CustomSetup'
+                    s.SetButtons()
+                s.tiles[x+(X-x)//2][y+(Y-y)//2].Set(False)
+
+                s.tiles[X][Y].Select(s.PieceCanCapture(X,Y))
+
+                s.selectedTileAt = [X,Y]
+                s.pieceCaptured = True
+            else:
+                s.selectedTileAt = []
+                s.pieceCaptured = False
                  
 #the below few functions need conditions added to handle out of bounds errors (for being off grid, i.e. 0<=X<8 or 0<=Y<8 doesn't hold)      <--- I think this is handled in PieceCanCapturePiece      
     def PlayerCanCapture(s):
@@ -646,9 +680,9 @@ class Checkers:
         for i in range(s.BoardDimension):
             for j in range(s.BoardDimension):
                 if s.tiles[i][j].TileColour(i,j) == 'Red' and (j < 3):
-                    s.tiles[i][j] = Tile(s.win,i,j,True,'White','Pawn')
+                    s.tiles[i][j].Set(True,'White','Pawn')
                 if s.tiles[i][j].TileColour(i,j) == 'Red' and (j > 4):
-                    s.tiles[i][j] = Tile(s.win,i,j,True,'Black','Pawn')
+                    s.tiles[i][j].Set(True,'Black','Pawn')
                     #places all the pieces in default checkers postitions
 
     def numColour(s,colour): #counts the number of pieces of a given colour
@@ -697,7 +731,7 @@ class Checkers:
                 clickY = int(clickY)
             return clickX, clickY
         except IndexError:          #some positions on the outskirts of the screen are invalid locations
-            s.Click()
+            return None
 
 #######
 # This Function Saves the game to be resumed later. Trace back --> Requirement 1.6
@@ -713,7 +747,7 @@ class Checkers:
                     saveFile.write(i_string + j_string + str(s.tiles[i][j].pieceColour)[0] + \
                                    str(s.tiles[i][j].pieceRank)[0] + "\n")
         saveFile.write(s.pTurn[0]) #saves whose turn it is too
-        tkMessageBox.showinfo("Saved Complete", "Game setup was saved to checkers.txt")
+        s.messagebox.showinfo("Saved Complete", "Game setup was saved to checkers.txt")
         saveFile.close()
 
 ##########################
@@ -722,7 +756,7 @@ class Checkers:
     def LoadSetupFromFile(s): #method gets the setup saved and places pieces accordingly
         loadFile = open ('checkers.txt' , 'r') #opens file to read
         piece_list = loadFile.readlines()
-        tkMessageBox.showinfo("Loading", "Will now clear the board and \nplace the saved setup")
+        s.messagebox.showinfo("Loading", "Will now clear the board and \nplace the saved setup")
         s.ClearBoard()
         for i in range(len(piece_list) - 1):
             tot_string = piece_list[i]
@@ -733,17 +767,17 @@ class Checkers:
             #second letter - 'K' is a King piece, 'P' is a pawn piece
             if (tot_string[2] == 'W'): #it is a white piece
                 if (tot_string[3] == 'K'): #it is a white King piece
-                    s.tiles[x_var][y_var] = Tile(s.win,x_var,y_var,True,'White','King')
+                    s.tiles[x_var][y_var].Set(True,'White','King')
                 else : #piece is a white pawn
                     assert(tot_string[3] == 'P')
-                    s.tiles[x_var][y_var] = Tile(s.win,x_var,y_var,True,'White','Pawn')
+                    s.tiles[x_var][y_var].Set(True,'White','Pawn')
             else: #piece is black
                 assert(tot_string[2] == 'B')
                 if (tot_string[3] == 'K'): #piece is a black King
-                    s.tiles[x_var][y_var] = Tile(s.win,x_var,y_var,True,'Black','King')
+                    s.tiles[x_var][y_var].Set(True,'Black','King')
                 else: #piece is a black pawn
                     assert(tot_string[3] == 'P')
-                    s.tiles[x_var][y_var] = Tile(s.win,x_var,y_var,True,'Black','Pawn')
+                    s.tiles[x_var][y_var].Set(True,'Black','Pawn')
         #whose turn it was is restored
         if (piece_list[len(piece_list)-1] == 'W'): #it is white's turn
             s.pTurn = 'White'
@@ -758,14 +792,32 @@ class Checkers:
     This was done to ensure a seamless transition for when the game actually ran.
 '''
 ##########
-#defines a tile and holds its current state
+#defines a tile and holds its current state; its rectangle, circle and king label are drawn once
+#and Set() changes what the square holds by reconfiguring them and showing or hiding the piece
 ##########
 
 class Tile:
-    def __init__(s,win,X,Y,isPiece,pieceColour='',pieceRank='',isSelected=False):
+    def __init__(s,win,X,Y):
         s.win = win
         s.x = X
         s.y = Y
+
+        s.rect = Rectangle(Point(X,Y),Point(X+1,Y+1))
+        s.rect.setFill(s.TileColour(X,Y))
+        s.rect.draw(s.win)
+
+        s.c = Point(s.x+.5,s.y+.5)
+        s.circ = Circle(s.c,0.4)
+        s.circ.setVisible(False)
+        s.circ.draw(s.win)
+
+        s.kingTxt = Text(s.c,'K')
+        s.kingTxt.setVisible(False)
+        s.kingTxt.draw(s.win)
+
+        s.Set(False)
+
+    def Set(s,isPiece,pieceColour='',pieceRank='',isSelected=False):
         s.isPiece = isPiece
         s.isWhite = ('White' == pieceColour) and s.isPiece
         s.isBlack = ('Black' == pieceColour) and s.isPiece
@@ -783,28 +835,20 @@ class Tile:
         elif s.isPawn:
             s.pieceRank = 'Pawn'
 
-        s.c = Point(s.x+.5,s.y+.5)
-        s.circ = Circle(s.c,0.4)
-
-        if isSelected:
-            s.circ.setOutline('Yellow')
-        else:
-            s.circ.setOutline('Black')
-            s.circ.undraw()
-
-        s.kingTxt = Text(s.c,'K')
-        s.kingTxt.undraw()
-
-        s.ColourButton(s.TileColour(s.x,s.y),s.x,s.y)
+        s.Select(isSelected)
         if s.isPiece:
             s.DrawPiece()
+        else:
+            s.circ.setVisible(False)
+            s.kingTxt.setVisible(False)
 ##########
-#function to create a rectangle with a given colour, size, and location
+#outlines the piece in yellow while it is selected
 ##########
-    def ColourButton(s,colour,X,Y,width=1,height=1):
-        rect = Rectangle(Point(X,Y),Point(X+width,Y+height))
-        rect.setFill(colour)
-        rect.draw(s.win)
+    def Select(s,isSelected):
+        if isSelected:
+            s.circ.setOutline('Yellow')
+        else:
+            s.circ.setOutline('Black')
         
 ##########
 #Tiles on the board
@@ -819,18 +863,19 @@ class Tile:
 #Displays White or Black or King Pieces
 ##########
     def DrawPiece(s):
-        s.circ.draw(s.win)
-
         if s.isWhite:
             col1,col2 = 'White','Black'
         elif s.isBlack:
             col1,col2 = 'Black','White'
 
         s.circ.setFill(col1)
+        s.circ.setVisible(True)
 
         if s.isKing:
-            s.kingTxt.draw(s.win)
             s.kingTxt.setFill(col2)
+            s.kingTxt.setVisible(True)
+        else:
+            s.kingTxt.setVisible(False)
 
 ##########
 #Quit
@@ -838,5 +883,9 @@ class Tile:
 def ExitGame(win):
     win.close()
     sys.exit()
-    
-game = Checkers()
+
+def main():     #opens the window and plays; importing the module does not
+    Checkers().Run()
+
+if __name__ == '__main__':
+    main()
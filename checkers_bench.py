@@ -0,0 +1,214 @@
+"""
+Fixed-position search benchmark for the minimax player.
+
+Every position file in bench/ (the checkers.txt save format that
+LoadSetupFromFile reads) is searched headless, the way CompTurn searches:
+once to a fixed depth and once for a fixed time, each with a fresh engine
+so no run inherits another's transposition table. A search that finishes
+quickly is repeated until the run has taken --min-seconds, so that its
+nodes per second is not timer noise, and each run is done --repeat times
+with the median kept. One JSON line per run goes to the results file:
+    position, mode ('depth' or 'time'), depth, time_ms, nodes (of one
+    search), searches, seconds, nps, move, score
+
+Give a baseline results file and the run fails (exit status 1) when a
+position's nodes per second in some mode fell by more than --threshold
+percent against it. Runs whose search visits fewer than --min-nodes nodes
+are reported but never fail the gate: too little work is measured in
+them for their throughput to mean much.
+    python checkers_bench.py --save-baseline bench_baseline.jsonl
+    python checkers_bench.py --baseline bench_baseline.jsonl --threshold 10
+
+Throughput depends on the machine, so a baseline is only worth comparing
+against on the machine that wrote it -- and on a shared or virtual machine
+whose speed drifts from minute to minute, only with a threshold above that
+drift.
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+
+from checkers_engine import Engine, Position
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench')
+
+
+##########################################
+# Running                                #
+##########################################
+def load_suite(directory=BENCH_DIR):
+    """(name, Position) for every .txt position file in directory, by name."""
+    suite = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.txt'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        suite.append((name, Position.from_setup_file(path)))
+    return suite
+
+
+def make_engine(position, workers=1, split='ybw', **engine_options):
+    """Engine for one run; workers > 1 picks a checkers_parallel engine."""
+    if workers > 1:
+        from checkers_parallel import LazySMPEngine, ParallelEngine
+        if split == 'lazy-smp':
+            return LazySMPEngine(position, workers=workers, **engine_options)
+        return ParallelEngine(position, workers=workers, split=split, **engine_options)
+    return Engine(position, **engine_options)
+
+
+def search_once(position, mode, depth, time_ms, workers, split, engine_options):
+    """One search with a fresh engine: (move, score, depth reached, nodes, seconds)."""
+    engine = make_engine(position.copy(), workers, split, **engine_options)
+    try:
+        if workers > 1:
+            engine.pool().submit(int).result()      # start the workers outside the timing
+        start = time.perf_counter()
+        if mode == 'depth':
+            move, score = engine.search(depth)
+            reached = depth
+        else:
+            move, score, reached = engine.iterative_deepening(time_ms)
+        seconds = time.perf_counter() - start
+    finally:
+        if workers > 1:
+            engine.close()
+    return move, score, reached, engine.nodes, seconds
+
+
+def run_position(name, position, mode, depth=9, time_ms=1000, workers=1, split='ybw',
+                 min_seconds=0.5, **engine_options):
+    """
+    Search one position in one mode, again and again until min_seconds
+    of searching have been timed, and return its result record.
+    """
+    searches = 0
+    total_nodes = 0
+    seconds = 0.0
+    while searches == 0 or seconds < min_seconds:
+        move, score, reached, nodes, elapsed = search_once(position, mode, depth, time_ms,
+                                                           workers, split, engine_options)
+        searches += 1
+        total_nodes += nodes
+        seconds += elapsed
+    return {
+        'position': name,
+        'mode': mode,
+        'depth': reached,
+        'time_ms': time_ms if mode == 'time' else None,
+        'workers': workers,
+        'nodes': nodes,
+        'searches': searches,
+        'seconds': seconds,
+        'nps': total_nodes / seconds if seconds else 0.0,
+        'move': Position.to_hops(move) if move else None,
+        'score': score,
+    }
+
+
+def run_suite(suite, depth=9, time_ms=1000, modes=('depth', 'time'), repeat=3, **options):
+    """
+    Every position in every mode; of the repeat runs of each, the median
+    by nps is kept. The repeats are whole passes over the suite, so that a
+    spell of machine load slows one run of a position rather than all of
+    them.
+    """
+    runs = {}
+    for _ in range(repeat):
+        for name, position in suite:
+            for mode in modes:
+                run = run_position(name, position, mode, depth, time_ms, **options)
+                runs.setdefault((name, mode), []).append(run)
+    results = []
+    for name, position in suite:
+        for mode in modes:
+            by_nps = sorted(runs[(name, mode)], key=lambda r: r['nps'])
+            results.append(by_nps[len(by_nps) // 2])
+    return results
+
+
+##########################################
+# Results and Baselines                  #
+##########################################
+def write_results(results, path):
+    with open(path, 'w') as f:
+        for record in results:
+            f.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+def read_results(path):
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(results, baseline, threshold=10.0, min_nodes=1000):
+    """
+    Match results to baseline records by (position, mode) and return a
+    list of (position, mode, baseline nps, nps, change in percent,
+    regressed, too_small) for every pair found. A run has regressed when
+    its nps is more than threshold percent below the baseline's; a run
+    whose search (in either file) visited fewer than min_nodes nodes is
+    too_small and never regresses.
+    """
+    before = dict(((r['position'], r['mode']), r) for r in baseline)
+    rows = []
+    for record in results:
+        old = before.get((record['position'], record['mode']))
+        if old is None or not old['nps']:
+            continue
+        change = 100.0 * (record['nps'] - old['nps']) / old['nps']
+        too_small = min(record['nodes'], old['nodes']) < min_nodes
+        rows.append((record['position'], record['mode'], old['nps'], record['nps'],
+                     change, change < -threshold and not too_small, too_small))
+    return rows
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Fixed-position search benchmark")
+    parser.add_argument('--positions', default=BENCH_DIR, help="directory of position files")
+    parser.add_argument('--depth', type=int, default=9, help="depth of the fixed-depth runs")
+    parser.add_argument('--time-ms', type=int, default=1000, help="budget of the fixed-time runs")
+    parser.add_argument('--modes', default='depth,time', help="'depth', 'time' or both")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per search, median nps kept")
+    parser.add_argument('--min-seconds', type=float, default=0.5,
+                        help="repeat a search until a run has taken this long")
+    parser.add_argument('--min-nodes', type=int, default=1000,
+                        help="smallest search, in nodes, that the baseline gate judges")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--split', default='ybw', help="'root', 'ybw' or 'lazy-smp'")
+    parser.add_argument('--out', default='bench_results.jsonl', help="results file")
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="largest nps drop, in percent, that still passes")
+    parser.add_argument('--save-baseline', help="also write the results here as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suite(load_suite(args.positions), args.depth, args.time_ms,
+                        tuple(args.modes.split(',')), args.repeat,
+                        workers=args.workers, split=args.split, min_seconds=args.min_seconds)
+    for r in results:
+        print("{:<12} {:<5} depth {:>2} {:>9} nodes x{:<3} {:>8.3f}s {:>9.0f} nps  {} {}".format(
+            r['position'], r['mode'], r['depth'], r['nodes'], r['searches'], r['seconds'],
+            r['nps'], r['move'], r['score']))
+    write_results(results, args.out)
+    if args.save_baseline:
+        write_results(results, args.save_baseline)
+
+    if args.baseline:
+        regressed = 0
+        for position, mode, old_nps, nps, change, bad, too_small in compare(
+                results, read_results(args.baseline), args.threshold, args.min_nodes):
+            note = '  REGRESSED' if bad else '  (too few nodes to judge)' if too_small else ''
+            print("{:<12} {:<5} {:>9.0f} -> {:>9.0f} nps  {:+6.1f}%{}".format(
+                position, mode, old_nps, nps, change, note))
+            regressed += bad
+        if regressed:
+            print("{} run(s) regressed by more than {}%".format(regressed, args.threshold))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
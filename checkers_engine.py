@@ -0,0 +1,1254 @@
+"""
+Headless position and search for the minimax checkers player.
+
+Nothing in this module touches the Tk canvas: the search in
+Checkers_v24_Heuristic_MiniMax_AlphaBeta_Pruning.py runs entirely on a
+Position and only the committed move is copied back onto the Tile grid.
+
+The board is a 32-square bitboard. Dark square (x, y) -- the squares where
+(x + y) is even -- is square 4*y + x//2, and white, black and kings are each
+a Python int with one bit per square. White pawns move up the board (+y),
+Black pawns move down, kings both ways.
+
+Internally a move is a tuple (path, captured): path is the tuple of squares
+the piece visits and captured is the mask of pieces it jumps. to_hops()
+turns it into the GUI format, a list of [x1, y1, x2, y2] hops.
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+BOARD_DIMENSION = 8
+FULL = 0xFFFFFFFF
+
+# directions, named from White's side of the board
+UL, UR, DL, DR = 0, 1, 2, 3
+DELTAS = ((-1, 1), (1, 1), (-1, -1), (1, -1))
+REVERSE = (DR, DL, UR, UL)
+PAWN_DIRECTIONS = {'White': (UL, UR), 'Black': (DL, DR)}
+KING_DIRECTIONS = (UL, UR, DL, DR)
+
+
+def opposite(colour):
+    if colour == 'White':
+        return 'Black'
+    elif colour == 'Black':
+        return 'White'
+    return colour
+
+
+##########################################
+# Square Tables                          #
+##########################################
+def square_of(x, y):
+    """Square index of (x, y), or None for a light square / off the board."""
+    if 0 <= x < BOARD_DIMENSION and 0 <= y < BOARD_DIMENSION and (x + y) % 2 == 0:
+        return 4 * y + x // 2
+    return None
+
+
+COORDS = [(2 * (sq % 4) + (sq // 4) % 2, sq // 4) for sq in range(32)]
+BIT = [1 << sq for sq in range(32)]
+
+# NEIGHBOUR[d][sq]: the square one step from sq in direction d (or None)
+# JUMP[d][sq]: (jumped square, landing square) for a jump from sq (or None)
+NEIGHBOUR = [[None] * 32 for _ in range(4)]
+JUMP = [[None] * 32 for _ in range(4)]
+for _d, (_dx, _dy) in enumerate(DELTAS):
+    for _sq, (_x, _y) in enumerate(COORDS):
+        NEIGHBOUR[_d][_sq] = square_of(_x + _dx, _y + _dy)
+        _land = square_of(_x + 2 * _dx, _y + 2 * _dy)
+        if _land is not None:
+            JUMP[_d][_sq] = (NEIGHBOUR[_d][_sq], _land)
+
+
+def _row_mask(y):
+    return sum(BIT[square_of(x, y)] for x in range(y % 2, BOARD_DIMENSION, 2))
+
+
+ROW = [_row_mask(y) for y in range(BOARD_DIMENSION)]
+PROMOTION_ROW = {'White': ROW[7], 'Black': ROW[0]}
+BACK_ROW = {'White': ROW[0], 'Black': ROW[7]}
+
+# Step shifts. On even rows square 4y+c sits at x=2c, on odd rows at x=2c+1,
+# so a one-square diagonal step is a shift of 3, 4 or 5 depending on the row
+# parity; a jump is always a shift of 7 or 9. STEP[d] holds
+# (even-row shift, even-row source mask, odd-row shift, odd-row source mask),
+# each mask restricted to the squares the step stays on the board from.
+def _step_entry(d):
+    entry = []
+    for parity in (0, 1):
+        sources = 0
+        shift = None
+        for sq, (x, y) in enumerate(COORDS):
+            if y % 2 == parity and NEIGHBOUR[d][sq] is not None:
+                sources |= BIT[sq]
+                shift = NEIGHBOUR[d][sq] - sq
+        entry.extend((shift, sources))
+    return tuple(entry)
+
+
+STEP = [_step_entry(d) for d in range(4)]
+JUMP_SHIFT = [next(JUMP[d][sq][1] - sq for sq in range(32) if JUMP[d][sq] is not None)
+              for d in range(4)]
+
+
+def _shift(bb, n):
+    return bb << n if n > 0 else bb >> -n
+
+
+def step(bb, d):
+    """Shift every square of bb one step in direction d, dropping off-board steps."""
+    even_shift, even_src, odd_shift, odd_src = STEP[d]
+    if d < DL:
+        return (bb & even_src) << even_shift | (bb & odd_src) << odd_shift
+    return (bb & even_src) >> -even_shift | (bb & odd_src) >> -odd_shift
+
+
+def iter_bits(bb):
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def popcount(bb):
+    return bin(bb).count('1')
+
+
+##########################################
+# Heuristic Weights                      #
+##########################################
+# Used by Position.weight_move; the capture weights also order captures in
+# the search.
+BACK_ROW_BONUS      = 30
+MOBILITY            = 10
+PROMOTION           = 150
+CAPTURE_KING        = 200
+CAPTURE_PAWN        = 50
+SAFETY              = 25
+
+
+def capture_value(captured, captured_kings):
+    kings_taken = popcount(captured_kings)
+    return CAPTURE_KING * kings_taken + CAPTURE_PAWN * (popcount(captured) - kings_taken)
+
+
+##########################################
+# Zobrist Keys                           #
+##########################################
+# One 64-bit key per (piece kind, square) plus one for Black to move. The
+# seed is fixed so every process derives the same keys for a position.
+WHITE_PAWN, WHITE_KING, BLACK_PAWN, BLACK_KING = 0, 1, 2, 3
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST = [[_zobrist_rng.getrandbits(64) for _ in range(32)] for _ in range(4)]
+ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+
+def piece_kind(colour, is_king):
+    return (WHITE_PAWN if colour == 'White' else BLACK_PAWN) + (1 if is_king else 0)
+
+
+##########################################
+# Position                               #
+##########################################
+class Position:
+    """
+    Bitboard position: white, black and kings masks plus the side to move.
+    """
+
+    def __init__(self, pTurn='White', white=0, black=0, kings=0):
+        self.white = white
+        self.black = black
+        self.kings = kings
+        self.pTurn = pTurn
+        self.undo_stack = []
+        self.key = self.compute_key()
+
+    def compute_key(self):
+        """Zobrist key from scratch; make/unmake keep self.key up to date."""
+        key = ZOBRIST_BLACK_TO_MOVE if self.pTurn == 'Black' else 0
+        for colour, mask in (('White', self.white), ('Black', self.black)):
+            for sq in iter_bits(mask):
+                key ^= ZOBRIST[piece_kind(colour, self.kings & BIT[sq])][sq]
+        return key
+
+    @classmethod
+    def from_tiles(cls, tiles, pTurn):
+        pos = cls(pTurn)
+        for x in range(BOARD_DIMENSION):
+            for y in range(BOARD_DIMENSION):
+                tile = tiles[x][y]
+                if tile.isPiece:
+                    pos.place(x, y, tile.pieceColour, tile.pieceRank)
+        return pos
+
+    @classmethod
+    def standard(cls, pTurn='White'):
+        """The StandardSetup starting position."""
+        pos = cls(pTurn)
+        for x in range(BOARD_DIMENSION):
+            for y in range(BOARD_DIMENSION):
+                if (x + y) % 2 == 0 and y < 3:
+                    pos.place(x, y, 'White', 'Pawn')
+                if (x + y) % 2 == 0 and y > 4:
+                    pos.place(x, y, 'Black', 'Pawn')
+        return pos
+
+    @classmethod
+    def from_setup_file(cls, path):
+        """
+        Read a position saved in the checkers.txt format: one 'xyCR' line per
+        piece (e.g. 42BK) and the side to move, W or B, on the last line.
+        """
+        with open(path, 'r') as f:
+            lines = [line.strip() for line in f if line.strip()]
+        pos = cls('White' if lines[-1] == 'W' else 'Black')
+        for line in lines[:-1]:
+            colour = 'White' if line[2] == 'W' else 'Black'
+            rank = 'King' if line[3] == 'K' else 'Pawn'
+            pos.place(int(line[0]), int(line[1]), colour, rank)
+        return pos
+
+    def copy(self):
+        return Position(self.pTurn, self.white, self.black, self.kings)
+
+    def set_turn(self, pTurn):
+        if pTurn != self.pTurn:
+            self.key ^= ZOBRIST_BLACK_TO_MOVE
+            self.pTurn = pTurn
+
+    def pieces(self, colour):
+        return self.white if colour == 'White' else self.black
+
+    def piece(self, x, y):
+        """(colour, rank) of the piece on (x, y), or None."""
+        sq = square_of(x, y)
+        if sq is None:
+            return None
+        bit = BIT[sq]
+        if self.white & bit:
+            colour = 'White'
+        elif self.black & bit:
+            colour = 'Black'
+        else:
+            return None
+        return colour, 'King' if self.kings & bit else 'Pawn'
+
+    def place(self, x, y, colour, rank):
+        self.remove(x, y)
+        sq = square_of(x, y)
+        bit = BIT[sq]
+        if colour == 'White':
+            self.white |= bit
+        else:
+            self.black |= bit
+        if rank == 'King':
+            self.kings |= bit
+        self.key ^= ZOBRIST[piece_kind(colour, rank == 'King')][sq]
+
+    def remove(self, x, y):
+        piece = self.piece(x, y)
+        if piece is not None:
+            sq = square_of(x, y)
+            keep = ~BIT[sq]
+            self.white &= keep
+            self.black &= keep
+            self.kings &= keep
+            self.key ^= ZOBRIST[piece_kind(piece[0], piece[1] == 'King')][sq]
+
+    def count(self, colour=None):
+        if colour is None:
+            return popcount(self.white | self.black)
+        return popcount(self.pieces(colour))
+
+    ##########################################
+    # Move Generation                        #
+    ##########################################
+    def jumpers(self, colour=None):
+        """Mask of pieces of colour (default: side to move) that can jump."""
+        colour = colour or self.pTurn
+        own = self.pieces(colour)
+        enemy = self.pieces(opposite(colour))
+        empty = ~(self.white | self.black) & FULL
+        kings = own & self.kings
+        found = 0
+        for d in KING_DIRECTIONS:
+            movers = own if d in PAWN_DIRECTIONS[colour] else kings
+            if movers:
+                lands = step(step(movers, d) & enemy, d) & empty
+                if lands:
+                    found |= _shift(lands, -JUMP_SHIFT[d])
+        return found
+
+    def can_capture(self, colour=None):
+        return self.jumpers(colour) != 0
+
+    def piece_can_capture(self, x, y):
+        """True if the piece on (x, y) has a jump available."""
+        piece = self.piece(x, y)
+        if piece is None:
+            return False
+        return bool(self.jumpers(piece[0]) & BIT[square_of(x, y)])
+
+    def capture_sequences(self, sq):
+        """
+        All maximal jump sequences for the piece on square sq. Jumped pieces
+        are removed as they are taken, and a pawn that reaches the far row
+        is crowned and may keep jumping as a king (as Checkers.move does).
+        """
+        bit = BIT[sq]
+        colour = 'White' if self.white & bit else 'Black'
+        enemy = self.pieces(opposite(colour))
+        empty = (~(self.white | self.black) & FULL) | bit
+        sequences = []
+        self._extend_jumps(sq, colour, bool(self.kings & bit), enemy, empty,
+                           (sq,), 0, sequences)
+        return sequences
+
+    def _extend_jumps(self, sq, colour, is_king, enemy, empty, path, captured, out):
+        directions = KING_DIRECTIONS if is_king else PAWN_DIRECTIONS[colour]
+        extended = False
+        for d in directions:
+            jump = JUMP[d][sq]
+            if jump is None:
+                continue
+            mid, land = jump
+            if enemy & BIT[mid] and empty & BIT[land]:
+                extended = True
+                self._extend_jumps(land, colour,
+                                   is_king or bool(BIT[land] & PROMOTION_ROW[colour]),
+                                   enemy & ~BIT[mid],
+                                   (empty | BIT[mid] | BIT[sq]) & ~BIT[land],
+                                   path + (land,), captured | BIT[mid], out)
+        if not extended and captured:
+            out.append((path, captured))
+
+    def walks(self, colour=None):
+        colour = colour or self.pTurn
+        own = self.pieces(colour)
+        kings = own & self.kings
+        empty = ~(self.white | self.black) & FULL
+        moves = []
+        for d in KING_DIRECTIONS:
+            movers = own if d in PAWN_DIRECTIONS[colour] else kings
+            if not movers:
+                continue
+            back = NEIGHBOUR[REVERSE[d]]
+            for dst in iter_bits(step(movers, d) & empty):
+                moves.append(((back[dst], dst), 0))
+        return moves
+
+    def legal_moves(self, colour=None):
+        """
+        Legal moves for colour (default: side to move). Captures are
+        mandatory, so walks are only returned when no piece can jump.
+        """
+        colour = colour or self.pTurn
+        jumpers = self.jumpers(colour)
+        if not jumpers:
+            return self.walks(colour)
+        moves = []
+        for sq in iter_bits(jumpers):
+            moves.extend(self.capture_sequences(sq))
+        return moves
+
+    @staticmethod
+    def to_hops(move):
+        """GUI form of a move: a list of [x1, y1, x2, y2] hops."""
+        path = move[0]
+        return [[*COORDS[a], *COORDS[b]] for a, b in zip(path, path[1:])]
+
+    ##########################################
+    # Making Moves                           #
+    ##########################################
+    def make_move(self, move):
+        """
+        Apply a full move: move the piece to the end of its path, remove the
+        jumped pieces, crown on the far row and pass the turn.
+
+        Pushes an undo record (src bit, dst bit, captured mask, captured
+        kings mask, was_king, promoted, previous key) that unmake_move()
+        reverts, and returns it so weight_move() can score what happened.
+        Only the squares the move touched are recorded, never the whole board.
+        The Zobrist key is updated for just those squares as well.
+        """
+        path, captured = move
+        src, dst = BIT[path[0]], BIT[path[-1]]
+        was_king = bool(self.kings & src)
+        captured_kings = self.kings & captured
+        promoted = False
+        if not was_king:
+            promotion_row = PROMOTION_ROW[self.pTurn]
+            for sq in path[1:]:
+                if BIT[sq] & promotion_row:
+                    promoted = True
+                    break
+
+        old_key = self.key
+        if self.pTurn == 'White':
+            mover, enemy_pawn = WHITE_PAWN, BLACK_PAWN
+        else:
+            mover, enemy_pawn = BLACK_PAWN, WHITE_PAWN
+        key = (old_key ^ ZOBRIST_BLACK_TO_MOVE ^
+               ZOBRIST[mover + was_king][path[0]] ^
+               ZOBRIST[mover + (was_king or promoted)][path[-1]])
+        for sq in iter_bits(captured):
+            key ^= ZOBRIST[enemy_pawn + bool(captured_kings & BIT[sq])][sq]
+        self.key = key
+
+        # src ^ dst is 0 when a king's jump chain ends where it started
+        if self.pTurn == 'White':
+            self.white ^= src ^ dst
+            self.black &= ~captured
+            self.pTurn = 'Black'
+        else:
+            self.black ^= src ^ dst
+            self.white &= ~captured
+            self.pTurn = 'White'
+        self.kings &= ~(captured | src)
+        if was_king or promoted:
+            self.kings |= dst
+
+        record = (src, dst, captured, captured_kings, was_king, promoted, old_key)
+        self.undo_stack.append(record)
+        return record
+
+    def unmake_move(self):
+        """Revert the most recent make_move()."""
+        src, dst, captured, captured_kings, was_king, promoted, key = self.undo_stack.pop()
+        self.key = key
+        if self.pTurn == 'Black':           # White made the move
+            self.white ^= src ^ dst
+            self.black |= captured
+            self.pTurn = 'White'
+        else:
+            self.black ^= src ^ dst
+            self.white |= captured
+            self.pTurn = 'Black'
+        self.kings &= ~dst
+        self.kings |= captured_kings
+        if was_king:
+            self.kings |= src
+
+    ##########################################
+    # Board Deltas                           #
+    ##########################################
+    # A delta is a list of (x, y, piece) for the squares that changed, piece
+    # being the (colour, rank) now there or None, so a renderer can repaint
+    # those squares and leave the rest of the board alone.
+    def delta(self, record=None):
+        """
+        Delta of a move already made, by default the last one: its source,
+        destination (crowned or not) and every captured square.
+        """
+        if record is None:
+            record = self.undo_stack[-1]
+        src, dst, captured = record[:3]
+        return self.squares(src | dst | captured)
+
+    def diff(self, before):
+        """Delta that turns position before into this one."""
+        return self.squares((self.white ^ before.white) | (self.black ^ before.black) |
+                            (self.kings ^ before.kings))
+
+    def squares(self, mask):
+        """(x, y, piece) for every square in mask."""
+        delta = []
+        for sq in iter_bits(mask):
+            x, y = COORDS[sq]
+            delta.append((x, y, self.piece(x, y)))
+        return delta
+
+    ##########################################
+    # Move Scoring and Heuristic Evaluation  #
+    ##########################################
+    def weight_move(self, move, result):
+        """
+        Score a move that has just been made with make_move(); result is the
+        undo record make_move returned. Scored from the mover's point of view.
+        """
+        path, captured = move
+        _, _, _, captured_kings, _, promoted, _ = result
+        colour = opposite(self.pTurn)
+        dst = path[-1]
+
+        score = 0
+
+        # BACK_ROW
+        if BIT[path[0]] & BACK_ROW[colour]:
+            score += BACK_ROW_BONUS
+
+        # MOBILITY
+        if not self.jumpers(colour) & BIT[dst]:
+            score += MOBILITY
+
+        # PROMOTION
+        if promoted:
+            score += PROMOTION
+
+        # CAPTURE bonuses
+        if captured:
+            score += capture_value(captured, captured_kings)
+
+        # SAFETY
+        if self.square_is_safe(dst):
+            score += SAFETY
+
+        return score
+
+    def square_is_safe(self, sq):
+        """
+        True if no enemy piece can immediately jump the piece standing on sq.
+        """
+        bit = BIT[sq]
+        enemy_colour = 'Black' if self.white & bit else 'White'
+        enemy = self.pieces(enemy_colour)
+        occupied = self.white | self.black
+        for d in KING_DIRECTIONS:
+            attacker = NEIGHBOUR[REVERSE[d]][sq]   # jumps in direction d ...
+            land = NEIGHBOUR[d][sq]                # ... and lands here
+            if attacker is None or land is None:
+                continue
+            if (enemy & BIT[attacker] and not occupied & BIT[land] and
+                    (self.kings & BIT[attacker] or d in PAWN_DIRECTIONS[enemy_colour])):
+                return False
+        return True
+
+
+##########################################
+# Transposition Table                    #
+##########################################
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results indexed by Zobrist key.
+
+    Each slot holds one entry (key, depth, bound, score, best_move,
+    generation). When two positions map to the same slot the replacement
+    policy decides which one stays:
+      'always'    -- the newest store wins
+      'depth'     -- keep whichever was searched deeper
+      'depth-age' -- like 'depth', but entries left over from an earlier
+                     search() are always replaced
+    """
+
+    POLICIES = ('always', 'depth', 'depth-age')
+
+    def __init__(self, size=1 << 16, replacement='depth-age'):
+        if replacement not in self.POLICIES:
+            raise ValueError("unknown replacement policy: " + str(replacement))
+        self.size = 1 << max(0, int(size) - 1).bit_length()   # round up to a power of two
+        self.mask = self.size - 1
+        self.replacement = replacement
+        self.table = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.table = [None] * self.size
+        self.probes = self.hits = self.stores = self.overwrites = 0
+
+    def probe(self, key):
+        """The entry stored for key, or None."""
+        self.probes += 1
+        entry = self.table[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, bound, score, best_move):
+        index = key & self.mask
+        old = self.table[index]
+        if old is not None and old[0] != key:
+            if self.replacement == 'depth' and old[1] > depth:
+                return
+            if (self.replacement == 'depth-age' and old[1] > depth and
+                    old[5] == self.generation):
+                return
+            self.overwrites += 1
+        elif old is not None and best_move is None:
+            best_move = old[4]                 # keep the move we already knew
+        self.table[index] = (key, depth, bound, score, best_move, self.generation)
+        self.stores += 1
+
+    def filled(self):
+        return sum(1 for entry in self.table if entry is not None)
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def memory_bytes(self):
+        """Approximate memory held by the table and its entries."""
+        total = sys.getsizeof(self.table)
+        for entry in self.table:
+            if entry is not None:
+                total += sys.getsizeof(entry) + sum(sys.getsizeof(v) for v in entry)
+        return total
+
+    def stats(self):
+        return {
+            'size': self.size,
+            'filled': self.filled(),
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate(),
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'memory_bytes': self.memory_bytes(),
+        }
+
+
+##########################################
+# Tracing                                #
+##########################################
+# Engine.trace_level picks how much of the search is reported:
+TRACE_OFF = 0       # nothing (the default)
+TRACE_SEARCH = 1    # one line per root iteration
+TRACE_NODE = 2      # node entry/exit, terminal nodes and cutoffs
+TRACE_MOVE = 3      # every move made and unmade inside the tree
+# Every trace call in the search sits behind a level test, so when tracing
+# is off no message is formatted and no board is scanned for it.
+
+
+def print_sink(line):
+    print(line)
+
+
+class RingBufferSink:
+    """
+    Trace sink that keeps only the last capacity lines, cheap enough to
+    leave running at TRACE_NODE during play and dump() after a bad move.
+    """
+
+    def __init__(self, capacity=10000):
+        self.buffer = deque(maxlen=capacity)
+
+    def __call__(self, line):
+        self.buffer.append(line)
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def lines(self):
+        return list(self.buffer)
+
+    def clear(self):
+        self.buffer.clear()
+
+    def dump(self, file=None):
+        """Write the buffered lines, oldest first, to file (default stderr)."""
+        file = file if file is not None else sys.stderr
+        for line in self.buffer:
+            file.write(line + '\n')
+
+
+##########################################
+# Search Statistics                      #
+##########################################
+class SearchStats:
+    """
+    What one search did. Engine.new_search() starts a fresh one in
+    Engine.stats and search()/iterative_deepening() finish it, so after a
+    move has been picked engine.stats describes how it was found.
+
+    Counters: nodes (all, quiescence included), qnodes, leaves (nodes
+    scored without searching further), cutoffs (beta cutoffs) and
+    first_move_cutoffs (those made by the first move tried), tt_probes and
+    tt_hits. ply_nodes[p] is the number of nodes visited p plies below the
+    root, and iterations has one record per finished root iteration.
+    """
+
+    COUNTERS = ('nodes', 'qnodes', 'leaves', 'cutoffs', 'first_move_cutoffs',
+                'tt_probes', 'tt_hits')
+
+    def __init__(self, max_ply=128):
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.ply_nodes = [0] * max_ply
+        self.iterations = []
+        self.depth = 0
+        self.score = None
+        self.best_move = None
+        self.elapsed = 0.0
+        self.start = time.perf_counter()
+        self._tt_start = None
+
+    def begin(self, tt):
+        """Remember the table's counters so only this search's are reported."""
+        self._tt_start = (tt.probes, tt.hits)
+
+    def add_iteration(self, depth, nodes, seconds, score, best_move):
+        self.iterations.append({
+            'depth': depth,
+            'nodes': nodes,
+            'seconds': seconds,
+            'score': score,
+            'best_move': Position.to_hops(best_move) if best_move else None,
+        })
+
+    def finish(self, best_move, score, depth, engine=None):
+        """Record the result; engine, if given, supplies the node and table counts."""
+        if engine is not None:
+            self.nodes = engine.nodes
+            self.qnodes = engine.qnodes
+            if self._tt_start is not None:
+                self.tt_probes = engine.tt.probes - self._tt_start[0]
+                self.tt_hits = engine.tt.hits - self._tt_start[1]
+        self.best_move = best_move
+        self.score = score
+        self.depth = depth
+        self.elapsed = time.perf_counter() - self.start
+
+    def merge(self, counters):
+        """Add the counters() of a search run elsewhere (a worker process)."""
+        for name in self.COUNTERS:
+            setattr(self, name, getattr(self, name) + counters[name])
+        ply_nodes = counters['ply_nodes']
+        if len(ply_nodes) > len(self.ply_nodes):
+            self.ply_nodes.extend([0] * (len(ply_nodes) - len(self.ply_nodes)))
+        for ply, n in enumerate(ply_nodes):
+            self.ply_nodes[ply] += n
+
+    def counters(self):
+        counters = dict((name, getattr(self, name)) for name in self.COUNTERS)
+        counters['ply_nodes'] = list(self.ply_nodes)
+        return counters
+
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def branching_factors(self):
+        """Effective branching factor per ply: nodes at ply p+1 / nodes at ply p."""
+        factors = []
+        for ply in range(len(self.ply_nodes) - 1):
+            if not self.ply_nodes[ply] or not self.ply_nodes[ply + 1]:
+                break
+            factors.append(self.ply_nodes[ply + 1] / self.ply_nodes[ply])
+        return factors
+
+    def as_dict(self):
+        iterations = []
+        previous = 0
+        for record in self.iterations:
+            record = dict(record)
+            searched = record['nodes'] - previous
+            before = iterations[-1]['searched'] if iterations else 0
+            record['ebf'] = searched / before if before else None
+            record['searched'] = searched
+            previous = record['nodes']
+            iterations.append(record)
+        last = len(self.ply_nodes)
+        while last and not self.ply_nodes[last - 1]:
+            last -= 1
+        stats = self.counters()
+        stats.update({
+            'ply_nodes': self.ply_nodes[:last],
+            'depth': self.depth,
+            'score': self.score,
+            'best_move': Position.to_hops(self.best_move) if self.best_move else None,
+            'elapsed': self.elapsed,
+            'nps': self.nodes_per_second(),
+            'first_move_cutoff_rate': self.first_move_cutoff_rate(),
+            'tt_hit_rate': self.tt_hit_rate(),
+            'branching_factors': self.branching_factors(),
+            'iterations': iterations,
+        })
+        return stats
+
+    def to_json(self, **extra):
+        """One JSON line; extra fields (a release tag, a position name) are added."""
+        stats = self.as_dict()
+        stats.update(extra)
+        return json.dumps(stats, sort_keys=True)
+
+    def write_jsonl(self, path, **extra):
+        """Append this search to a JSON lines file."""
+        with open(path, 'a') as f:
+            f.write(self.to_json(**extra) + '\n')
+
+
+##########################################
+# Alpha-Beta Search                      #
+##########################################
+class SearchTimeout(Exception):
+    """Raised inside alpha_beta when the move's time budget has run out."""
+    pass
+
+
+class Engine:
+    """
+    Negamax alpha-beta over a Position. A node's value is, from the side to
+    move's point of view, the best weight_move() gain minus the opponent's
+    best reply value; leaves are worth 0 and a side with no moves has lost.
+
+    Results are kept in a TranspositionTable that lives as long as the
+    Engine, so positions reached by another move order -- in this search or
+    a later one -- are not searched again.
+
+    With move_ordering on, each node tries the table's best move first,
+    then captures by material won, then this ply's killer moves, then the
+    remaining walks by history score. self.nodes counts the nodes visited
+    by the last search so the effect of ordering can be measured, and
+    self.stats (a SearchStats) has the rest of the search's figures.
+
+    At depth 0 the search does not stop while the side to move has a jump:
+    quiescence() keeps playing out the forced captures, up to
+    quiescence_depth more plies (0 turns it off), and self.qnodes counts
+    the nodes it visits.
+
+    trace_level (TRACE_OFF .. TRACE_MOVE) sets how much of the search is
+    reported to trace_sink, a callable taking one line of text; it prints
+    by default, and a RingBufferSink keeps just the most recent lines.
+    """
+
+    LOSS = -100000
+    MAX_DEPTH = 64
+    TIME_CHECK_INTERVAL = 256      # nodes between clock reads
+    KILLERS_PER_PLY = 2
+
+    def __init__(self, position=None, tt_size=1 << 16, tt_replacement='depth-age',
+                 move_ordering=True, quiescence_depth=8, trace_level=TRACE_OFF,
+                 trace_sink=None):
+        self.position = position if position is not None else Position()
+        self.tt = TranspositionTable(tt_size, tt_replacement)
+        self.move_ordering = move_ordering
+        self.quiescence_depth = quiescence_depth
+        self.nodes = 0
+        self.qnodes = 0
+        self.deadline = None
+        self.stop = False
+        self.killers = []
+        self.history = {}
+        self.trace_level = trace_level
+        self.trace_sink = trace_sink if trace_sink is not None else print_sink
+        self.stats = SearchStats()
+
+    def trace(self, message, *args):
+        """Send one formatted line to the sink; callers test the level first."""
+        self.trace_sink(message.format(*args))
+
+    def new_search(self, depth=None):
+        """
+        Reset per-search state before a new move is searched; depth, the
+        deepest iteration to come, sizes the per-ply counters when it is
+        beyond MAX_DEPTH.
+        """
+        self.tt.new_search()
+        self.nodes = 0
+        self.qnodes = 0
+        max_ply = max(depth or 0, self.MAX_DEPTH) + self.quiescence_depth + 2
+        self.stats = SearchStats(max_ply)
+        self.stats.begin(self.tt)
+        self.killers = [[] for _ in range(self.MAX_DEPTH + 1)]
+        for k in self.history:
+            self.history[k] //= 2
+
+    ##########################################
+    # Move Ordering                          #
+    ##########################################
+    def order_moves(self, moves, ply, hash_move=None):
+        if not self.move_ordering or len(moves) < 2:
+            return moves
+        if moves[0][1]:
+            # captures: most material first
+            kings = self.position.kings
+            moves = sorted(moves, key=lambda m: -capture_value(m[1], m[1] & kings))
+        else:
+            history = self.history
+            killers = self.killers[ply] if ply < len(self.killers) else ()
+            moves = sorted(moves, key=lambda m: -history.get((m[0][0], m[0][-1]), 0))
+            for killer in reversed(killers):
+                if killer in moves:
+                    moves.remove(killer)
+                    moves.insert(0, killer)
+        if hash_move is not None and hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+        return moves
+
+    def record_cutoff(self, move, depth, ply):
+        """Remember a quiet move that caused a beta cutoff."""
+        if move[1] or not self.move_ordering or ply >= len(self.killers):
+            return
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.KILLERS_PER_PLY:]
+        key = (move[0][0], move[0][-1])
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+    ##########################################
+    # Search                                 #
+    ##########################################
+    def check_time(self):
+        if not self.nodes % self.TIME_CHECK_INTERVAL and (
+                self.stop or
+                self.deadline is not None and time.perf_counter() >= self.deadline):
+            raise SearchTimeout()
+
+    def abort(self):
+        """Make a search running in another thread stop at its next clock check."""
+        self.stop = True
+
+    def clear_abort(self):
+        self.stop = False
+
+    def close(self):
+        """Release what the engine holds; the checkers_parallel engines stop their workers."""
+
+    def alpha_beta(self, depth, alpha, beta, ply=1):
+        if depth <= 0:
+            return self.quiescence(alpha, beta, ply)
+
+        pos = self.position
+        trace = self.trace_level
+        stats = self.stats
+        self.nodes += 1
+        stats.ply_nodes[ply] += 1
+        self.check_time()
+        legal_moves = pos.legal_moves()
+        if trace >= TRACE_NODE:
+            self.trace("[alpha_beta] Enter: depth={}, pieces={}", depth, pos.count())
+
+        if not legal_moves:
+            stats.leaves += 1
+            if trace >= TRACE_NODE:
+                self.trace("[alpha_beta] Terminal: pieces={}", pos.count())
+            return self.LOSS
+
+        alpha_orig = alpha
+        hash_move = None
+        entry = self.tt.probe(pos.key)
+        if entry is not None:
+            _, entry_depth, bound, score, hash_move, _ = entry
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return score
+                if bound == LOWER and score > alpha:
+                    alpha = score
+                elif bound == UPPER and score < beta:
+                    beta = score
+                if alpha >= beta:
+                    if trace >= TRACE_NODE:
+                        self.trace("  [tt] Cutoff at depth={}, value={}", depth, score)
+                    return score
+
+        best_value = float('-inf')
+        best_move = None
+
+        for index, move in enumerate(self.order_moves(legal_moves, ply, hash_move)):
+            if trace >= TRACE_MOVE:
+                self.trace("  [move] Before move: {}, pieces={}", Position.to_hops(move), pos.count())
+            result = pos.make_move(move)
+            gain = pos.weight_move(move, result)
+            if trace >= TRACE_MOVE:
+                self.trace("  [move] After move: pieces={}, gain={}", pos.count(), gain)
+
+            value = gain - self.alpha_beta(depth - 1, gain - beta, gain - alpha, ply + 1)
+
+            pos.unmake_move()
+            if trace >= TRACE_MOVE:
+                self.trace("  [move] After unmake: pieces={}, value={}", pos.count(), value)
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+            if best_value > alpha:
+                alpha = best_value
+            if alpha >= beta:
+                stats.cutoffs += 1
+                if not index:
+                    stats.first_move_cutoffs += 1
+                if trace >= TRACE_NODE:
+                    self.trace("  [prune] Beta cutoff at depth={}, value={}", depth, best_value)
+                self.record_cutoff(move, depth, ply)
+                break
+
+        if best_value <= alpha_orig:
+            bound = UPPER
+        elif best_value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(pos.key, depth, bound, best_value, best_move)
+
+        if trace >= TRACE_NODE:
+            self.trace("[alpha_beta] Exit: depth={}, best_value={}, pieces={}",
+                       depth, best_value, pos.count())
+        return best_value
+
+    def quiescence(self, alpha, beta, ply, qdepth=0):
+        """
+        Leaf search: a quiet position (no jump for the side to move) is worth
+        0, otherwise the forced captures are searched -- and only those --
+        until the position is quiet or quiescence_depth plies have been added.
+        """
+        pos = self.position
+        trace = self.trace_level
+        stats = self.stats
+        self.nodes += 1
+        self.qnodes += 1
+        stats.ply_nodes[ply] += 1
+        self.check_time()
+        legal_moves = pos.legal_moves()
+
+        if not legal_moves:
+            stats.leaves += 1
+            if trace >= TRACE_NODE:
+                self.trace("[quiescence] Terminal: pieces={}", pos.count())
+            return self.LOSS
+        if not legal_moves[0][1] or qdepth >= self.quiescence_depth:
+            stats.leaves += 1
+            if trace >= TRACE_NODE:
+                self.trace("[quiescence] Leaf: qdepth={}, pieces={}", qdepth, pos.count())
+            return 0
+
+        best_value = float('-inf')
+        for index, move in enumerate(self.order_moves(legal_moves, ply)):
+            result = pos.make_move(move)
+            gain = pos.weight_move(move, result)
+            value = gain - self.quiescence(gain - beta, gain - alpha, ply + 1, qdepth + 1)
+            pos.unmake_move()
+
+            if value > best_value:
+                best_value = value
+            if best_value > alpha:
+                alpha = best_value
+            if alpha >= beta:
+                stats.cutoffs += 1
+                if not index:
+                    stats.first_move_cutoffs += 1
+                if trace >= TRACE_NODE:
+                    self.trace("  [prune] Quiescence cutoff at qdepth={}, value={}", qdepth, best_value)
+                break
+        return best_value
+
+    def search(self, depth):
+        """
+        Fixed-depth search: returns (best_move, best_score) for the side to
+        move, or (None, LOSS) if it has no legal moves.
+        """
+        self.new_search(depth)
+        best_move, best_score = self.search_root(depth)
+        self.stats.finish(best_move, best_score, depth if best_move else 0, self)
+        return best_move, best_score
+
+    def search_root(self, depth, first_move=None):
+        """
+        One root iteration to the given depth, trying first_move (normally
+        the previous iteration's best move) before the others.
+        """
+        pos = self.position
+        start = time.perf_counter()
+        best_score = float('-inf')
+        best_move = None
+        alpha, beta = float('-inf'), float('inf')
+
+        if first_move is None:
+            entry = self.tt.probe(pos.key)
+            if entry is not None:
+                first_move = entry[4]
+        legal_moves = self.order_moves(pos.legal_moves(), 0, first_move)
+
+        self.nodes += 1
+        self.stats.ply_nodes[0] += 1
+        for move in legal_moves:
+            result = pos.make_move(move)
+            gain = pos.weight_move(move, result)
+            value = gain - self.alpha_beta(depth - 1, gain - beta, gain - alpha)
+            pos.unmake_move()
+
+            if value > best_score:
+                best_score = value
+                best_move = move
+            if best_score > alpha:
+                alpha = best_score
+
+        if best_move is None:
+            return None, self.LOSS
+        self.tt.store(pos.key, depth, EXACT, best_score, best_move)
+        self.stats.add_iteration(depth, self.nodes, time.perf_counter() - start,
+                                 best_score, best_move)
+        if self.trace_level >= TRACE_SEARCH:
+            self.trace("[search_root] depth={}, best={}, score={}, nodes={}",
+                       depth, Position.to_hops(best_move), best_score, self.nodes)
+        return best_move, best_score
+
+    def iterative_deepening(self, time_ms, max_depth=None):
+        """
+        Search depth 1, 2, 3, ... until time_ms milliseconds have passed or
+        max_depth is reached, and return (best_move, best_score, depth) from
+        the deepest iteration that finished. Depth 1 always runs to
+        completion so there is always a move to play; a new iteration is not
+        started once half the budget is spent, since it would almost surely
+        be cut off. time_ms=None searches until max_depth or abort().
+        """
+        pos = self.position
+        max_depth = max_depth or self.MAX_DEPTH
+        start = time.perf_counter()
+        deadline = start + time_ms / 1000.0 if time_ms is not None else None
+        root_ply = len(pos.undo_stack)
+        self.new_search(max_depth)
+
+        best_move, best_score, completed = None, self.LOSS, 0
+        single_reply = len(pos.legal_moves()) <= 1
+        for depth in range(1, max_depth + 1):
+            self.deadline = deadline if depth > 1 else None
+            try:
+                move, score = self.search_root(depth, best_move)
+            except SearchTimeout:
+                while len(pos.undo_stack) > root_ply:
+                    pos.unmake_move()
+                if self.trace_level >= TRACE_SEARCH:
+                    self.trace("[iterative_deepening] Timeout in depth={}, nodes={}", depth, self.nodes)
+                break
+            finally:
+                self.deadline = None
+            best_move, best_score, completed = move, score, depth
+            if single_reply or (deadline is not None and
+                                time.perf_counter() - start >= (deadline - start) / 2):
+                break
+
+        self.stats.finish(best_move, best_score, completed, self)
+        return best_move, best_score, completed
+
+
+##########################################
+# Background Search                      #
+##########################################
+class SearchThread:
+    """
+    One engine call -- search(), iterative_deepening() -- run in a daemon
+    thread so the caller's event loop keeps going. Poll done() and read
+    result once it is True.
+
+    cancel() is the cancellation token: it aborts the engine, which gives
+    up at its next clock check, and waits for the thread; result is then
+    None. Works with any engine that has abort() and clear_abort().
+    """
+
+    def __init__(self, engine, method, *args):
+        self.engine = engine
+        self.method = method
+        self.args = args
+        self.result = None
+        self.cancelled = False
+        self.thread = threading.Thread(target=self._run, name='search', daemon=True)
+
+    def start(self):
+        self.engine.clear_abort()
+        self.thread.start()
+        return self
+
+    def _run(self):
+        try:
+            result = self.method(*self.args)
+        except SearchTimeout:
+            result = None
+        if not self.cancelled:
+            self.result = result
+
+    def done(self):
+        return not self.thread.is_alive()
+
+    def wait(self, timeout=None):
+        self.thread.join(timeout)
+        return self.done()
+
+    def cancel(self):
+        self.cancelled = True
+        self.result = None
+        if self.thread.is_alive():
+            self.engine.abort()
+            self.thread.join()
+        self.engine.clear_abort()
+
+
+class Ponderer:
+    """
+    Thinks on the opponent's time. After the engine has moved, start()
+    guesses the opponent's reply -- the best move the transposition table
+    holds for the position -- and searches the position after it in a
+    SearchThread, with no time limit, on the engine itself.
+
+    When the opponent has moved, finish() stops the thread. If the
+    opponent played the predicted move (a ponder hit) it returns the
+    (best_move, best_score, depth) the ponder search had reached;
+    otherwise it returns None and the work is dropped. Either way the
+    table entries the ponder search made stay behind, keyed by position,
+    so a hit leaves the table warm for the real search.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.search = None
+        self.key = None
+        self.hits = 0
+        self.misses = 0
+
+    def predicted_reply(self, position):
+        entry = self.engine.tt.probe(position.key)
+        if entry is not None and entry[4] in position.legal_moves():
+            return entry[4]
+        return None
+
+    def start(self, position):
+        """Ponder the reply to position (the opponent to move); False if there is nothing to ponder."""
+        self.stop()
+        reply = self.predicted_reply(position)
+        if reply is None:
+            return False
+        pos = position.copy()
+        pos.make_move(reply)
+        if not pos.legal_moves():
+            return False
+        pos.undo_stack = []
+        self.key = pos.key
+        self.engine.position = pos
+        self.search = SearchThread(self.engine, self.engine.iterative_deepening, None).start()
+        return True
+
+    def is_running(self):
+        return self.search is not None
+
+    def stop(self):
+        """Stop pondering and return what the search had found, or None."""
+        if self.search is None:
+            return None
+        self.engine.abort()
+        self.search.wait()
+        self.engine.clear_abort()
+        result = self.search.result
+        self.search = None
+        return result
+
+    def finish(self, position):
+        """Stop pondering; the ponder result if position is the one pondered, else None."""
+        if self.search is None:
+            return None
+        result = self.stop()
+        if position.key != self.key or result is None or result[0] is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
@@ -0,0 +1,858 @@
+"""
+Headless rule-based player: the inference system of
+Checkers_v24_inference_system.py, run on the engine's bitboard Position.
+
+The facts are the ones ExtractFactsFromBoard derives from the Tiles:
+    ('piece', colour, rank, (x, y))
+    ('can_jump', colour, (x, y), (tx, ty))      the first landing square in
+                                                FindJumpTarget's order
+    ('can_promote', colour, (x, y))
+    ('can_advance', colour, (x, y), (tx, ty))
+plus ('safe_advance', colour, (x, y), (tx, ty)) for every advance that
+isSafeMove allows, so that MatchRules' safety test is a fact as well.
+Jumps are derived for both colours, each against its own opponent, so no
+fact depends on whose turn it is.
+
+The rules are MatchRules' and SelectRuleToFire's: a jump if there is one,
+else an advance onto the far row ('promote'), else the safe advance that
+stays nearest the back row, else any advance that does. Where the
+original's choice depended on set iteration order, ties here go to the
+lowest (from, to) coordinates.
+
+decide_positions() runs the rules headless over a batch of positions,
+optionally on a pool of worker processes. Run this file directly to
+measure its throughput:
+    python checkers_inference.py --positions 20000 [--workers 4]
+or to check that the ReteNetwork, decide_positions() and the interpreted
+rules of the inference GUI still agree with the facts derived from
+scratch:
+    python checkers_inference.py --check [--positions 2000] [--games 20]
+"""
+
+import heapq
+import random
+import sys
+import time
+
+from checkers_engine import (BIT, BOARD_DIMENSION, COORDS, DL, DR, FULL, JUMP, NEIGHBOUR,
+                             PAWN_DIRECTIONS, PROMOTION_ROW, REVERSE, UL, UR, Position,
+                             iter_bits, opposite, square_of, step)
+
+JUMP_ORDER = ((-2, -2), (-2, 2), (2, -2), (2, 2))          # as FindJumpTarget tries them
+ADVANCES = {'White': ((-1, 1), (1, 1)), 'Black': ((-1, -1), (1, -1))}
+KING_ADVANCES = ((-1, 1), (1, 1), (-1, -1), (1, -1))       # as canAdvance yields them
+DIAGONALS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+FAR_ROW = {'White': BOARD_DIMENSION - 1, 'Black': 0}
+
+
+def _near_mask(sq):
+    x, y = COORDS[sq]
+    mask = 0
+    for dx in range(-2, 3):
+        for dy in range(-2, 3):
+            near = square_of(x + dx, y + dy)
+            if near is not None:
+                mask |= BIT[near]
+    return mask
+
+
+# NEAR[sq]: the squares within two steps of sq. Every fact about a piece
+# depends only on these: a jump lands two squares away, and the safety of
+# an advance looks one square past its target.
+NEAR = [_near_mask(sq) for sq in range(32)]
+
+
+##########################################
+# Fact Base                              #
+##########################################
+EMPTY = frozenset()
+
+
+def fact_square(fact):
+    """The square a fact is about: the piece's for 'piece', the mover's otherwise."""
+    if fact[0] == 'piece':
+        return fact[3]
+    if len(fact) > 2:
+        return fact[2]
+    return None
+
+
+class FactBase:
+    """
+    A set of facts indexed by predicate, colour and square.
+
+    Each fact is filed under every combination of the three (None standing
+    for "any"), so lookup('can_jump', 'White') or at((x, y)) is a single
+    dict access that returns just the matching facts, and matching a rule
+    costs the facts it matches rather than a pass over all of them.
+    """
+
+    def __init__(self, facts=()):
+        self.index = {}
+        self.count = 0
+        for fact in facts:
+            self.add(fact)
+
+    def _keys(self, fact):
+        square = fact_square(fact)
+        for predicate in (fact[0], None):
+            for colour in (fact[1], None):
+                yield (predicate, colour, square)
+                if square is not None:
+                    yield (predicate, colour, None)
+
+    def add(self, fact):
+        if fact in self:
+            return
+        for key in self._keys(fact):
+            self.index.setdefault(key, set()).add(fact)
+        self.count += 1
+
+    def discard(self, fact):
+        if fact not in self:
+            return
+        for key in self._keys(fact):
+            self.index[key].discard(fact)
+        self.count -= 1
+
+    def update(self, facts):
+        for fact in facts:
+            self.add(fact)
+
+    def lookup(self, predicate=None, colour=None, square=None):
+        """The facts matching the given predicate, colour and square (do not modify)."""
+        return self.index.get((predicate, colour, square), EMPTY)
+
+    def at(self, square):
+        """The facts about the square (x, y)."""
+        return self.lookup(square=square)
+
+    def __contains__(self, fact):
+        return fact in self.index.get((None, None, None), EMPTY)
+
+    def __iter__(self):
+        return iter(self.lookup())
+
+    def __len__(self):
+        return self.count
+
+
+##########################################
+# Facts                                  #
+##########################################
+def is_safe(pos, colour, tx, ty):
+    """isSafeMove: no opponent next to (tx, ty) with an empty square opposite it."""
+    enemy = pos.pieces(opposite(colour))
+    occupied = pos.white | pos.black
+    for dx, dy in DIAGONALS:
+        nbr = square_of(tx + dx, ty + dy)
+        land = square_of(tx - dx, ty - dy)
+        if nbr is not None and land is not None and enemy & BIT[nbr] and not occupied & BIT[land]:
+            return False
+    return True
+
+
+def piece_facts(pos, x, y):
+    """The facts about the piece on (x, y); none for an empty square."""
+    piece = pos.piece(x, y)
+    if piece is None:
+        return []
+    colour, rank = piece
+    is_king = rank == 'King'
+    here = (x, y)
+    occupied = pos.white | pos.black
+    enemy = pos.pieces(opposite(colour))
+    facts = [('piece', colour, rank, here)]
+
+    forward = 2 if colour == 'White' else -2
+    for dx, dy in JUMP_ORDER:
+        if not is_king and dy != forward:
+            continue
+        land = square_of(x + dx, y + dy)
+        if (land is not None and enemy & BIT[square_of(x + dx // 2, y + dy // 2)] and
+                not occupied & BIT[land]):
+            facts.append(('can_jump', colour, here, (x + dx, y + dy)))
+            break
+
+    if not is_king and y == FAR_ROW[colour]:
+        facts.append(('can_promote', colour, here))
+
+    for dx, dy in (KING_ADVANCES if is_king else ADVANCES[colour]):
+        target = square_of(x + dx, y + dy)
+        if target is None or occupied & BIT[target]:
+            continue
+        to = (x + dx, y + dy)
+        facts.append(('can_advance', colour, here, to))
+        if is_safe(pos, colour, x + dx, y + dy):
+            facts.append(('safe_advance', colour, here, to))
+    return facts
+
+
+def extract_facts(pos):
+    """Every fact about the position, as a FactBase."""
+    facts = FactBase()
+    for sq in iter_bits(pos.white | pos.black):
+        facts.update(piece_facts(pos, *COORDS[sq]))
+    return facts
+
+
+##########################################
+# Rule Compiler                          #
+##########################################
+# The rules, as (action, fact, condition, priority, tiebreak): each fact of
+# the side to move with that predicate that meets the condition proposes
+# (action, from, to). The lowest priority with a proposal fires, and its
+# proposal with the lowest tiebreak key wins. While a piece is in the
+# middle of a capture, only its 'jump' rules are tried.
+RULES = (
+    ('jump', 'can_jump', None, 1, 'order'),
+    ('promote', 'can_advance', 'far_row', 2, 'order'),
+    ('advance', 'safe_advance', None, 3, 'back_row'),
+    ('advance', 'can_advance', None, 4, 'back_row'),
+)
+
+# Conditions and tiebreak keys, as expressions over fact, far (the row the
+# side to move promotes on) and sign (1 for White, -1 for Black).
+CONDITIONS = {
+    'far_row': 'fact[3][1] == far',
+}
+TIEBREAKS = {
+    'order': '(fact[2], fact[3])',
+    'back_row': '(sign * fact[3][1], fact[2], fact[3])',       # nearest the back row first
+}
+
+SIGN = {'White': 1, 'Black': -1}
+
+_compiled = {}
+_activations = {}
+
+
+def rule_source(rules):
+    """The source of the decide(facts, colour, piece=None) function for rules."""
+    for action, predicate, condition, priority, tiebreak in rules:
+        if condition is not None and condition not in CONDITIONS:
+            raise ValueError("unknown rule condition: " + str(condition))
+        if tiebreak not in TIEBREAKS:
+            raise ValueError("unknown rule tiebreak: " + str(tiebreak))
+    tiers = {}
+    for rule in rules:
+        tiers.setdefault(rule[3], []).append(rule)
+
+    lines = ['def decide(facts, colour, piece=None):',
+             '    lookup = facts.lookup',
+             '    far = FAR_ROW[colour]',
+             '    sign = SIGN[colour]',
+             '    if piece is not None:']
+    for priority in sorted(tiers):
+        for action, predicate, condition, _, _ in tiers[priority]:
+            if action != 'jump':
+                continue
+            lines.append('        for fact in lookup(%r, colour, piece):' % predicate)
+            if condition is not None:
+                lines.append('            if %s:' % CONDITIONS[condition])
+                lines.append('                return (%r, piece, fact[3])' % action)
+            else:
+                lines.append('            return (%r, piece, fact[3])' % action)
+    lines.append('        return None')
+
+    for priority in sorted(tiers):
+        lines.append('    best = best_key = None')
+        for action, predicate, condition, _, tiebreak in tiers[priority]:
+            lines.append('    for fact in lookup(%r, colour):' % predicate)
+            if condition is not None:
+                lines.append('        if not (%s):' % CONDITIONS[condition])
+                lines.append('            continue')
+            lines.append('        key = %s' % TIEBREAKS[tiebreak])
+            lines.append('        if best is None or key < best_key:')
+            lines.append('            best, best_key = (%r, fact[2], fact[3]), key' % action)
+        lines.append('    if best is not None:')
+        lines.append('        return best')
+    lines.append('    return None')
+    return '\n'.join(lines) + '\n'
+
+
+def compile_rules(rules=RULES):
+    """
+    The rules compiled into one decide(facts, colour, piece=None) function
+    that checks each priority tier in turn and returns the first firing
+    tier's winner as (action, from, to), or None. Compiled on first use
+    and cached; the generated code is in the function's source attribute.
+    """
+    decide = _compiled.get(rules)
+    if decide is None:
+        source = rule_source(rules)
+        namespace = {'FAR_ROW': FAR_ROW, 'SIGN': SIGN}
+        exec(compile(source, '<checkers rules>', 'exec'), namespace)
+        decide = namespace['decide']
+        decide.source = source
+        _compiled[rules] = decide
+    return decide
+
+
+def compile_activations(rules=RULES):
+    """
+    The rules as predicate -> [(priority, action, test, key)], where
+    test(fact, far, sign) is the rule's condition (None for none) and
+    key(fact, far, sign) its tiebreak key: what a ReteNetwork needs to turn
+    one fact into the rule activations it makes. Compiled on first use and
+    cached.
+    """
+    activations = _activations.get(rules)
+    if activations is None:
+        rule_source(rules)          # validates the table
+        activations = {}
+        for action, predicate, condition, priority, tiebreak in rules:
+            test = None
+            if condition is not None:
+                test = eval('lambda fact, far, sign: ' + CONDITIONS[condition])
+            key = eval('lambda fact, far, sign: ' + TIEBREAKS[tiebreak])
+            activations.setdefault(predicate, []).append((priority, action, test, key))
+        _activations[rules] = activations
+    return activations
+
+
+##########################################
+# Rete Network                           #
+##########################################
+class ReteNetwork:
+    """
+    Incremental matcher for the inference rules.
+
+    Working memory is a FactBase, whose (predicate, colour) index serves
+    as the alpha memories. apply() takes the squares a move changed -- a
+    delta of (x, y, piece), as Position.delta() gives -- and re-derives the
+    facts of just the squares near them, asserting the facts that appeared
+    and retracting the ones that went.
+
+    Every asserted fact that meets a rule's condition is an activation of
+    that rule, and the agenda keeps the activations of each (colour,
+    priority) tier in a heap ordered by tiebreak key; a retraction takes
+    its activations back out (lazily, when they reach the top of the
+    heap). decide() then only looks at the top of each tier, so the cost
+    of a turn follows the size of the move, not of the board.
+    """
+
+    def __init__(self, position, rules=RULES):
+        self.position = position.copy()
+        self.rules = rules
+        self.activations = compile_activations(rules)
+        self.tiers = sorted(set(rule[3] for rule in rules))
+        self.facts = FactBase()
+        self.agenda = {}            # (colour, priority) -> (heap of (key, proposal), live counts)
+        for colour in ('White', 'Black'):
+            for priority in self.tiers:
+                self.agenda[(colour, priority)] = ([], {})
+        self.rederived = 0          # squares re-derived by the last apply()
+        for sq in range(32):
+            self.assert_square(sq)
+
+    def activate(self, fact, change):
+        """Add (change=1) or take back (change=-1) the rule activations of fact."""
+        matches = self.activations.get(fact[0])
+        if not matches:
+            return
+        colour = fact[1]
+        far = FAR_ROW[colour]
+        sign = SIGN[colour]
+        for priority, action, test, key in matches:
+            if test is not None and not test(fact, far, sign):
+                continue
+            entry = (key(fact, far, sign), (action, fact[2], fact[3]))
+            heap, live = self.agenda[(colour, priority)]
+            count = live.get(entry, 0) + change
+            if count:
+                live[entry] = count
+            else:
+                del live[entry]
+            if change > 0 and count == 1:
+                heapq.heappush(heap, entry)
+            elif len(heap) > 2 * len(live) + 64:
+                heap[:] = list(live)
+                heapq.heapify(heap)
+
+    def assert_fact(self, fact):
+        self.facts.add(fact)
+        self.activate(fact, 1)
+
+    def retract_fact(self, fact):
+        self.facts.discard(fact)
+        self.activate(fact, -1)
+
+    def assert_square(self, sq):
+        for fact in piece_facts(self.position, *COORDS[sq]):
+            self.assert_fact(fact)
+
+    def retract_square(self, sq):
+        for fact in list(self.facts.at(COORDS[sq])):
+            self.retract_fact(fact)
+
+    def update_square(self, sq):
+        """Re-derive the facts of sq, passing on only the ones that changed."""
+        old = set(self.facts.at(COORDS[sq]))
+        new = piece_facts(self.position, *COORDS[sq])
+        for fact in old.difference(new):
+            self.retract_fact(fact)
+        for fact in new:
+            if fact not in old:
+                self.assert_fact(fact)
+
+    def best(self, colour, priority):
+        """The (key, proposal) at the top of a tier of the agenda, or None."""
+        heap, live = self.agenda[(colour, priority)]
+        while heap and heap[0] not in live:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def apply(self, delta):
+        """Bring the network up to date with the squares in delta."""
+        pos = self.position
+        near = 0
+        for x, y, piece in delta:
+            if piece is None:
+                pos.remove(x, y)
+            else:
+                pos.place(x, y, piece[0], piece[1])
+            near |= NEAR[square_of(x, y)]
+        self.rederived = 0
+        for sq in iter_bits(near):
+            self.update_square(sq)
+            self.rederived += 1
+
+    def decide(self, colour, piece=None):
+        """
+        The rule to fire for colour, as (type, from, to), or None if it has
+        no move. With piece, the square of a piece in the middle of a
+        capture, only that piece's jumps are considered.
+        """
+        if piece is not None:
+            return compile_rules(self.rules)(self.facts, colour, piece)
+        for priority in self.tiers:
+            entry = self.best(colour, priority)
+            if entry is not None:
+                return entry[1]
+        return None
+
+
+##########################################
+# Batch Decisions                        #
+##########################################
+# JUMP_ORDER and KING_ADVANCES as engine directions
+JUMP_DIRECTIONS = (DL, UL, DR, UR)
+KING_DIRECTIONS = (UL, UR, DL, DR)
+
+
+class PositionFacts:
+    """
+    The facts of a position, derived from its bitboards only when the
+    rules look them up. Stands in for a FactBase when deciding many
+    positions once each: the compiled rules read a handful of predicates
+    of the side to move, so building and indexing every fact would cost
+    more than the decision itself.
+    """
+
+    def __init__(self, white, black, kings):
+        self.white = white
+        self.black = black
+        self.kings = kings
+        self.empty = FULL & ~(white | black)
+        # step(empty, d) for each direction, which the jump, advance and
+        # safety masks all start from
+        self.empty_step = [step(self.empty, d) for d in range(4)]
+
+    def lookup(self, predicate=None, colour=None, square=None):
+        if predicate is None:
+            predicates = ('piece', 'can_jump', 'can_promote', 'can_advance', 'safe_advance')
+        else:
+            predicates = (predicate,)
+        facts = []
+        for predicate in predicates:
+            derive = getattr(self, '_' + predicate)
+            for side in ((colour,) if colour is not None else ('White', 'Black')):
+                facts.extend(derive(side))
+        if square is not None:
+            facts = [fact for fact in facts if fact_square(fact) == square]
+        return facts
+
+    def at(self, square):
+        return self.lookup(square=square)
+
+    def _sides(self, colour):
+        """(pieces of colour, its kings, its pawns, the opponent's pieces)."""
+        own, enemy = (self.white, self.black) if colour == 'White' else (self.black, self.white)
+        return own, own & self.kings, own & ~self.kings, enemy
+
+    def _piece(self, colour):
+        own, kings, _, _ = self._sides(colour)
+        return [('piece', colour, 'King' if kings & BIT[sq] else 'Pawn', COORDS[sq])
+                for sq in iter_bits(own)]
+
+    def _can_jump(self, colour):
+        own, kings, pawns, enemy = self._sides(colour)
+        forward = PAWN_DIRECTIONS[colour]
+        facts = []
+        done = 0
+        for d in JUMP_DIRECTIONS:
+            movers = (own if d in forward else kings) & ~done
+            if not movers:
+                continue
+            back = REVERSE[d]
+            jumpers = movers & step(self.empty_step[back] & enemy, back)
+            done |= jumpers
+            for sq in iter_bits(jumpers):
+                facts.append(('can_jump', colour, COORDS[sq], COORDS[JUMP[d][sq][1]]))
+        return facts
+
+    def _can_promote(self, colour):
+        _, _, pawns, _ = self._sides(colour)
+        return [('can_promote', colour, COORDS[sq]) for sq in iter_bits(pawns & PROMOTION_ROW[colour])]
+
+    def _advances(self, colour, predicate, targets):
+        own, kings, pawns, _ = self._sides(colour)
+        forward = PAWN_DIRECTIONS[colour]
+        facts = []
+        for d in KING_DIRECTIONS:
+            movers = own if d in forward else kings
+            if not movers:
+                continue
+            if targets == self.empty:
+                sources = self.empty_step[REVERSE[d]]
+            else:
+                sources = step(targets, REVERSE[d])
+            for sq in iter_bits(movers & sources):
+                facts.append((predicate, colour, COORDS[sq], COORDS[NEIGHBOUR[d][sq]]))
+        return facts
+
+    def _can_advance(self, colour):
+        return self._advances(colour, 'can_advance', self.empty)
+
+    def _safe_advance(self, colour):
+        # is_safe as masks: a target is unsafe with an opponent one step
+        # one way and an empty square one step the other
+        enemy = self.black if colour == 'White' else self.white
+        unsafe = 0
+        for d in KING_DIRECTIONS:
+            unsafe |= step(enemy, REVERSE[d]) & self.empty_step[d]
+        return self._advances(colour, 'safe_advance', self.empty & ~unsafe)
+
+
+def _state(position):
+    if isinstance(position, Position):
+        return position.white, position.black, position.kings, position.pTurn
+    return position
+
+
+# JUMP_STEPS[colour, is_king][sq]: the (jumped, land) squares of the
+# jumps a piece on sq may make, in JUMP_ORDER
+JUMP_STEPS = {}
+for _colour in ('White', 'Black'):
+    for _is_king in (False, True):
+        _dirs = [d for d in JUMP_DIRECTIONS if _is_king or d in PAWN_DIRECTIONS[_colour]]
+        JUMP_STEPS[_colour, _is_king] = [tuple(JUMP[d][sq] for d in _dirs if JUMP[d][sq] is not None)
+                                         for sq in range(32)]
+
+
+def capture_move(state, start, land):
+    """
+    The whole capture the rule-based player makes when its jump rule fires
+    from start to land: the jump chain followed from the landing square,
+    taking at every fork the first jump in FindJumpTarget's order -- the
+    jump the rule picks for a piece in the middle of a capture. As in
+    Position.capture_sequences, jumped pieces are removed as they are
+    taken and a pawn crowned on the way keeps jumping as a king.
+    """
+    white, black, kings, pTurn = state
+    sq = square_of(*start)
+    target = square_of(*land)
+    enemy = black if pTurn == 'White' else white
+    empty = (FULL & ~(white | black)) | BIT[sq]
+    is_king = bool(kings & BIT[sq])
+    promotion = PROMOTION_ROW[pTurn]
+    path = [sq]
+    captured = 0
+    while True:
+        for jumped, to in JUMP_STEPS[pTurn, is_king][sq]:
+            if enemy & BIT[jumped] and empty & BIT[to] and (target is None or to == target):
+                break
+        else:
+            return tuple(path), captured
+        enemy &= ~BIT[jumped]
+        empty = (empty | BIT[jumped] | BIT[sq]) & ~BIT[to]
+        captured |= BIT[jumped]
+        is_king = is_king or bool(BIT[to] & promotion)
+        path.append(to)
+        sq = to
+        target = None
+
+
+def _decide_states(states, rules=RULES):
+    decide = compile_rules(rules)
+    decisions = []
+    for state in states:
+        white, black, kings, pTurn = state
+        decision = decide(PositionFacts(white, black, kings), pTurn)
+        if decision is not None:
+            action, start, to = decision
+            if action == 'jump':
+                move = capture_move(state, start, to)
+            else:
+                move = ((square_of(*start), square_of(*to)), 0)
+            decision = (action, start, to, move)
+        decisions.append(decision)
+    return decisions
+
+
+def decide_positions(positions, workers=None, rules=RULES, chunk_size=2048):
+    """
+    The rule that fires in each position, in the order given, as
+    (action, from, to, move) or None when the side to move has no move.
+    from and to are the rule's first hop; move is the whole move, as
+    Position.legal_moves() gives it and make_move() takes it, so that a
+    capture is played out to its last jump. positions holds Positions or
+    bare (white, black, kings, pTurn) bitboard tuples. With workers above 1
+    the positions are decided in chunks on a pool of worker processes.
+    """
+    states = [_state(position) for position in positions]
+    if not workers or workers <= 1 or len(states) <= chunk_size:
+        return _decide_states(states, rules)
+    from concurrent.futures import ProcessPoolExecutor
+    chunks = [states[i:i + chunk_size] for i in range(0, len(states), chunk_size)]
+    decisions = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_decide_states, chunks, [rules] * len(chunks)):
+            decisions.extend(chunk)
+    return decisions
+
+
+def random_positions(count, seed=0, max_plies=80):
+    """count positions, none of them over, reached by random play from the standard setup."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        pos = Position.standard()
+        for _ in range(rng.randrange(max_plies)):
+            moves = pos.legal_moves()
+            if not moves:
+                break
+            pos.make_move(rng.choice(moves))
+        if pos.legal_moves():
+            positions.append(pos.copy())
+    return positions
+
+
+##########################################
+# Checks                                 #
+##########################################
+def _hop_deltas(pos, move):
+    """move as the inference GUI plays it: one (x, y, piece) delta per hop."""
+    path = move[0]
+    colour, rank = pos.piece(*COORDS[path[0]])
+    deltas = []
+    for a, b in zip(path, path[1:]):
+        (ax, ay), (bx, by) = COORDS[a], COORDS[b]
+        if by == FAR_ROW[colour]:
+            rank = 'King'
+        delta = [(ax, ay, None), (bx, by, (colour, rank))]
+        if abs(bx - ax) == 2:
+            delta.append(((ax + bx) // 2, (ay + by) // 2, None))
+        deltas.append(delta)
+    return deltas
+
+
+def _apply_delta(pos, delta):
+    for x, y, piece in delta:
+        if piece is None:
+            pos.remove(x, y)
+        else:
+            pos.place(x, y, piece[0], piece[1])
+
+
+class _Mismatches:
+    """Counts the mismatches of one check and writes out the first few."""
+
+    def __init__(self, out, limit=10):
+        self.out = out
+        self.limit = limit
+        self.count = 0
+
+    def __call__(self, message):
+        self.count += 1
+        if self.count <= self.limit:
+            self.out.write("  " + message + "\n")
+
+
+def check_rete(games=20, seed=0, max_plies=200, out=sys.stdout):
+    """
+    Play random games through a ReteNetwork one hop at a time, as the
+    inference GUI does, and after every hop compare its facts and its
+    decision with extract_facts() and the compiled rules run on the
+    position from scratch. Returns the number of mismatches.
+    """
+    rng = random.Random(seed)
+    decide = compile_rules()
+    mismatch = _Mismatches(out)
+    hops = 0
+    for game in range(games):
+        pos = Position.standard()
+        net = ReteNetwork(pos)
+        for ply in range(max_plies):
+            moves = pos.legal_moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            colour = pos.pTurn
+            reference = pos.copy()
+            deltas = _hop_deltas(pos, move)
+            for hop, delta in enumerate(deltas):
+                net.apply(delta)
+                _apply_delta(reference, delta)
+                hops += 1
+                facts = extract_facts(reference)
+                where = "game %d ply %d hop %d" % (game, ply, hop)
+                if set(net.facts) != set(facts):
+                    mismatch("%s: facts differ by %d" % (where, len(set(net.facts) ^ set(facts))))
+                if hop + 1 < len(deltas):
+                    piece, side = delta[1][:2], colour
+                else:
+                    piece, side = None, opposite(colour)
+                expected = decide(facts, side, piece)
+                if net.decide(side, piece) != expected:
+                    mismatch("%s: decided %r, expected %r" % (where, net.decide(side, piece), expected))
+            pos.make_move(move)
+            if (net.position.white, net.position.black, net.position.kings) != \
+                    (pos.white, pos.black, pos.kings):
+                mismatch("game %d ply %d: network position differs" % (game, ply))
+    out.write("rete          %6d hops   %s\n" % (hops, "ok" if not mismatch.count
+                                                  else "FAIL (%d)" % mismatch.count))
+    return mismatch.count
+
+
+def check_decisions(count=2000, seed=0, out=sys.stdout):
+    """
+    Check every decide_positions() result against the position: the rule
+    is the one the compiled rules pick from extract_facts(), the move is in
+    legal_moves(), and each further hop of a capture is the jump the rules
+    pick for the piece in the middle of it. Returns the number of mismatches.
+    """
+    decide = compile_rules()
+    mismatch = _Mismatches(out)
+    positions = random_positions(count, seed)
+    multi = 0
+    for index, (pos, decision) in enumerate(zip(positions, decide_positions(positions))):
+        colour = pos.pTurn
+        expected = decide(extract_facts(pos), colour)
+        if decision is None or decision[:3] != expected:
+            mismatch("position %d: decided %r, expected %r" % (index, decision, expected))
+            continue
+        action, start, to, move = decision
+        if move not in pos.legal_moves():
+            mismatch("position %d: %r is not a legal move" % (index, move))
+            continue
+        if (COORDS[move[0][0]], COORDS[move[0][1]]) != (start, to):
+            mismatch("position %d: %r does not start %r-%r" % (index, move, start, to))
+            continue
+        if action != 'jump':
+            continue
+        deltas = _hop_deltas(pos, move)
+        multi += len(deltas) > 1
+        reference = pos.copy()
+        for hop, delta in enumerate(deltas):
+            _apply_delta(reference, delta)
+            piece = delta[1][:2]
+            further = decide(extract_facts(reference), colour, piece)
+            following = deltas[hop + 1][1][:2] if hop + 1 < len(deltas) else None
+            if (further and further[2]) != following:
+                mismatch("position %d hop %d: rules jump to %r, move to %r"
+                         % (index, hop, further and further[2], following))
+                break
+    out.write("decisions     %6d moves  %s (%d multi-jumps)\n"
+              % (len(positions), "ok" if not mismatch.count else "FAIL (%d)" % mismatch.count,
+                 multi))
+    return mismatch.count
+
+
+def check_interpreted(count=500, seed=0, out=sys.stdout):
+    """
+    Set each position up on a headless inference-system Checkers and
+    compare its ExtractFactsFromBoard, isSafeMove, MatchRules and
+    SelectRuleToFire with the facts and the compiled rules here. Where
+    SelectRuleToFire's choice rests on set order, the compiled rules'
+    choice need only be one it ranks first. Returns the number of mismatches.
+    """
+    from Checkers_v24_inference_system import Checkers
+    game = Checkers(headless=True)
+    decide = compile_rules()
+    mismatch = _Mismatches(out)
+    positions = random_positions(count, seed)
+    for index, pos in enumerate(positions):
+        colour = game.pTurn = pos.pTurn
+        for x in range(BOARD_DIMENSION):
+            for y in range(BOARD_DIMENSION):
+                piece = pos.piece(x, y)
+                if piece is None:
+                    game.tiles[x][y].Set(False)
+                else:
+                    game.tiles[x][y].Set(True, piece[0], piece[1])
+
+        facts = extract_facts(pos)
+        board_facts = game.ExtractFactsFromBoard()
+        expected = set(fact for fact in facts if fact[0] != 'safe_advance' and
+                       (fact[0] != 'can_jump' or fact[1] == colour))
+        expected.add(('turn', colour))
+        if set(board_facts) != expected:
+            mismatch("position %d: ExtractFactsFromBoard differs by %d"
+                     % (index, len(set(board_facts) ^ expected)))
+            continue
+        for fact in facts.lookup('can_advance', colour):
+            safe = ('safe_advance',) + fact[1:] in facts
+            if game.isSafeMove(fact[2][0], fact[2][1], fact[3][0], fact[3][1]) != safe:
+                mismatch("position %d: isSafeMove%r differs" % (index, fact[2] + fact[3]))
+
+        rules = game.MatchRules(board_facts)
+        chosen = decide(facts, colour)
+        proposal = {'type': chosen[0], 'from': chosen[1], 'to': chosen[2]}
+        if proposal not in rules:
+            mismatch("position %d: MatchRules does not propose %r" % (index, chosen))
+            continue
+        fired = game.SelectRuleToFire([proposal] + [rule for rule in rules if rule != proposal])
+        if fired != proposal:
+            mismatch("position %d: SelectRuleToFire ranks %r over %r" % (index, fired, chosen))
+    out.write("interpreted   %6d boards %s\n" % (len(positions), "ok" if not mismatch.count
+                                                  else "FAIL (%d)" % mismatch.count))
+    return mismatch.count
+
+
+def check(positions=2000, games=20, seed=0, out=sys.stdout):
+    """Run every check; returns the total number of mismatches."""
+    return (check_rete(games, seed, out=out) +
+            check_decisions(positions, seed, out=out) +
+            check_interpreted(max(1, positions // 4), seed, out=out))
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Batch decisions of the rule-based player")
+    parser.add_argument('--positions', type=int, default=None,
+                        help="positions to decide (default 20000, or 2000 with --check)")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='store_true',
+                        help="check the Rete network, the batch moves and the interpreted rules")
+    parser.add_argument('--games', type=int, default=20, help="with --check, games played through the network")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 1 if check(args.positions or 2000, args.games, args.seed) else 0
+
+    states = [_state(pos) for pos in random_positions(args.positions or 20000, args.seed)]
+    compile_rules()
+    start = time.perf_counter()
+    decisions = decide_positions(states, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print("%d positions, %d worker(s): %.3f s, %.0f decisions/s"
+          % (len(states), args.workers, elapsed, len(states) / elapsed))
+    print("no move in %d" % sum(1 for decision in decisions if decision is None))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
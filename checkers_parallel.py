@@ -0,0 +1,655 @@
+"""
+Parallel root-move search for the minimax checkers engine.
+
+ParallelEngine farms the root moves of a position out to a pool of worker
+processes. Every worker holds its own headless checkers_engine.Engine (and
+transposition table) for the life of the pool and receives a position as
+its bare bitboards, so nothing Tk-related is ever pickled.
+
+Two ways of splitting the root are supported:
+  'root' -- every root move is searched with a full window, all at once
+  'ybw'  -- young brothers wait: the first (best-ordered) move is searched
+            on its own, then its score is handed to the remaining moves as
+            alpha so they can be cut off
+
+Either way the merge is deterministic: the highest score wins and ties go
+to the move that comes first in root order, which is the same move the
+serial Engine.search picks. (As between two serial searches, a score can
+still move where a transposition table hands back a deeper result than
+was asked for, since which worker saw which subtree first is up to the
+pool.)
+
+LazySMPEngine takes the other road: every worker searches the whole
+position by iterative deepening, at staggered depths, and they share a
+single SharedTranspositionTable in multiprocessing.shared_memory so that
+each one profits from what the others have already searched.
+
+Tracing works as it does for Engine, but a worker's trace_sink would only
+be a copy in another process. Each worker's Engine therefore collects its
+trace lines, hands them back with the result of every task, and the front
+end passes them on to the trace_sink it was given, in the parent.
+
+Run this file directly to measure the speed-up over a serial search:
+    python checkers_parallel.py --depth 7 --workers 4 [--split lazy-smp]
+"""
+
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from checkers_engine import (TRACE_OFF, TRACE_SEARCH, Engine, Position, RingBufferSink,
+                             SearchStats, SearchTimeout, print_sink)
+
+
+##########################################
+# Worker Side                            #
+##########################################
+_worker_engine = None
+
+
+class _WorkerEngine(Engine):
+    """
+    Worker Engine whose clock check also polls a stop flag shared with the
+    parent. Its trace lines are kept (at most trace_capacity of them) until
+    take_trace() collects them for the parent.
+    """
+
+    def __init__(self, trace_capacity=None, **engine_options):
+        self.trace_lines = deque(maxlen=trace_capacity)
+        Engine.__init__(self, trace_sink=self.trace_lines.append, **engine_options)
+
+    def take_trace(self):
+        lines = list(self.trace_lines)
+        self.trace_lines.clear()
+        return lines
+
+    def stopped(self):
+        return False
+
+    def check_time(self):
+        if not self.nodes % self.TIME_CHECK_INTERVAL and self.stopped():
+            raise SearchTimeout()
+        Engine.check_time(self)
+
+
+def _worker_options(engine_options):
+    """
+    The parent's engine options as the workers get them: without the
+    trace_sink, which stays in the parent, but with the capacity of a
+    RingBufferSink so that a worker keeps no more lines than it would.
+    """
+    options = dict(engine_options)
+    sink = options.pop('trace_sink', None)
+    if isinstance(sink, RingBufferSink):
+        options['trace_capacity'] = sink.buffer.maxlen
+    return options
+
+
+def _init_worker(engine_options, stop_event):
+    global _worker_engine
+    _worker_engine = _WorkerEngine(**engine_options)
+    _worker_engine.stopped = stop_event.is_set
+
+
+def _search_root_move(task):
+    """
+    Search one root move in a worker. task is (index, position state, move,
+    depth, alpha, beta, deadline) where deadline is a time.time() value or
+    None. Returns (index, value, stats counters, trace lines); value is
+    None if the deadline hit.
+    """
+    index, state, move, depth, alpha, beta, deadline = task
+    engine = _worker_engine
+    white, black, kings, pTurn = state
+    engine.position = Position(pTurn, white, black, kings)
+    engine.new_search(depth)
+    if deadline is not None:
+        engine.deadline = time.perf_counter() + (deadline - time.time())
+    try:
+        pos = engine.position
+        result = pos.make_move(move)
+        gain = pos.weight_move(move, result)
+        value = gain - engine.alpha_beta(depth - 1, gain - beta, gain - alpha)
+    except SearchTimeout:
+        value = None
+    finally:
+        engine.deadline = None
+    engine.stats.finish(move, value, depth, engine)
+    return index, value, engine.stats.counters(), engine.take_trace()
+
+
+##########################################
+# Root Splitter                          #
+##########################################
+class ParallelEngine:
+    """
+    Root-splitting front end with the same search()/iterative_deepening()
+    interface as Engine. workers defaults to the number of CPUs; the other
+    keyword arguments are passed to each worker's Engine, except that the
+    workers' trace lines come back to trace_sink here, in root move order.
+    self.stats adds up the workers' SearchStats counters, with one
+    iteration record per root iteration the pool finished.
+    """
+
+    SPLITS = ('root', 'ybw')
+
+    def __init__(self, position=None, workers=None, split='ybw', **engine_options):
+        if split not in self.SPLITS:
+            raise ValueError("unknown split mode: " + str(split))
+        self.position = position if position is not None else Position()
+        self.workers = workers or os.cpu_count() or 1
+        self.split = split
+        self.engine_options = engine_options
+        sink = engine_options.get('trace_sink')
+        self.trace_sink = sink if sink is not None else print_sink
+        self.trace_level = engine_options.get('trace_level', TRACE_OFF)
+        self.nodes = 0
+        self.stats = SearchStats()
+        self._pool = None
+        self._stop = None
+        self._aborted = False
+
+    def pool(self):
+        if self._pool is None:
+            context = multiprocessing.get_context()
+            self._stop = context.Event()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=context,
+                                             initializer=_init_worker,
+                                             initargs=(_worker_options(self.engine_options),
+                                                       self._stop))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def abort(self):
+        """Stop a search running in another thread; the workers give up at their next clock check."""
+        self._aborted = True
+        if self._stop is not None:
+            self._stop.set()
+
+    def clear_abort(self):
+        self._aborted = False
+        if self._stop is not None:
+            self._stop.clear()
+
+    def _state(self):
+        pos = self.position
+        return pos.white, pos.black, pos.kings, pos.pTurn
+
+    def _run(self, moves, depth, alpha, beta, deadline, offset=0):
+        """Search moves in the pool; returns a list of (index, value)."""
+        state = self._state()
+        tasks = [(offset + i, state, move, depth, alpha, beta, deadline)
+                 for i, move in enumerate(moves)]
+        results = []
+        for index, value, counters, trace in self.pool().map(_search_root_move, tasks):
+            self.stats.merge(counters)
+            for line in trace:
+                self.trace_sink(line)
+            results.append((index, value))
+        self.nodes = self.stats.nodes
+        return results
+
+    def search_root(self, depth, moves, deadline=None):
+        """
+        Search the given root moves (already in root order) to depth and
+        return (best_move, best_score, scores), or None if the deadline hit
+        (or abort() was called) before every move had a result. scores[i]
+        belongs to moves[i].
+        """
+        if self._aborted:
+            return None
+        start = time.perf_counter()
+        neg_inf, pos_inf = float('-inf'), float('inf')
+        self.stats.nodes += 1
+        self.stats.ply_nodes[0] += 1
+        if self.split == 'ybw' and len(moves) > 1:
+            first = self._run(moves[:1], depth, neg_inf, pos_inf, deadline)
+            if first[0][1] is None:
+                return None
+            rest = self._run(moves[1:], depth, first[0][1], pos_inf, deadline, offset=1)
+            results = first + rest
+        else:
+            results = self._run(moves, depth, neg_inf, pos_inf, deadline)
+
+        if any(value is None for _, value in results):
+            return None
+        scores = [value for _, value in sorted(results)]
+        best_index = 0
+        for i, value in enumerate(scores):
+            if value > scores[best_index]:
+                best_index = i
+        self.stats.add_iteration(depth, self.stats.nodes, time.perf_counter() - start,
+                                 scores[best_index], moves[best_index])
+        if self.trace_level >= TRACE_SEARCH:
+            self.trace_sink("[search_root] depth={}, best={}, score={}, nodes={}".format(
+                depth, Position.to_hops(moves[best_index]), scores[best_index], self.stats.nodes))
+        return moves[best_index], scores[best_index], scores
+
+    def search(self, depth):
+        """Fixed-depth search: (best_move, best_score), like Engine.search."""
+        self.nodes = 0
+        self.stats = SearchStats()
+        moves = Engine(self.position.copy(), **self.engine_options).order_moves(
+            self.position.legal_moves(), 0)
+        if not moves:
+            return None, Engine.LOSS
+        result = self.search_root(depth, moves)
+        if result is None:
+            raise SearchTimeout()
+        best_move, best_score, _ = result
+        self.stats.finish(best_move, best_score, depth)
+        return best_move, best_score
+
+    def iterative_deepening(self, time_ms, max_depth=None):
+        """
+        Engine.iterative_deepening over the pool: each iteration re-orders
+        the root moves by the previous iteration's scores.
+        """
+        self.nodes = 0
+        self.stats = SearchStats()
+        max_depth = max_depth or Engine.MAX_DEPTH
+        start = time.time()
+        deadline = start + time_ms / 1000.0
+        moves = self.position.legal_moves()
+        if not moves:
+            return None, Engine.LOSS, 0
+
+        best_move, best_score, completed = moves[0], Engine.LOSS, 0
+        for depth in range(1, max_depth + 1):
+            result = self.search_root(depth, moves, deadline if depth > 1 else None)
+            if result is None:
+                break
+            best_move, best_score, scores = result
+            completed = depth
+            # stable sort: equal scores keep their previous relative order
+            order = sorted(range(len(moves)), key=lambda i: -scores[i])
+            moves = [moves[i] for i in order]
+            if len(moves) == 1 or time.time() - start >= (deadline - start) / 2:
+                break
+        self.stats.finish(best_move, best_score, completed)
+        return best_move, best_score, completed
+
+
+##########################################
+# Shared Transposition Table             #
+##########################################
+class SharedTranspositionTable:
+    """
+    TranspositionTable with the same probe()/store() interface, kept in a
+    multiprocessing.shared_memory block that every Lazy SMP worker maps.
+
+    The block starts with a HEADER-byte header (byte 0 is the stop flag the
+    workers poll) followed by size packed ENTRY-byte slots:
+        check   8 bytes  key XOR the four data words below
+        data   32 bytes  depth, bound + 1 (0 = empty slot), generation,
+                         score, captured mask, path length, path squares
+    Nothing is locked. Two workers writing the same slot at once can leave
+    it holding half of each entry, but then check no longer XORs back to
+    the key being probed and the slot simply reads as a miss.
+
+    Pass name to attach to a table another process created. probes, hits,
+    stores and overwrites count this process's calls only.
+    """
+
+    POLICIES = ('always', 'depth', 'depth-age')
+    HEADER = 64
+    ENTRY = 40
+    MAX_PATH = 19
+    DATA = struct.Struct('<bBHiIB19s')
+    WORDS = struct.Struct('<4Q')
+    CHECK = struct.Struct('<Q')
+
+    def __init__(self, size=1 << 16, replacement='depth-age', name=None):
+        if replacement not in self.POLICIES:
+            raise ValueError("unknown replacement policy: " + str(replacement))
+        self.size = 1 << max(0, int(size) - 1).bit_length()   # round up to a power of two
+        self.mask = self.size - 1
+        self.replacement = replacement
+        nbytes = self.HEADER + self.size * self.ENTRY
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.buf = self.shm.buf
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __getstate__(self):
+        # workers started by spawn re-attach by name instead of copying
+        return {'size': self.size, 'replacement': self.replacement, 'name': self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state['size'], state['replacement'], state['name'])
+
+    def close(self, unlink=False):
+        self.buf.release()
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.buf[self.HEADER:] = bytes(self.size * self.ENTRY)
+        self.probes = self.hits = self.stores = self.overwrites = 0
+
+    def set_stop(self, stop):
+        self.buf[0] = 1 if stop else 0
+
+    def stopped(self):
+        return self.buf[0] != 0
+
+    def _read(self, index):
+        """The entry in slot index as (key, depth, bound, score, best_move,
+        generation), or None for an empty or torn slot."""
+        offset = self.HEADER + index * self.ENTRY
+        raw = bytes(self.buf[offset:offset + self.ENTRY])
+        data = raw[8:]
+        depth, bound, generation, score, captured, length, path = self.DATA.unpack(data)
+        if not bound or length > self.MAX_PATH:
+            return None
+        w0, w1, w2, w3 = self.WORDS.unpack(data)
+        key = self.CHECK.unpack_from(raw)[0] ^ w0 ^ w1 ^ w2 ^ w3
+        best_move = (tuple(path[:length]), captured) if length else None
+        return key, depth, bound - 1, score, best_move, generation
+
+    def probe(self, key):
+        """The entry stored for key, or None."""
+        self.probes += 1
+        entry = self._read(key & self.mask)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, bound, score, best_move):
+        index = key & self.mask
+        old = self._read(index)
+        if old is not None and old[0] != key:
+            if self.replacement == 'depth' and old[1] > depth:
+                return
+            if (self.replacement == 'depth-age' and old[1] > depth and
+                    old[5] == self.generation & 0xFFFF):
+                return
+            self.overwrites += 1
+        elif old is not None and best_move is None:
+            best_move = old[4]                 # keep the move we already knew
+        if best_move is None:
+            path, captured = (), 0
+        else:
+            path, captured = best_move
+        data = self.DATA.pack(depth, bound + 1, self.generation & 0xFFFF, score,
+                              captured, len(path), bytes(path))
+        w0, w1, w2, w3 = self.WORDS.unpack(data)
+        offset = self.HEADER + index * self.ENTRY
+        self.buf[offset:offset + self.ENTRY] = self.CHECK.pack(key ^ w0 ^ w1 ^ w2 ^ w3) + data
+        self.stores += 1
+
+    def filled(self):
+        return sum(1 for i in range(self.size) if self._read(i) is not None)
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def memory_bytes(self):
+        return self.HEADER + self.size * self.ENTRY
+
+    def stats(self):
+        return {
+            'size': self.size,
+            'filled': self.filled(),
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate(),
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'memory_bytes': self.memory_bytes(),
+        }
+
+
+##########################################
+# Lazy SMP                               #
+##########################################
+def _init_smp_worker(table, engine_options):
+    global _worker_engine
+    _worker_engine = _WorkerEngine(**engine_options)
+    _worker_engine.tt = table
+    _worker_engine.stopped = table.stopped
+
+
+def _smp_search(task):
+    """
+    Iterative deepening in a Lazy SMP worker. task is (worker index,
+    position state, max depth, budget, generation) where budget is None or
+    the (start, deadline) time.time() pair of the move. Odd-numbered
+    workers start their iterations one ply ahead of the others so the
+    workers are not all searching the same tree at the same time. Returns
+    (index, best_move, best_score, completed depth, stats counters,
+    iteration records, trace lines).
+    """
+    index, state, max_depth, budget, generation = task
+    engine = _worker_engine
+    white, black, kings, pTurn = state
+    engine.position = pos = Position(pTurn, white, black, kings)
+    engine.new_search(max_depth)
+    engine.tt.generation = generation
+    if budget is not None:
+        start, deadline = budget
+        offset = time.perf_counter() - time.time()
+        start, deadline = start + offset, deadline + offset
+
+    best_move, best_score, completed = None, Engine.LOSS, 0
+    for depth in range(1 + index % 2, max_depth + 1):
+        if budget is not None:
+            # as in Engine.iterative_deepening: worker 0's depth 1 always
+            # finishes, and no iteration starts after half the budget
+            if completed and time.perf_counter() - start >= (deadline - start) / 2:
+                break
+            if completed or index:
+                engine.deadline = deadline
+        try:
+            move, score = engine.search_root(depth, best_move)
+        except SearchTimeout:
+            while pos.undo_stack:
+                pos.unmake_move()
+            break
+        finally:
+            engine.deadline = None
+        best_move, best_score, completed = move, score, depth
+        if move is None:
+            break
+    engine.stats.finish(best_move, best_score, completed, engine)
+    return (index, best_move, best_score, completed, engine.stats.counters(),
+            engine.stats.iterations, engine.take_trace())
+
+
+class LazySMPEngine:
+    """
+    Lazy SMP front end with the same search()/iterative_deepening()
+    interface as Engine. All workers search the same position; worker 0's
+    iterations run 1, 2, 3, ... and the helpers' are staggered by a ply.
+    They share one SharedTranspositionTable, which is all the cooperation
+    there is: a helper that gets ahead leaves exact scores and best moves
+    behind for worker 0 to pick up.
+
+    A fixed-depth search() returns worker 0's result and stops the helpers
+    once it has it. iterative_deepening() returns the deepest completed
+    result, ties going to the lowest worker index. self.stats adds up all
+    the workers' counters; its iteration records are those of the worker
+    whose result was returned. The workers' trace lines come back to
+    trace_sink here, worker by worker, each prefixed with its worker index.
+    """
+
+    def __init__(self, position=None, workers=None, tt_size=1 << 16,
+                 tt_replacement='depth-age', **engine_options):
+        self.position = position if position is not None else Position()
+        self.workers = workers or os.cpu_count() or 1
+        self.tt = SharedTranspositionTable(tt_size, tt_replacement)
+        self.engine_options = engine_options
+        sink = engine_options.get('trace_sink')
+        self.trace_sink = sink if sink is not None else print_sink
+        self.nodes = 0
+        self.stats = SearchStats()
+        self._pool = None
+        self._aborted = False
+
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_init_smp_worker,
+                                             initargs=(self.tt,
+                                                       _worker_options(self.engine_options)))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self.tt is not None:
+            self.tt.close(unlink=True)
+            self.tt = None
+
+    def abort(self):
+        """Stop a search running in another thread; the workers give up at their next clock check."""
+        self._aborted = True
+        self.tt.set_stop(True)
+
+    def clear_abort(self):
+        self._aborted = False
+        self.tt.set_stop(False)
+
+    def _state(self):
+        pos = self.position
+        return pos.white, pos.black, pos.kings, pos.pTurn
+
+    def _run(self, max_depth, budget, stop_on_main):
+        if self._aborted:
+            raise SearchTimeout()
+        self.stats = SearchStats()
+        self.tt.new_search()
+        self.tt.set_stop(False)
+        state = self._state()
+        pool = self.pool()
+        # worker 0 is queued first so an idle process picks it up at once
+        futures = [pool.submit(_smp_search, (i, state, max_depth, budget, self.tt.generation))
+                   for i in range(self.workers)]
+        if stop_on_main:
+            futures[0].result()
+            self.tt.set_stop(True)
+        results = []
+        for future in futures:
+            index, move, score, completed, counters, iterations, trace = future.result()
+            self.stats.merge(counters)
+            for line in trace:
+                self.trace_sink('[worker {}] {}'.format(index, line))
+            results.append((index, move, score, completed, iterations))
+        self.nodes = self.stats.nodes
+        self.tt.set_stop(False)
+        if self._aborted:
+            raise SearchTimeout()
+        return results
+
+    def _finish(self, result):
+        _, move, score, completed, iterations = result
+        self.stats.iterations = iterations
+        self.stats.finish(move, score, completed)
+        return move, score, completed
+
+    def search(self, depth):
+        """Fixed-depth search: (best_move, best_score), like Engine.search."""
+        if not self.position.legal_moves():
+            return None, Engine.LOSS
+        move, score, _ = self._finish(self._run(depth, None, True)[0])
+        return move, score
+
+    def iterative_deepening(self, time_ms, max_depth=None):
+        moves = self.position.legal_moves()
+        if not moves:
+            return None, Engine.LOSS, 0
+        if len(moves) == 1:
+            max_depth = 1
+        start = time.time()
+        budget = (start, start + time_ms / 1000.0)
+        results = self._run(max_depth or Engine.MAX_DEPTH, budget, False)
+        best = results[0]
+        for result in results[1:]:
+            if result[1] is not None and result[3] > best[3]:
+                best = result
+        return self._finish(best)
+
+
+##########################################
+# Speed-up Measurement                   #
+##########################################
+def measure_speedup(position, depth, workers, split='ybw', **engine_options):
+    """
+    Time a serial Engine.search against a parallel search of the same
+    position and depth; split is one of ParallelEngine.SPLITS or
+    'lazy-smp'. Returns a dict with both times, node counts and the
+    speed-up, and whether the two searches agreed on the score.
+    """
+    serial = Engine(position.copy(), **engine_options)
+    t0 = time.perf_counter()
+    serial_move, serial_score = serial.search(depth)
+    serial_time = time.perf_counter() - t0
+
+    if split == 'lazy-smp':
+        parallel = LazySMPEngine(position.copy(), workers=workers, **engine_options)
+    else:
+        parallel = ParallelEngine(position.copy(), workers=workers, split=split, **engine_options)
+    try:
+        parallel.pool().submit(int).result()      # start the workers outside the timing
+        t0 = time.perf_counter()
+        parallel_move, parallel_score = parallel.search(depth)
+        parallel_time = time.perf_counter() - t0
+    finally:
+        parallel.close()
+
+    return {
+        'depth': depth,
+        'workers': workers,
+        'split': split,
+        'serial_seconds': serial_time,
+        'parallel_seconds': parallel_time,
+        'serial_nodes': serial.nodes,
+        'parallel_nodes': parallel.nodes,
+        'speedup': serial_time / parallel_time if parallel_time else float('inf'),
+        'scores_agree': serial_score == parallel_score,
+        'serial_move': Position.to_hops(serial_move) if serial_move else None,
+        'parallel_move': Position.to_hops(parallel_move) if parallel_move else None,
+    }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Serial vs parallel root search speed-up")
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--split', choices=ParallelEngine.SPLITS + ('lazy-smp',), default='ybw')
+    args = parser.parse_args(argv)
+
+    report = measure_speedup(Position.standard(), args.depth, args.workers, args.split)
+    for key, value in report.items():
+        print("{:>17}: {}".format(key, value), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Perft for the checkers move generator.
+
+perft(pos, depth) counts the leaf nodes of the full move tree to the given
+depth; a multi-jump is one move, as it is for the players. The counts only
+depend on the rules, so any change to Position's move generation --
+legal_moves(), capture_sequences(), walks() -- has to leave them alone,
+and the time they take is a clean measure of move-generation speed.
+
+perft_expected.txt holds the known counts; check them all with
+    python checkers_perft.py --check
+or look at one position:
+    python checkers_perft.py --position perft/saved.txt --depth 6 --divide --hashed
+"""
+
+import os
+import sys
+import time
+
+from checkers_engine import Position
+
+EXPECTED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perft_expected.txt')
+
+
+##########################################
+# Counting                               #
+##########################################
+def perft(pos, depth):
+    """Number of move sequences of exactly depth plies (fewer if a side runs out of moves)."""
+    moves = pos.legal_moves()
+    if depth == 1:
+        return len(moves)
+    if depth <= 0:
+        return 1
+    total = 0
+    for move in moves:
+        pos.make_move(move)
+        total += perft(pos, depth - 1)
+        pos.unmake_move()
+    return total
+
+
+def perft_hashed(pos, depth, table=None):
+    """
+    perft() that remembers the count of every (position, depth) it has
+    finished, so a position reached again by another move order is not
+    walked again. Positions are told apart by their Zobrist key.
+    """
+    if table is None:
+        table = {}
+    if depth <= 0:
+        return 1
+    entry = table.get((pos.key, depth))
+    if entry is not None:
+        return entry
+    moves = pos.legal_moves()
+    if depth == 1:
+        total = len(moves)
+    else:
+        total = 0
+        for move in moves:
+            pos.make_move(move)
+            total += perft_hashed(pos, depth - 1, table)
+            pos.unmake_move()
+    table[(pos.key, depth)] = total
+    return total
+
+
+def divide(pos, depth, hashed=False):
+    """Perft split by root move: a list of (hops, count) in generation order."""
+    table = {} if hashed else None
+    results = []
+    for move in pos.legal_moves():
+        pos.make_move(move)
+        if hashed:
+            count = perft_hashed(pos, depth - 1, table)
+        else:
+            count = perft(pos, depth - 1)
+        pos.unmake_move()
+        results.append((Position.to_hops(move), count))
+    return results
+
+
+def timed_perft(pos, depth, hashed=False):
+    """(count, seconds, nodes per second) for one perft run."""
+    start = time.perf_counter()
+    count = perft_hashed(pos, depth) if hashed else perft(pos, depth)
+    seconds = time.perf_counter() - start
+    return count, seconds, count / seconds if seconds else 0.0
+
+
+##########################################
+# Expected Counts                        #
+##########################################
+def load_position(name):
+    """'standard' for the StandardSetup position, otherwise a checkers.txt-style file."""
+    if name == 'standard':
+        return Position.standard()
+    if not os.path.isabs(name):
+        name = os.path.join(os.path.dirname(EXPECTED_FILE), name)
+    return Position.from_setup_file(name)
+
+
+def load_expected(path=EXPECTED_FILE):
+    """The (position name, depth, count) rows of the expected-counts table."""
+    rows = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                name, depth, count = line.split()
+                rows.append((name, int(depth), int(count)))
+    return rows
+
+
+def check(path=EXPECTED_FILE, hashed=False, max_depth=None, out=sys.stdout):
+    """Run every row of the table; returns the number of mismatches."""
+    failures = 0
+    for name, depth, expected in load_expected(path):
+        if max_depth is not None and depth > max_depth:
+            continue
+        count, seconds, nps = timed_perft(load_position(name), depth, hashed)
+        status = 'ok' if count == expected else 'FAIL (expected {})'.format(expected)
+        out.write("{:<16} depth {:>2}: {:>10} {:>8.3f}s {:>10.0f} nps  {}\n".format(
+            name, depth, count, seconds, nps, status))
+        if count != expected:
+            failures += 1
+    return failures
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Perft for the checkers move generator")
+    parser.add_argument('--position', default='standard',
+                        help="'standard' or a position file in the checkers.txt format")
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--divide', action='store_true', help="show the count under each root move")
+    parser.add_argument('--hashed', action='store_true', help="reuse counts of transposed positions")
+    parser.add_argument('--check', action='store_true', help="verify perft_expected.txt")
+    parser.add_argument('--max-depth', type=int, default=None, help="with --check, skip deeper rows")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 1 if check(hashed=args.hashed, max_depth=args.max_depth) else 0
+
+    pos = load_position(args.position)
+    if args.divide:
+        for hops, count in divide(pos, args.depth, args.hashed):
+            print("{:<40} {}".format(str(hops), count))
+    count, seconds, nps = timed_perft(pos, args.depth, args.hashed)
+    print("perft({}) = {}  in {:.3f}s, {:.0f} nps".format(args.depth, count, seconds, nps))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
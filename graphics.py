@@ -60,6 +60,11 @@ Programming: An Introduction to Computer Science" by John Zelle,
 published by Franklin, Beedle & Associates.  Also see
 http://mcsp.wartburg.edu/zelle/python for a quick reference"""
 
+# Local additions to 4.2 for the checkers GUI
+#     * Added GraphWin.batch() to coalesce drawing into one update
+#     * Added GraphicsObject.setVisible() to hide objects without undrawing
+#     * Added NullGraphWin and NullMessagebox for running without a display
+#     * The Tk root is created by the first window, not on import
 # Version 4.2 5/26/2011
 #     * Modified Image to allow multiple undraws like other GraphicsObjects
 # Version 4.1 12/29/2009
@@ -145,7 +150,8 @@ http://mcsp.wartburg.edu/zelle/python for a quick reference"""
 #     Added ability to set text atttributes.
 #     Added Entry boxes.
 
-import time, os, sys
+import time, os, sys, heapq
+from contextlib import contextmanager
 
 try:  # import as appropriate for 2.x vs. 3.x
    import tkinter as tk
@@ -165,11 +171,24 @@ UNSUPPORTED_METHOD = "Object doesn't support operation"
 BAD_OPTION = "Illegal option value"
 DEAD_THREAD = "Graphics thread quit unexpectedly"
 
-_root = tk.Tk()
-_root.withdraw()
+# Set CHECKERS_HEADLESS=1 to run without a display: the checkers
+# programs then open a NullGraphWin instead of a GraphWin.
+HEADLESS = os.environ.get("CHECKERS_HEADLESS", "") not in ("", "0")
+
+# The hidden root of all windows. It is made by the first GraphWin (or
+# Entry or Image), so importing this module does not need a display.
+_root = None
+
+def _tk_root():
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+    return _root
 
 def update():
-    _root.update()
+    if _root is not None:
+        _root.update()
 
 ############################################################################
 # Graphics classes start here
@@ -180,7 +199,7 @@ class GraphWin(tk.Canvas):
 
     def __init__(self, title="Graphics Window",
                  width=200, height=200, autoflush=True):
-        master = tk.Toplevel(_root)
+        master = tk.Toplevel(_tk_root())
         master.protocol("WM_DELETE_WINDOW", self.close)
         tk.Canvas.__init__(self, master, width=width, height=height)
         self.master.title(title)
@@ -197,6 +216,7 @@ class GraphWin(tk.Canvas):
         self._mouseCallback = None
         self.trans = None
         self.closed = False
+        self._batchDepth = 0
         master.lift()
         if autoflush: _root.update()
      
@@ -256,6 +276,27 @@ class GraphWin(tk.Canvas):
         self.__checkOpen()
         self.update_idletasks()
         
+    @contextmanager
+    def batch(self):
+        """Group drawing changes into one screen update:
+            with win.batch():
+                ...draw, undraw, move and reconfigure objects...
+        Autoflush is suspended inside the block and the window is
+        flushed once, with update_idletasks, when the outermost block
+        ends. Blocks may be nested."""
+        if not self._batchDepth:
+            self._batchAutoflush = self.autoflush
+            self.autoflush = False
+        self._batchDepth += 1
+        try:
+            yield self
+        finally:
+            self._batchDepth -= 1
+            if not self._batchDepth:
+                self.autoflush = self._batchAutoflush
+                if not self.closed:
+                    self.update_idletasks()
+
     def getMouse(self):
         """Wait for mouse click and return Point object representing
         the click"""
@@ -316,6 +357,171 @@ class GraphWin(tk.Canvas):
         if self._mouseCallback:
             self._mouseCallback(Point(e.x, e.y)) 
                       
+class NullGraphWin:
+
+    """A GraphWin stand-in that draws nothing and needs no display.
+
+    It takes the same arguments and answers the same calls as GraphWin,
+    and GraphicsObjects draw into it as usual, so a program written for
+    GraphWin runs unchanged without Tk. Callbacks scheduled with after()
+    and after_idle() run from mainloop(), which returns once none are
+    left; click(x, y) delivers a mouse click at a world point."""
+
+    def __init__(self, title="Graphics Window",
+                 width=200, height=200, autoflush=True):
+        self.master = _NullMaster()
+        self.width = width
+        self.height = height
+        self.autoflush = False
+        self.mouseX = None
+        self.mouseY = None
+        self.trans = None
+        self.closed = False
+        self._mouseCallback = None
+        self._itemCount = 0
+        self._items = set()
+        self._pending = []
+        self._pendingCount = 0
+
+    def setBackground(self, color):
+        pass
+
+    def setCoords(self, x1, y1, x2, y2):
+        self.trans = Transform(self.width, self.height, x1, y1, x2, y2)
+
+    def close(self):
+        self.closed = True
+
+    def isClosed(self):
+        return self.closed
+
+    def isOpen(self):
+        return not self.closed
+
+    def flush(self):
+        pass
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+    def getMouse(self):
+        raise GraphicsError("getMouse in a window without a display")
+
+    def checkMouse(self):
+        return None
+
+    def getHeight(self):
+        return self.height
+
+    def getWidth(self):
+        return self.width
+
+    toScreen = GraphWin.toScreen
+    toWorld = GraphWin.toWorld
+
+    def setMouseHandler(self, func):
+        self._mouseCallback = func
+
+    def click(self, x, y):
+        """Click at world point (x, y), then run until idle."""
+        if self._mouseCallback:
+            self._mouseCallback(Point(*self.toScreen(x, y)))
+        self.mainloop()
+
+    # scheduling, in place of Tk's event loop
+    def after(self, ms, func=None, *args):
+        self._pendingCount += 1
+        heapq.heappush(self._pending, (time.time() + ms / 1000.0, self._pendingCount,
+                                       func, args))
+        return self._pendingCount
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, id):
+        self._pending = [p for p in self._pending if p[1] != id]
+        heapq.heapify(self._pending)
+
+    def mainloop(self, n=0):
+        while self._pending and not self.closed:
+            due, _, func, args = heapq.heappop(self._pending)
+            wait = due - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            func(*args)
+
+    # the canvas calls GraphicsObjects make
+    def _create(self, *args, **options):
+        self._itemCount += 1
+        self._items.add(self._itemCount)
+        return self._itemCount
+
+    create_rectangle = create_oval = create_line = create_polygon = _create
+    create_text = create_image = _create
+
+    def delete(self, id):
+        self._items.discard(id)
+
+    def itemconfig(self, id, *args, **options):
+        pass
+
+    def move(self, id, dx, dy):
+        pass
+
+    def itemCount(self):
+        """Number of items currently drawn."""
+        return len(self._items)
+
+
+class _NullMaster:
+    # the toplevel window of a NullGraphWin
+
+    def title(self, title):
+        pass
+
+    def protocol(self, name, func=None):
+        pass
+
+    def destroy(self):
+        pass
+
+
+class NullMessagebox:
+
+    """A tkinter.messagebox stand-in for use without a display. The
+    message boxes are not shown: each is recorded in messages as
+    (kind, title, message) and answered at once, yes to questions."""
+
+    def __init__(self):
+        self.messages = []
+
+    def _show(self, kind, title, message, answer):
+        self.messages.append((kind, title, message))
+        return answer
+
+    def showinfo(self, title=None, message=None, **options):
+        return self._show("info", title, message, "ok")
+
+    def showwarning(self, title=None, message=None, **options):
+        return self._show("warning", title, message, "ok")
+
+    def showerror(self, title=None, message=None, **options):
+        return self._show("error", title, message, "ok")
+
+    def askyesno(self, title=None, message=None, **options):
+        return self._show("question", title, message, True)
+
+    def askokcancel(self, title=None, message=None, **options):
+        return self._show("question", title, message, True)
+
+
 class Transform:
 
     """Internal class for 2-D coordinate transformations"""
@@ -417,6 +623,21 @@ class GraphicsObject:
         self.id = None
 
 
+    def setVisible(self, visible):
+
+        """Show or hide the object. Unlike undraw, hiding keeps the
+        canvas item, so showing it again does not create a new one.
+        May be called before draw to draw the object hidden."""
+
+        state = "normal" if visible else "hidden"
+        if self.config.get("state", "normal") == state: return
+        self.config["state"] = state
+        if self.canvas and not self.canvas.isClosed():
+            self.canvas.itemconfig(self.id, state=state)
+            if self.canvas.autoflush:
+                _root.update()
+
+
     def move(self, dx, dy):
 
         """move object dx units in x direction and dy units in y
@@ -676,7 +897,7 @@ class Entry(GraphicsObject):
         self.anchor = p.clone()
         #print self.anchor
         self.width = width
-        self.text = tk.StringVar(_root)
+        self.text = tk.StringVar(_tk_root())
         self.text.set("")
         self.fill = "gray"
         self.color = "black"
@@ -767,10 +988,10 @@ class Image(GraphicsObject):
         self.imageId = Image.idCount
         Image.idCount = Image.idCount + 1
         if len(pixmap) == 1: # file name provided
-            self.img = tk.PhotoImage(file=pixmap[0], master=_root)
+            self.img = tk.PhotoImage(file=pixmap[0], master=_tk_root())
         else: # width and height provided
             width, height = pixmap
-            self.img = tk.PhotoImage(master=_root, width=width, height=height)
+            self.img = tk.PhotoImage(master=_tk_root(), width=width, height=height)
                 
     def _draw(self, canvas, options):
         p = self.anchor